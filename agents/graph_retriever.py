@@ -9,7 +9,9 @@ This agent is responsible for:
 5. Performing semantic search for relevant entities
 """
 
+import re
 import logging
+import threading
 from typing import Dict, List, Any, Optional, Union
 
 from agents.agent_base import Agent
@@ -28,21 +30,42 @@ except ImportError:
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(name)s - %(levelname)s - %(message)s')
 logger = logging.getLogger(__name__)
 
+# Maximum number of rows fetched per query when the query sets no LIMIT itself
+DEFAULT_PREVIEW_LIMIT = 500
+
+LIMIT_PATTERN = re.compile(r'\bLIMIT\b', re.IGNORECASE)
+
+# Queries that write to the graph or combine results are never given a LIMIT
+WRITE_OR_UNION_PATTERN = re.compile(r'\b(CREATE|MERGE|SET|DELETE|REMOVE|FOREACH|LOAD\s+CSV|UNION)\b', re.IGNORECASE)
+
+# Clause keywords, used to find the last clause of a query ("STARTS WITH" and
+# "ENDS WITH" are string operators, not clauses)
+CLAUSE_PATTERN = re.compile(r'\b(MATCH|UNWIND|CALL|YIELD|RETURN|(?<!STARTS )(?<!ENDS )WITH)\b', re.IGNORECASE)
+
+# String literals and quoted names, blanked out before looking for keywords
+QUOTED_PATTERN = re.compile(r"'(?:[^'\\]|\\.)*'|\"(?:[^\"\\]|\\.)*\"|`[^`]*`")
+
 class GraphRetrieverAgent(Agent):
     """Agent that retrieves relevant information from the graph database."""
     
-    def __init__(self, enable_semantic_search: bool = True):
+    def __init__(self, enable_semantic_search: bool = True, embedding_cache_dir: Optional[str] = None):
         """
         Initialize the graph retriever agent.
         
         Args:
             enable_semantic_search: Whether to enable semantic search capabilities
+            embedding_cache_dir: Optional directory to persist query embeddings across restarts
         """
         super().__init__()
         self.graph_db = None
         self.query_validator = QueryValidator()
         self.semantic_entity_retriever = None
+        self.embedding_provider = None
+        self.embedding_cache_dir = embedding_cache_dir
         self.enable_semantic_search = enable_semantic_search and SEMANTIC_SEARCH_AVAILABLE
+        # The connection lives on the agent for the duration of one run, so
+        # concurrent runs must not interleave
+        self._run_lock = threading.Lock()
         
         if self.enable_semantic_search:
             logger.info("Semantic search capabilities are enabled")
@@ -66,14 +89,7 @@ class GraphRetrieverAgent(Agent):
             # Initialize semantic entity retriever if enabled
             if self.enable_semantic_search and self.semantic_entity_retriever is None:
                 try:
-                    # Try to use SentenceTransformerProvider, fall back to DummyEmbeddingProvider if it fails
-                    try:
-                        embedding_provider = SentenceTransformerProvider()
-                        logger.info("Using SentenceTransformerProvider for semantic search")
-                    except Exception as e:
-                        logger.warning(f"Failed to initialize SentenceTransformerProvider: {e}")
-                        logger.warning("Falling back to DummyEmbeddingProvider")
-                        embedding_provider = DummyEmbeddingProvider()
+                    embedding_provider = self.get_embedding_provider()
                     
                     # Create semantic entity retriever
                     self.semantic_entity_retriever = SemanticEntityRetriever(self.graph_db, embedding_provider)
@@ -86,6 +102,50 @@ class GraphRetrieverAgent(Agent):
             
         return connected
     
+    def get_embedding_provider(self):
+        """
+        Get the embedding provider used for semantic search, creating it on first use.
+        
+        Returns:
+            The embedding provider instance
+        """
+        if self.embedding_provider is None:
+            # Try to use SentenceTransformerProvider, fall back to DummyEmbeddingProvider if it fails
+            try:
+                self.embedding_provider = SentenceTransformerProvider(cache_dir=self.embedding_cache_dir)
+                logger.info("Using SentenceTransformerProvider for semantic search")
+            except Exception as e:
+                logger.warning(f"Failed to initialize SentenceTransformerProvider: {e}")
+                logger.warning("Falling back to DummyEmbeddingProvider")
+                self.embedding_provider = DummyEmbeddingProvider()
+        
+        return self.embedding_provider
+    
+    def warm_up(self):
+        """
+        Load the embedding model and run a dummy encode so the first query
+        does not pay the model loading cost.
+        """
+        if not self.enable_semantic_search:
+            return
+        
+        try:
+            self.get_embedding_provider().encode("warmup")
+            logger.info("Embedding provider warmed up")
+        except Exception as e:
+            logger.warning(f"Failed to warm up embedding provider: {e}")
+    
+    def save_embedding_cache(self) -> bool:
+        """
+        Persist the embedding provider's cache to disk, if it supports it.
+        
+        Returns:
+            bool: True if the cache was saved, False otherwise
+        """
+        if self.embedding_provider is None or not hasattr(self.embedding_provider, "save_cache"):
+            return False
+        return self.embedding_provider.save_cache()
+    
     def close_database(self):
         """Close the database connection."""
         if self.graph_db:
@@ -116,6 +176,56 @@ class GraphRetrieverAgent(Agent):
         Returns:
             Dictionary with retrieved graph context
         """
+        with self._run_lock:
+            return self._retrieve(input_data)
+    
+    @staticmethod
+    def _ends_with_return(cypher: str) -> bool:
+        """
+        Check whether a query only reads the graph and its last clause is RETURN.
+        
+        Args:
+            cypher: The Cypher query
+        
+        Returns:
+            bool: True if a LIMIT can be appended to the query
+        """
+        query = QUOTED_PATTERN.sub("''", cypher)
+        if WRITE_OR_UNION_PATTERN.search(query):
+            return False
+        
+        # Clauses inside subqueries and map projections do not end the query
+        last_clause = None
+        for match in CLAUSE_PATTERN.finditer(query):
+            depth = query.count('{', 0, match.start()) - query.count('}', 0, match.start())
+            if depth == 0:
+                last_clause = match.group(1).upper()
+        return last_clause == 'RETURN'
+    
+    @staticmethod
+    def _apply_preview_limit(cypher: str, limit: Optional[int]):
+        """
+        Append a server-side LIMIT to a read query that does not set one.
+        
+        Only queries whose last clause is RETURN are rewritten; UNIONs, standalone
+        procedure calls and queries that write to the graph run unchanged.
+        
+        Args:
+            cypher: The Cypher query
+            limit: Maximum number of rows to return, or None to leave the query unbounded
+        
+        Returns:
+            Tuple of (cypher, parameters) to execute
+        """
+        if not limit or LIMIT_PATTERN.search(QUOTED_PATTERN.sub("''", cypher)):
+            return cypher, None
+        if not GraphRetrieverAgent._ends_with_return(cypher):
+            return cypher, None
+        
+        return f"{cypher.rstrip().rstrip(';')}\nLIMIT $__preview_limit", {"__preview_limit": int(limit)}
+    
+    def _retrieve(self, input_data: Dict) -> Dict:
+        """Run the query plan against the graph, see process."""
         logger.info("Retrieving information from graph database...")
         
         query_plan = input_data.get('query_plan', [])
@@ -138,8 +248,9 @@ class GraphRetrieverAgent(Agent):
                 # Perform semantic search with the original question
                 semantic_results = self.perform_semantic_search(original_question)
             
-            # Execute each query in the plan
+            # Validate each query in the plan, then run them all in one batch
             retrieved_context = []
+            pending = []
             for query_item in query_plan:
                 purpose = query_item.get('purpose', 'Unknown purpose')
                 cypher = query_item.get('cypher', '')
@@ -148,7 +259,7 @@ class GraphRetrieverAgent(Agent):
                     logger.warning(f"Empty Cypher query for purpose: {purpose}")
                     continue
                 
-                logger.info(f"Executing query for: {purpose}")
+                logger.info(f"Preparing query for: {purpose}")
                 
                 try:
                     # Validate and fix the query before execution using the validator
@@ -169,25 +280,26 @@ class GraphRetrieverAgent(Agent):
                     elif validation_message:
                         logger.warning(f"Query validation message: {validation_message}")
                     
-                    logger.info(f"Executing Cypher query: {fixed_cypher}")
-                    # Execute the query (original or fixed version)
-                    result = self.graph_db.execute_query(fixed_cypher)
+                    # Bound the rows streamed back for queries that set no LIMIT
+                    limit = query_item.get('limit', DEFAULT_PREVIEW_LIMIT)
+                    limited_cypher, parameters = self._apply_preview_limit(fixed_cypher, limit)
                     
-                    # Format the result
+                    # Result is filled in once the batch has been executed
                     formatted_result = {
                         'purpose': purpose,
                         'original_cypher': cypher,
                         'executed_cypher': fixed_cypher if fixed_cypher != cypher else cypher,
                         'was_modified': fixed_cypher != cypher,
                         'validation_message': validation_message,
-                        'result': result,
-                        'result_count': len(result) if result else 0
+                        'result': [],
+                        'result_count': 0
                     }
                     
                     retrieved_context.append(formatted_result)
+                    pending.append((formatted_result, limited_cypher, parameters))
                     
                 except Exception as query_error:
-                    logger.error(f"Error executing query: {query_error}")
+                    logger.error(f"Error preparing query: {query_error}")
                     retrieved_context.append({
                         'purpose': purpose,
                         'original_cypher': cypher,
@@ -196,6 +308,16 @@ class GraphRetrieverAgent(Agent):
                         'result_count': 0
                     })
             
+            if pending:
+                # Execute the queries (original or fixed versions) over a single session
+                logger.info(f"Executing {len(pending)} Cypher queries")
+                results = self.graph_db.execute_queries(
+                    [(limited_cypher, parameters) for _, limited_cypher, parameters in pending]
+                )
+                for (formatted_result, _, _), result in zip(pending, results):
+                    formatted_result['result'] = result
+                    formatted_result['result_count'] = len(result) if result else 0
+            
             # Add semantic search results if available
             if semantic_results:
                 retrieved_context.append({
@@ -8,10 +8,11 @@ This agent is responsible for:
 """
 
 import os
-import json
 import logging
 from typing import Dict, List, Any, Optional
 
+import orjson
+
 from agents.agent_base import Agent
 from schema.manager import SchemaManager
 from prompts.prompt_builder import PromptBuilder
@@ -128,7 +129,7 @@ You will identify entities, relationships, and constraints in the question and t
             )
             
             # Extract and parse the response
-            decomposition_result = json.loads(llm_response.choices[0].message.content)
+            decomposition_result = orjson.loads(llm_response.choices[0].message.content)
             query_plan = decomposition_result.get('query_plan', [])
             thought_process = decomposition_result.get('thought_process', '')
             
@@ -16,6 +16,22 @@ from typing import Tuple, List, Dict, Any, Optional
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(name)s - %(levelname)s - %(message)s')
 logger = logging.getLogger(__name__)
 
+# Patterns are compiled once at import, validate_and_fix runs for every query
+MULTIPLE_WHERE_PATTERN = re.compile(r'WHERE\s+(.+?)\s+WHERE\s+')
+UNNAMED_RELATIONSHIP_PATTERN = re.compile(r'(\[)(:)([^\]]+)(\])')
+PROPERTY_ACCESS_PATTERN = re.compile(r'([^a-zA-Z0-9_])([a-zA-Z][a-zA-Z0-9_]*)\.([a-zA-Z][a-zA-Z0-9_]*)\s+')
+UNCLOSED_PARENTHESIS_PATTERN = re.compile(r'\([^()]*?$')
+UNALIASED_PATH_PATTERN = re.compile(r'MATCH\s+path\s*=\s*\(([^:)]+):')
+DUPLICATE_RELATIONSHIP_CONDITION_PATTERN = re.compile(
+    r'(WHERE|AND)\s+\((\w+)\)-\[.*?\]->\((\w+)\)\s+AND\s+\(\2\)-\[.*?\]->\(\3\)')
+RELATIONSHIP_PROPERTY_PATTERN = re.compile(r'(MATCH.*?)-\[(\w+):([^\]]+)\]->.*?WHERE.*?\2\.(\w+)')
+
+# Patterns of the known issues reported without fixing the query
+WHERE_PROPERTY_ACCESS_PATTERN = re.compile(r'WHERE.*?\w+\.\w+')
+NAMED_RELATIONSHIP_PATTERN = re.compile(r'MATCH.*?\[(\w+):')
+VARIABLE_LENGTH_PATTERN = re.compile(r'\[.*\*.*\]')
+BOUNDED_VARIABLE_LENGTH_PATTERN = re.compile(r'\[.*\*\d+\.\.')
+
 class QueryValidator:
     """Validates and fixes Cypher queries to prevent common errors."""
     
@@ -23,28 +39,25 @@ class QueryValidator:
         # Initialize common error patterns and their fixes
         self.error_fixes = [
             # Multiple WHERE clauses - replace second WHERE with AND
-            (r'WHERE\s+(.+?)\s+WHERE\s+', r'WHERE \1 AND '),
+            (MULTIPLE_WHERE_PATTERN, r'WHERE \1 AND '),
             
             # Add relationship variable if missing
-            (r'(\[)(:)([^\]]+)(\])', r'\1r\2\3\4'),
+            (UNNAMED_RELATIONSHIP_PATTERN, r'\1r\2\3\4'),
             
             # Fix undefined relationship variables in property access
-            (r'([^a-zA-Z0-9_])([a-zA-Z][a-zA-Z0-9_]*)\.([a-zA-Z][a-zA-Z0-9_]*)\s+', 
-             self._fix_undefined_relationship_var),
+            (PROPERTY_ACCESS_PATTERN, self._fix_undefined_relationship_var),
             
             # Missing closing parentheses
-            (r'\([^()]*?$', self._balance_parentheses),
+            (UNCLOSED_PARENTHESIS_PATTERN, self._balance_parentheses),
             
             # Missing alias in path patterns
-            (r'MATCH\s+path\s*=\s*\(([^:)]+):', r'MATCH path = (n:\1:'),
+            (UNALIASED_PATH_PATTERN, r'MATCH path = (n:\1:'),
             
             # Remove duplicate relationship conditions
-            (r'(WHERE|AND)\s+\((\w+)\)-\[.*?\]->\((\w+)\)\s+AND\s+\(\2\)-\[.*?\]->\(\3\)', 
-             r'\1 (\2)-[]->\3'),
+            (DUPLICATE_RELATIONSHIP_CONDITION_PATTERN, r'\1 (\2)-[]->\3'),
              
             # Fix incorrectly aliased relationship variables
-            (r'(MATCH.*?)-\[(\w+):([^\]]+)\]->.*?WHERE.*?\2\.(\w+)', 
-             self._ensure_relationship_var_defined)
+            (RELATIONSHIP_PROPERTY_PATTERN, self._ensure_relationship_var_defined)
         ]
     
     def _fix_undefined_relationship_var(self, match: re.Match) -> str:
@@ -112,13 +125,13 @@ class QueryValidator:
         for pattern, replacement in self.error_fixes:
             if callable(replacement):
                 # For complex replacements that need a function
-                matches = list(re.finditer(pattern, fixed_query))
+                matches = list(pattern.finditer(fixed_query))
                 for match in reversed(matches):  # Process from end to start to maintain positions
                     replacement_text = replacement(match)
                     fixed_query = fixed_query[:match.start()] + replacement_text + fixed_query[match.end():]
             else:
                 # For simple regex replacements
-                fixed_query = re.sub(pattern, replacement, fixed_query)
+                fixed_query = pattern.sub(replacement, fixed_query)
         
         # Log changes if query was modified
         if fixed_query != original_query:
@@ -143,8 +156,8 @@ class QueryValidator:
         issues = []
         
         # Check for missing relationship variable with property access
-        rel_prop_access = re.search(r'WHERE.*?\w+\.\w+', query)
-        if rel_prop_access and not re.search(r'MATCH.*?\[(\w+):', query):
+        rel_prop_access = WHERE_PROPERTY_ACCESS_PATTERN.search(query)
+        if rel_prop_access and not NAMED_RELATIONSHIP_PATTERN.search(query):
             issues.append("Possible undefined relationship variable")
             
         # Check for cartesian products (missing relationships between patterns)
@@ -156,7 +169,7 @@ class QueryValidator:
             issues.append("Multiple OPTIONAL MATCH clauses may cause performance issues")
             
         # Check for unbounded variable-length paths that might be expensive
-        if re.search(r'\[.*\*.*\]', query) and not re.search(r'\[.*\*\d+\.\.', query):
+        if VARIABLE_LENGTH_PATTERN.search(query) and not BOUNDED_VARIABLE_LENGTH_PATTERN.search(query):
             issues.append("Unbounded variable-length path may cause performance issues")
         
         return issues
\ No newline at end of file
@@ -9,7 +9,9 @@ This agent is responsible for:
 """
 
 import os
+import asyncio
 import logging
+import threading
 import time
 from typing import Dict, List, Any, Optional
 
@@ -32,6 +34,14 @@ except ImportError:
     from graph_rag.workflow_manager import WorkflowManager
     from graph_rag.config import get_config
 
+# Conditionally import the semantic response cache
+try:
+    from semantic.embedding_provider import DummyEmbeddingProvider
+    from semantic.response_cache import SemanticResponseCache
+    SEMANTIC_CACHE_AVAILABLE = True
+except ImportError:
+    SEMANTIC_CACHE_AVAILABLE = False
+
 # Configure logging
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(name)s - %(levelname)s - %(message)s')
 logger = logging.getLogger(__name__)
@@ -39,13 +49,16 @@ logger = logging.getLogger(__name__)
 class GraphRAGAgent(Agent):
     """Main agent that orchestrates the graph RAG workflow using the REACT pattern."""
     
-    def __init__(self, config_override: Dict[str, Any] = None, preload_schema: bool = True):
+    def __init__(self, config_override: Dict[str, Any] = None, preload_schema: bool = True,
+                 schema: Optional[Dict[str, Any]] = None):
         """
         Initialize the Graph RAG agent.
         
         Args:
             config_override: Optional configuration overrides
             preload_schema: Whether to preload the graph schema during initialization
+            schema: Already loaded graph schema to use for every question instead of
+                fetching it from the database (disables schema refreshes until forced)
         """
         # Initialize base Agent with name
         super().__init__(name="graph_rag_agent")
@@ -81,10 +94,13 @@ class GraphRAGAgent(Agent):
             schema_manager=self.schema_manager
         )
         
-        self.graph_retriever = GraphRetrieverAgent()
+        self.graph_retriever = GraphRetrieverAgent(
+            embedding_cache_dir=self.config.get('embedding_cache_dir')
+        )
         
         self.reasoning_agent = ReasoningAgent(
-            system_prompt_path=os.path.join(self.prompts_dir, 'reasoning_system_prompt.txt')
+            system_prompt_path=os.path.join(self.prompts_dir, 'reasoning_system_prompt.txt'),
+            model=self.config.get('api_model', 'gpt-4o')
         )
         
         # Configure the workflow
@@ -92,8 +108,15 @@ class GraphRAGAgent(Agent):
         self.add_agent(self.graph_retriever)
         self.add_agent(self.reasoning_agent)
         
-        # Preload schema information if requested
-        if preload_schema:
+        # Semantic cache of answers to previously seen questions
+        self.response_cache = self._create_response_cache()
+        # Questions may be answered concurrently (see aprocess_question)
+        self._response_cache_lock = threading.Lock()
+        
+        # Use the injected schema, or preload schema information if requested
+        if schema is not None:
+            self.schema_manager.set_schema(schema)
+        elif preload_schema:
             logger.info("Preloading graph schema information...")
             try:
                 # This will trigger schema retrieval and caching
@@ -103,6 +126,51 @@ class GraphRAGAgent(Agent):
             except Exception as e:
                 logger.warning(f"Failed to preload graph schema: {e}. Will try again on first query.")
     
+    def _create_response_cache(self):
+        """
+        Create the semantic response cache if it is enabled and usable.
+        
+        Returns:
+            SemanticResponseCache instance, or None if caching is disabled
+        """
+        if not self.config.get('semantic_cache_enabled', False) or not SEMANTIC_CACHE_AVAILABLE:
+            return None
+        if not self.graph_retriever.enable_semantic_search:
+            return None
+        
+        try:
+            embedding_provider = self.graph_retriever.get_embedding_provider()
+            if isinstance(embedding_provider, DummyEmbeddingProvider):
+                # Random embeddings would make cache hits meaningless
+                logger.info("Semantic response cache disabled (no real embedding model available)")
+                return None
+            
+            response_cache = SemanticResponseCache(
+                embedding_provider,
+                threshold=self.config.get('semantic_cache_threshold', 0.92)
+            )
+            response_cache.load(self.config.get('semantic_cache_path'))
+            return response_cache
+        except Exception as e:
+            logger.warning(f"Failed to initialize semantic response cache: {e}")
+            return None
+    
+    def save_response_cache(self) -> bool:
+        """
+        Persist the semantic response cache to disk.
+        
+        Returns:
+            bool: True if the cache was saved, False otherwise
+        """
+        if self.response_cache is None:
+            return False
+        return self.response_cache.save(self.config.get('semantic_cache_path'))
+    
+    def save_caches(self):
+        """Persist the semantic response cache and the embedding cache to disk."""
+        self.save_response_cache()
+        self.graph_retriever.save_embedding_cache()
+    
     def add_agent(self, agent):
         """
         Add an agent to the workflow.
@@ -155,6 +223,16 @@ class GraphRAGAgent(Agent):
         Returns:
             Dictionary with the answer and supporting information
         """
+        # Answer from the semantic cache if a similar question was seen before
+        if self.response_cache is not None:
+            try:
+                with self._response_cache_lock:
+                    cached = self.response_cache.lookup(question)
+                if cached is not None:
+                    return dict(cached)
+            except Exception as e:
+                logger.warning(f"Semantic cache lookup failed: {e}")
+        
         # Wrap the question in the expected input format
         input_data = {'question': question}
         
@@ -191,9 +269,33 @@ class GraphRAGAgent(Agent):
                 "confidence": float(result.get("confidence", 0.0)),
                 "processing_time": float(result.get("processing_time", 0.0))
             }
+        
+        # Only cache successful answers
+        if self.response_cache is not None and not result.get('error'):
+            try:
+                with self._response_cache_lock:
+                    self.response_cache.add(question, result)
+            except Exception as e:
+                logger.warning(f"Failed to add answer to semantic cache: {e}")
             
         return result
         
+    async def aprocess_question(self, question: str) -> Dict:
+        """
+        Process a user question without blocking the event loop.
+        
+        The workflow runs in a worker thread, so several questions can be answered
+        concurrently: their LLM calls overlap while graph retrieval is serialized
+        by the retriever agent.
+        
+        Args:
+            question: The user's natural language question
+            
+        Returns:
+            Dictionary with the answer and supporting information
+        """
+        return await asyncio.to_thread(self.process_question, question)
+        
     def refresh_schema(self) -> bool:
         """
         Force a refresh of the graph schema information.
@@ -206,11 +308,34 @@ class GraphRAGAgent(Agent):
             # Force schema refresh through the schema manager
             self.schema_manager.get_schema(force_refresh=True)
             logger.info("Graph schema refreshed successfully")
+            
+            # Cached answers were generated against the old schema
+            if self.response_cache is not None:
+                with self._response_cache_lock:
+                    self.response_cache.clear(self.config.get('semantic_cache_path'))
+                logger.info("Semantic response cache cleared after schema refresh")
             return True
         except Exception as e:
             logger.error(f"Failed to refresh graph schema: {e}")
             return False
     
+    def warm_up(self):
+        """
+        Load the graph schema and the embedding model ahead of the first question.
+
+        Intended to be called once at service startup so that the first request
+        does not pay the schema retrieval and model loading cost.
+        """
+        logger.info("Warming up Graph RAG agent...")
+        try:
+            force_refresh = self.config.get('force_schema_refresh', False)
+            self.schema_manager.get_schema(force_refresh=force_refresh)
+        except Exception as e:
+            logger.warning(f"Failed to preload graph schema: {e}. Will try again on first query.")
+
+        self.graph_retriever.warm_up()
+        logger.info("Graph RAG agent warmed up")
+
     def register_hook(self, hook_point: str, hook_function):
         """
         Register a hook function to be called at a specific point in the workflow.
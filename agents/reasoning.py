@@ -10,6 +10,7 @@ This agent is responsible for:
 import os
 import json
 import logging
+from concurrent.futures import ThreadPoolExecutor
 from typing import Dict, List, Any, Optional
 from datetime import datetime, date
 
@@ -19,6 +20,9 @@ from agents.agent_base import Agent
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(name)s - %(levelname)s - %(message)s')
 logger = logging.getLogger(__name__)
 
+# Prompt cache key shared by all reasoning requests, which start with the same instructions
+REASONING_PROMPT_CACHE_KEY = "graph-rag-reasoning"
+
 # Custom JSON encoder for datetime objects
 class DateTimeEncoder(json.JSONEncoder):
     def default(self, obj):
@@ -42,15 +46,19 @@ def make_serializable(obj):
 class ReasoningAgent(Agent):
     """Agent that reasons over retrieved graph context to answer questions."""
     
-    def __init__(self, system_prompt_path: str = None, reasoning_prompt_path: str = None):
+    def __init__(self, system_prompt_path: str = None, reasoning_prompt_path: str = None,
+                 model: str = "gpt-4o"):
         """
         Initialize the reasoning agent.
         
         Args:
             system_prompt_path: Path to system prompt for the LLM
             reasoning_prompt_path: Path to reasoning prompt for the LLM
+            model: Model used for reasoning, e.g. one served by a self-hosted
+                OpenAI-compatible server with speculative decoding enabled
         """
         super().__init__()
+        self.model = model
         # Default to standard prompts if none provided
         self.system_prompt_path = system_prompt_path or os.path.join('prompts', 'reasoning_system_prompt.txt')
         self.reasoning_prompt_path = reasoning_prompt_path or os.path.join('prompts', 'reasoning_prompt.txt')
@@ -84,13 +92,7 @@ You should explain your reasoning process and cite specific evidence from the gr
         
         # Create reasoning prompt if it doesn't exist
         if not os.path.exists(self.reasoning_prompt_path):
-            reasoning_prompt = """Reason over the following graph context to answer the original question.
-
-ORIGINAL QUESTION:
-{{original_question}}
-
-GRAPH CONTEXT:
-{{graph_context}}
+            reasoning_prompt = """Reason over the graph context below to answer the original question.
 
 First analyze the retrieved information and identify relevant facts and patterns.
 Then reason step-by-step to develop an answer to the original question.
@@ -105,7 +107,13 @@ Return your answer in the following JSON format:
   "evidence": ["Specific piece of evidence 1", "Specific piece of evidence 2", ...],
   "confidence": 0-1 (your confidence in the answer based on available evidence)
 }
-```"""
+```
+
+GRAPH CONTEXT:
+{{graph_context}}
+
+ORIGINAL QUESTION:
+{{original_question}}"""
             
             with open(self.reasoning_prompt_path, 'w') as f:
                 f.write(reasoning_prompt)
@@ -194,23 +202,30 @@ Return your answer in the following JSON format:
         
         graph_context = "\n".join(formatted_context)
         
-        # Fill the prompt template
+        # Fill the prompt template, the question goes last so it is never read as a placeholder
         filled_prompt = (self.reasoning_prompt
-                        .replace("{{original_question}}", original_question)
-                        .replace("{{graph_context}}", graph_context))
+                        .replace("{{graph_context}}", graph_context)
+                        .replace("{{original_question}}", original_question))
         
         # Call the LLM for reasoning
         try:
             llm_response = self.llm_client.chat.completions.create(
-                model="gpt-4o",  # Use appropriate model
+                model=self.model,
                 messages=[
                     {"role": "system", "content": self.system_prompt},
                     {"role": "user", "content": filled_prompt}
                 ],
                 temperature=0.3,  # Moderate temperature for reasoning
-                response_format={"type": "json_object"}
+                response_format={"type": "json_object"},
+                # Routes requests sharing the instruction prefix to the same prompt cache
+                extra_body={"prompt_cache_key": REASONING_PROMPT_CACHE_KEY}
             )
             
+            usage = getattr(llm_response, 'usage', None)
+            details = getattr(usage, 'prompt_tokens_details', None)
+            if details is not None:
+                logger.debug(f"Reasoning prompt: {usage.prompt_tokens} tokens, {details.cached_tokens} cached")
+            
             # Extract and parse the response
             reasoning_result = json.loads(llm_response.choices[0].message.content)
             
@@ -240,4 +255,36 @@ Return your answer in the following JSON format:
             }
             
             # Ensure serializable before returning
-            return make_serializable(response)
\ No newline at end of file
+            return make_serializable(response)
+    
+    def process_batch(self, inputs: List[Dict], max_workers: int = 8) -> List[Dict]:
+        """
+        Generate answers for several inputs concurrently.
+        
+        Each input is independent, so the LLM round-trips overlap instead of
+        running back to back. Inputs expected to produce the longest answers are
+        submitted first, so a long generation does not start last and hold up the
+        whole batch. Results are returned in the order of the inputs.
+        
+        Args:
+            inputs: List of input dictionaries, as accepted by process
+            max_workers: Maximum number of concurrent LLM calls
+            
+        Returns:
+            List of dictionaries with the generated answers
+        """
+        if not inputs:
+            return []
+        
+        order = sorted(range(len(inputs)), key=lambda i: self._predict_answer_size(inputs[i]), reverse=True)
+        
+        with ThreadPoolExecutor(max_workers=max(1, min(max_workers, len(inputs)))) as executor:
+            futures = {i: executor.submit(self.process, inputs[i]) for i in order}
+            return [futures[i].result() for i in range(len(inputs))]
+    
+    @staticmethod
+    def _predict_answer_size(input_data: Dict) -> int:
+        """Rough size of the answer to an input, which grows with the number of retrieved rows."""
+        retrieved_context = input_data.get('retrieved_context', [])
+        rows = sum(item.get('result_count', len(item.get('result', []))) for item in retrieved_context)
+        return 50 + 20 * rows
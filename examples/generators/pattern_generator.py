@@ -5,6 +5,8 @@ This module implements a concrete strategy for generating question-answer exampl
 based on relationship patterns identified in the graph schema.
 """
 
+import asyncio
+import inspect
 import json
 import logging
 from typing import Dict, List, Any, Optional
@@ -14,9 +16,49 @@ from .base_generator import BaseExampleGenerator
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(name)s - %(levelname)s - %(message)s')
 logger = logging.getLogger(__name__)
 
+PATTERN_SYSTEM_PROMPT = "You are a graph database query specialist skilled at creating natural language questions about graph patterns and corresponding Cypher queries."
+
+# Completion parameters shared by the synchronous and asynchronous generation paths
+PATTERN_COMPLETION_PARAMS = {
+    "model": "gpt-4o",
+    "temperature": 0.3,
+    "response_format": {"type": "json_object"}
+}
+
+# Maximum number of patterns sent to the LLM in one batched request
+PATTERN_BATCH_SIZE = 16
+
 class PatternExampleGenerator(BaseExampleGenerator):
     """Generates examples based on relationship patterns in the graph."""
     
+    def generate_examples(self, schema: Dict[str, Any], rich_context: Dict[str, Any], count: int = 3) -> List[Dict[str, Any]]:
+        """
+        Generate question-answer examples based on schema and context.
+        
+        The selected patterns are sent to the LLM together, in batches of up to
+        PATTERN_BATCH_SIZE patterns, instead of one request per pattern.
+        
+        Args:
+            schema: The graph schema
+            rich_context: Additional context like node/relationship examples
+            count: Number of examples to generate
+            
+        Returns:
+            List of examples (each with question, query_plan, thought_process)
+        """
+        key_patterns = self._identify_key_patterns(schema, rich_context)[:count]
+        
+        all_examples = []
+        for start in range(0, len(key_patterns), PATTERN_BATCH_SIZE):
+            batch = key_patterns[start:start + PATTERN_BATCH_SIZE]
+            all_examples.extend(self._generate_examples_batch(batch, schema, rich_context))
+            
+            # Break if we have enough examples
+            if len(all_examples) >= count:
+                break
+        
+        return all_examples[:count]
+    
     def _identify_key_patterns(self, schema: Dict[str, Any], rich_context: Dict[str, Any]) -> List[Dict[str, Any]]:
         """
         Identify key relationship patterns for examples.
@@ -85,9 +127,246 @@ class PatternExampleGenerator(BaseExampleGenerator):
         if not self.llm_client:
             logger.warning("No LLM client provided, cannot generate examples")
             return []
+        
+        messages = self._build_pattern_messages(pattern, schema, rich_context)
+        if messages is None:
+            return []
+        
+        try:
+            # Call the LLM to generate examples
+            response = self.llm_client.chat.completions.create(messages=messages, **PATTERN_COMPLETION_PARAMS)
+            return self._parse_pattern_response(response, pattern)
+        except Exception as e:
+            logger.warning(f"Error generating examples for pattern {self._pattern_key(pattern)}: {e}")
+            return []
+    
+    def _generate_examples_batch(self, patterns: List[Dict[str, Any]], schema: Dict[str, Any], rich_context: Dict[str, Any]) -> List[Dict[str, Any]]:
+        """
+        Generate examples for several patterns with a single LLM request.
+        
+        Args:
+            patterns: The patterns to generate examples for
+            schema: The graph schema
+            rich_context: Additional context
             
-        examples = []
+        Returns:
+            List of examples for all the patterns, in pattern order
+        """
+        if len(patterns) == 1:
+            return self._generate_examples_for_pattern(patterns[0], schema, rich_context)
+        
+        if not self.llm_client:
+            logger.warning("No LLM client provided, cannot generate examples")
+            return []
+        
+        # Skip patterns missing required information
+        patterns = [p for p in patterns if all([p.get('source_type'), p.get('relationship_type'), p.get('target_type')])]
+        if not patterns:
+            return []
+        
+        try:
+            response = self.llm_client.chat.completions.create(
+                messages=self._build_batch_messages(patterns, schema, rich_context),
+                **PATTERN_COMPLETION_PARAMS
+            )
+            return self._parse_batch_response(response, patterns)
+        except Exception as e:
+            logger.warning(f"Error generating examples for {len(patterns)} patterns: {e}")
+            return []
+    
+    def _build_batch_messages(self, patterns: List[Dict[str, Any]], schema: Dict[str, Any], rich_context: Dict[str, Any]) -> List[Dict[str, str]]:
+        """
+        Build the chat messages asking the LLM for examples of several patterns.
+        
+        Args:
+            patterns: The patterns to generate examples for, all complete
+            schema: The graph schema
+            rich_context: Additional context
+            
+        Returns:
+            List of chat messages
+        """
+        pattern_sections = []
+        for number, pattern in enumerate(patterns, 1):
+            pattern_sections.append(
+                f"PATTERN {number}:\n"
+                f"({pattern['source_type']})-[:{pattern['relationship_type']}]->({pattern['target_type']})\n\n"
+                f"CONTEXT:\n{self._format_pattern_context(pattern, schema, rich_context)}"
+            )
+        patterns_text = "\n\n".join(pattern_sections)
+        
+        prompt = f"""Given the following graph database patterns and examples, generate 1-2 realistic natural language questions per pattern that users might ask about it, along with the corresponding Neo4j Cypher query to answer each question.
+
+{patterns_text}
+
+For each question, provide:
+1. The number of the pattern it is about
+2. A natural language question
+3. A Cypher query that accurately answers the question
+4. A brief explanation of why this query answers the question
+
+Format your response as a JSON object with an 'examples' array of objects containing 'pattern', 'question', 'cypher', and 'explanation' fields.
+"""
+        
+        return [
+            {"role": "system", "content": PATTERN_SYSTEM_PROMPT},
+            {"role": "user", "content": prompt}
+        ]
+    
+    def _parse_batch_response(self, response, patterns: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """
+        Parse the LLM completion for a batch of patterns into examples.
+        
+        Args:
+            response: Chat completion returned by the LLM client
+            patterns: The patterns the examples were generated for
+            
+        Returns:
+            List of examples, grouped in pattern order
+        """
+        content = response.choices[0].message.content
+        try:
+            parsed = json.loads(content)
+        except json.JSONDecodeError as e:
+            logger.warning(f"JSON parsing error: {e}")
+            return []
+        
+        items = parsed.get('examples', []) if isinstance(parsed, dict) else parsed
+        if not isinstance(items, list):
+            return []
+        
+        examples_by_pattern = [[] for _ in patterns]
+        for item in items:
+            if not isinstance(item, dict):
+                continue
+            
+            question = item.get('question')
+            cypher = item.get('cypher')
+            if not all([question, cypher]):
+                logger.warning(f"Skipping incomplete example: {item}")
+                continue
+            
+            try:
+                number = int(item.get('pattern', 1))
+            except (TypeError, ValueError):
+                number = 1
+            if not 1 <= number <= len(patterns):
+                logger.warning(f"Skipping example for unknown pattern {item.get('pattern')}")
+                continue
+            
+            examples_by_pattern[number - 1].append(
+                self._make_example(question, cypher, item.get('explanation'), patterns[number - 1])
+            )
+        
+        examples = [example for group in examples_by_pattern for example in group]
+        logger.info(f"Parsed {len(examples)} examples for {len(patterns)} patterns from LLM response")
+        return examples
+    
+    @staticmethod
+    def _make_example(question: str, cypher: str, explanation: Optional[str], pattern: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Format a generated question and query as an example.
+        
+        Args:
+            question: The natural language question
+            cypher: The Cypher query answering it
+            explanation: Why the query answers the question, if given
+            pattern: The pattern the example was generated for
+            
+        Returns:
+            Example with question, query_plan and thought_process
+        """
+        source_type = pattern.get('source_type')
+        relationship_type = pattern.get('relationship_type')
+        target_type = pattern.get('target_type')
+        
+        # Format as a query_plan object similar to what the QueryDecompositionAgent produces
+        return {
+            "question": question,
+            "query_plan": [
+                {
+                    "purpose": f"Retrieve information about {source_type} and {target_type} via {relationship_type}",
+                    "cypher": cypher
+                }
+            ],
+            "thought_process": explanation or f"This query finds the relationship between {source_type} and {target_type} using the {relationship_type} relationship."
+        }
+    
+    async def _generate_examples_for_pattern_async(self, pattern: Dict[str, Any], schema: Dict[str, Any], rich_context: Dict[str, Any]) -> List[Dict[str, Any]]:
+        """
+        Generate examples for a specific pattern without blocking the event loop.
+        
+        The completion is awaited directly when the LLM client is asynchronous
+        (e.g. AsyncOpenAI); a synchronous client is run in a worker thread.
+        
+        Args:
+            pattern: The pattern to generate examples for
+            schema: The graph schema
+            rich_context: Additional context
+            
+        Returns:
+            List of examples for this pattern
+        """
+        if not self.llm_client:
+            logger.warning("No LLM client provided, cannot generate examples")
+            return []
         
+        messages = self._build_pattern_messages(pattern, schema, rich_context)
+        if messages is None:
+            return []
+        
+        try:
+            create = self.llm_client.chat.completions.create
+            # The client wraps its coroutine methods, so look through the decorators
+            if inspect.iscoroutinefunction(inspect.unwrap(create)):
+                response = await create(messages=messages, **PATTERN_COMPLETION_PARAMS)
+            else:
+                response = await asyncio.to_thread(create, messages=messages, **PATTERN_COMPLETION_PARAMS)
+            return self._parse_pattern_response(response, pattern)
+        except Exception as e:
+            logger.warning(f"Error generating examples for pattern {self._pattern_key(pattern)}: {e}")
+            return []
+    
+    async def generate_examples_for_patterns_async(self, patterns: List[Dict[str, Any]], schema: Dict[str, Any],
+                                                   rich_context: Dict[str, Any],
+                                                   max_concurrency: int = 8) -> List[List[Dict[str, Any]]]:
+        """
+        Generate examples for several patterns concurrently.
+        
+        Args:
+            patterns: The patterns to generate examples for
+            schema: The graph schema
+            rich_context: Additional context
+            max_concurrency: Maximum number of LLM requests in flight at once
+            
+        Returns:
+            List of example lists, in the same order as the patterns
+        """
+        semaphore = asyncio.Semaphore(max(1, max_concurrency))
+        
+        async def generate(pattern):
+            async with semaphore:
+                return await self._generate_examples_for_pattern_async(pattern, schema, rich_context)
+        
+        return await asyncio.gather(*[generate(pattern) for pattern in patterns])
+    
+    @staticmethod
+    def _pattern_key(pattern: Dict[str, Any]) -> str:
+        """Readable key of a pattern for log messages."""
+        return f"{pattern.get('source_type')}-{pattern.get('relationship_type')}->{pattern.get('target_type')}"
+    
+    def _build_pattern_messages(self, pattern: Dict[str, Any], schema: Dict[str, Any], rich_context: Dict[str, Any]) -> Optional[List[Dict[str, str]]]:
+        """
+        Build the chat messages asking the LLM for examples of a pattern.
+        
+        Args:
+            pattern: The pattern to generate examples for
+            schema: The graph schema
+            rich_context: Additional context
+            
+        Returns:
+            List of chat messages, or None if the pattern is incomplete
+        """
         # Extract pattern information
         source_type = pattern.get('source_type')
         relationship_type = pattern.get('relationship_type')
@@ -95,7 +374,7 @@ class PatternExampleGenerator(BaseExampleGenerator):
         
         # Skip if missing required information
         if not all([source_type, relationship_type, target_type]):
-            return []
+            return None
         
         # Format context for the pattern
         pattern_context = self._format_pattern_context(pattern, schema, rich_context)
@@ -117,113 +396,93 @@ For each question, provide:
 Format your response as a JSON array with objects containing 'question', 'cypher', and 'explanation' fields.
 """
 
+        return [
+            {"role": "system", "content": PATTERN_SYSTEM_PROMPT},
+            {"role": "user", "content": prompt}
+        ]
+    
+    def _parse_pattern_response(self, response, pattern: Dict[str, Any]) -> List[Dict[str, Any]]:
+        """
+        Parse the LLM completion for a pattern into examples.
+        
+        Args:
+            response: Chat completion returned by the LLM client
+            pattern: The pattern the examples were generated for
+            
+        Returns:
+            List of examples for this pattern
+        """
+        examples = []
+        
+        # Parse the response
         try:
-            # Call the LLM to generate examples
-            response = self.llm_client.chat.completions.create(
-                model="gpt-4o",
-                messages=[
-                    {"role": "system", "content": "You are a graph database query specialist skilled at creating natural language questions about graph patterns and corresponding Cypher queries."},
-                    {"role": "user", "content": prompt}
-                ],
-                temperature=0.3,
-                response_format={"type": "json_object"}
-            )
+            # Get the raw content first
+            content = response.choices[0].message.content
+            logger.info(f"Raw LLM response: {content[:200]}...")
             
-            # Parse the response
+            # Try to parse as JSON
             try:
-                # Get the raw content first
-                content = response.choices[0].message.content
-                logger.info(f"Raw LLM response: {content[:200]}...")
+                pattern_examples = json.loads(content)
                 
-                # Try to parse as JSON
-                try:
-                    pattern_examples = json.loads(content)
-                    
-                    # Try different JSON structures
-                    gen_examples = []
-                    
-                    # Case 1: Response is an object with an 'examples' key
-                    if isinstance(pattern_examples, dict) and 'examples' in pattern_examples:
-                        gen_examples = pattern_examples.get('examples', [])
-                    
-                    # Case 2: Response is a list directly
-                    elif isinstance(pattern_examples, list):
-                        gen_examples = pattern_examples
-                        
-                    # Case 3: Special case for single example
-                    elif isinstance(pattern_examples, dict) and 'question' in pattern_examples and 'cypher' in pattern_examples:
-                        gen_examples = [pattern_examples]
-                        
-                    # Case 4: Response has a 'questions' array
-                    elif isinstance(pattern_examples, dict) and 'questions' in pattern_examples:
-                        gen_examples = pattern_examples.get('questions', [])
-                    
-                    logger.info(f"Parsed {len(gen_examples)} examples from LLM response")
-                    
-                    # Format examples in the expected structure
-                    for example in gen_examples:
-                        question = example.get('question')
-                        cypher = example.get('cypher')
-                        explanation = example.get('explanation')
-                        
-                        if not all([question, cypher]):
-                            logger.warning(f"Skipping incomplete example: {example}")
-                            continue
-                        
-                        # Format as a query_plan object similar to what the QueryDecompositionAgent produces
-                        query_plan = [
-                            {
-                                "purpose": f"Retrieve information about {source_type} and {target_type} via {relationship_type}",
-                                "cypher": cypher
-                            }
-                        ]
-                        
-                        examples.append({
-                            "question": question,
-                            "query_plan": query_plan,
-                            "thought_process": explanation or f"This query finds the relationship between {source_type} and {target_type} using the {relationship_type} relationship."
-                        })
-                except json.JSONDecodeError as e:
-                    logger.warning(f"JSON parsing error: {e}")
+                # Try different JSON structures
+                gen_examples = []
+                
+                # Case 1: Response is an object with an 'examples' key
+                if isinstance(pattern_examples, dict) and 'examples' in pattern_examples:
+                    gen_examples = pattern_examples.get('examples', [])
+                
+                # Case 2: Response is a list directly
+                elif isinstance(pattern_examples, list):
+                    gen_examples = pattern_examples
                     
-                    # Try to extract examples from non-JSON format using regex
-                    import re
-                    question_pattern = r'(?:Question|Natural language question):\s*(.*?)(?:\n|$)'
-                    cypher_pattern = r'(?:Cypher|Query):\s*(MATCH.*?)(?:\n\n|\n[A-Z]|$)'
-                    explanation_pattern = r'(?:Explanation|Why):\s*(.*?)(?:\n\n|\n[A-Z]|$)'
+                # Case 3: Special case for single example
+                elif isinstance(pattern_examples, dict) and 'question' in pattern_examples and 'cypher' in pattern_examples:
+                    gen_examples = [pattern_examples]
                     
-                    questions = re.findall(question_pattern, content, re.DOTALL)
-                    cyphers = re.findall(cypher_pattern, content, re.DOTALL)
-                    explanations = re.findall(explanation_pattern, content, re.DOTALL)
+                # Case 4: Response has a 'questions' array
+                elif isinstance(pattern_examples, dict) and 'questions' in pattern_examples:
+                    gen_examples = pattern_examples.get('questions', [])
+                
+                logger.info(f"Parsed {len(gen_examples)} examples from LLM response")
+                
+                # Format examples in the expected structure
+                for example in gen_examples:
+                    question = example.get('question')
+                    cypher = example.get('cypher')
+                    explanation = example.get('explanation')
                     
-                    logger.info(f"Regex extracted: {len(questions)} questions, {len(cyphers)} cyphers")
+                    if not all([question, cypher]):
+                        logger.warning(f"Skipping incomplete example: {example}")
+                        continue
                     
-                    # Create examples from matched patterns
-                    for i in range(min(len(questions), len(cyphers))):
-                        question = questions[i].strip()
-                        cypher = cyphers[i].strip()
-                        explanation = explanations[i].strip() if i < len(explanations) else None
-                        
-                        if not question or not cypher:
-                            continue
-                            
-                        query_plan = [
-                            {
-                                "purpose": f"Retrieve information about {source_type} and {target_type} via {relationship_type}",
-                                "cypher": cypher
-                            }
-                        ]
-                        
-                        examples.append({
-                            "question": question,
-                            "query_plan": query_plan,
-                            "thought_process": explanation or f"This query finds the relationship between {source_type} and {target_type} using the {relationship_type} relationship."
-                        })
+                    examples.append(self._make_example(question, cypher, explanation, pattern))
             except json.JSONDecodeError as e:
-                logger.warning(f"Error parsing LLM response: {e}")
+                logger.warning(f"JSON parsing error: {e}")
                 
-        except Exception as e:
-            logger.warning(f"Error generating examples for pattern {source_type}-{relationship_type}->{target_type}: {e}")
+                # Try to extract examples from non-JSON format using regex
+                import re
+                question_pattern = r'(?:Question|Natural language question):\s*(.*?)(?:\n|$)'
+                cypher_pattern = r'(?:Cypher|Query):\s*(MATCH.*?)(?:\n\n|\n[A-Z]|$)'
+                explanation_pattern = r'(?:Explanation|Why):\s*(.*?)(?:\n\n|\n[A-Z]|$)'
+                
+                questions = re.findall(question_pattern, content, re.DOTALL)
+                cyphers = re.findall(cypher_pattern, content, re.DOTALL)
+                explanations = re.findall(explanation_pattern, content, re.DOTALL)
+                
+                logger.info(f"Regex extracted: {len(questions)} questions, {len(cyphers)} cyphers")
+                
+                # Create examples from matched patterns
+                for i in range(min(len(questions), len(cyphers))):
+                    question = questions[i].strip()
+                    cypher = cyphers[i].strip()
+                    explanation = explanations[i].strip() if i < len(explanations) else None
+                    
+                    if not question or not cypher:
+                        continue
+                    
+                    examples.append(self._make_example(question, cypher, explanation, pattern))
+        except json.JSONDecodeError as e:
+            logger.warning(f"Error parsing LLM response: {e}")
         
         return examples
     
@@ -6,7 +6,7 @@ implementations should inherit from.
 """
 
 from abc import ABC, abstractmethod
-from typing import List, Dict, Any, Optional, Union
+from typing import List, Dict, Any, Optional, Union, Iterator, Tuple
 
 
 class GraphDatabaseInterface(ABC):
@@ -46,6 +46,37 @@ class GraphDatabaseInterface(ABC):
         """
         pass
 
+    def stream_query(self, query: str, params: Optional[Dict[str, Any]] = None) -> Iterator[Dict[str, Any]]:
+        """
+        Execute a query and yield its results one record at a time.
+
+        Implementations that can fetch records lazily should override this, the
+        default falls back to execute_query and yields from the full result.
+
+        Args:
+            query: The query string to execute
+            params: Optional parameters for the query
+
+        Returns:
+            Iterator[Dict[str, Any]]: Results from the query
+        """
+        yield from self.execute_query(query, params)
+
+    def execute_queries(self, queries: List[Tuple[str, Optional[Dict[str, Any]]]]) -> List[List[Dict[str, Any]]]:
+        """
+        Execute several queries and return their results in order.
+
+        Implementations that can share a session or connection across queries
+        should override this, the default runs execute_query once per query.
+
+        Args:
+            queries: List of (query string, optional parameters) pairs
+
+        Returns:
+            List[List[Dict[str, Any]]]: Results of each query, in the same order
+        """
+        return [self.execute_query(query, params) for query, params in queries]
+
     @abstractmethod
     def create_node(self, label: str, properties: Dict[str, Any]) -> Optional[str]:
         """
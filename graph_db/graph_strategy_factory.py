@@ -59,7 +59,7 @@ class GraphDatabaseFactory:
                         def execute_query(self, query, params=None): return []
                     return MockDatabase()
                 else:
-                    return Neo4jDatabase()
+                    return Neo4jDatabase(shared=True)
         except Exception as e:
             logger.error(f"Error creating database implementation: {e}")
             # Return a minimal implementation that doesn't throw errors
@@ -68,4 +68,21 @@ class GraphDatabaseFactory:
                 def connect(self): return False
                 def close(self): return True
                 def execute_query(self, query, params=None): return []
-            return ErrorDatabase()
\ No newline at end of file
+            return ErrorDatabase()
+    
+    @staticmethod
+    def get(uri: Optional[str] = None, user: Optional[str] = None, password: Optional[str] = None,
+            database: Optional[str] = None) -> GraphDatabaseInterface:
+        """
+        Create a Neo4j database for explicit credentials that reuses the shared driver.
+        
+        Args:
+            uri: Neo4j URI (defaults to NEO4J_URI)
+            user: Neo4j username (defaults to NEO4J_USER)
+            password: Neo4j password (defaults to NEO4J_PASSWORD)
+            database: Neo4j database name (defaults to NEO4J_DATABASE)
+            
+        Returns:
+            GraphDatabaseInterface: Neo4j database implementation
+        """
+        return Neo4jDatabase(uri=uri, user=user, password=password, database=database, shared=True)
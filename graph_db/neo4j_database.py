@@ -5,8 +5,10 @@ This module provides a Neo4j implementation of the GraphDatabaseInterface.
 """
 
 import os
+import atexit
 import logging
-from typing import List, Dict, Any, Optional, Union
+import threading
+from typing import List, Dict, Any, Optional, Union, Iterator, Tuple
 from datetime import datetime
 from .graph_interface import GraphDatabaseInterface
 
@@ -63,10 +65,40 @@ except ImportError as e:
     if 'GraphDatabase' not in locals():
         GraphDatabase = MockGraphDatabase
 
+# Drivers shared by every Neo4jDatabase created with shared=True, keyed by credentials.
+# A driver owns a connection pool and is safe to use from several threads.
+_shared_drivers: Dict[Tuple[str, str, str], Any] = {}
+_shared_drivers_lock = threading.Lock()
+
+def get_shared_driver(uri: str, user: str, password: str):
+    """
+    Get the process-wide driver for the given credentials, creating it on first use.
+
+    The driver is closed when the interpreter exits.
+
+    Args:
+        uri: Neo4j URI
+        user: Neo4j username
+        password: Neo4j password
+
+    Returns:
+        The shared Neo4j driver
+    """
+    key = (uri, user, password)
+    with _shared_drivers_lock:
+        driver = _shared_drivers.get(key)
+        if driver is None:
+            logger.info(f"Creating shared Neo4j driver for {uri}")
+            driver = GraphDatabase.driver(uri, auth=(user, password))
+            _shared_drivers[key] = driver
+            atexit.register(driver.close)
+        return driver
+
 class Neo4jDatabase(GraphDatabaseInterface):
     """Neo4j implementation of the GraphDatabaseInterface."""
 
-    def __init__(self, uri: Optional[str] = None, user: Optional[str] = None, password: Optional[str] = None, database: Optional[str] = None):
+    def __init__(self, uri: Optional[str] = None, user: Optional[str] = None, password: Optional[str] = None, database: Optional[str] = None,
+                 shared: bool = False):
         """
         Initialize the Neo4j database connection parameters.
 
@@ -75,12 +107,15 @@ class Neo4jDatabase(GraphDatabaseInterface):
             user: Neo4j username
             password: Neo4j password
             database: Neo4j database name
+            shared: Whether to reuse the process-wide driver for these credentials
+                instead of creating one per connection (close then keeps it open)
         """
         # Use environment variables if not provided
         self.uri = uri or os.environ.get("NEO4J_URI", "bolt://localhost:7687")
         self.user = user or os.environ.get("NEO4J_USER", "neo4j")
         self.password = password or os.environ.get("NEO4J_PASSWORD", "password")
         self.database = database or os.environ.get("NEO4J_DATABASE", "neo4j")
+        self.shared = shared
         self.driver = None
 
     def connect(self) -> bool:
@@ -96,7 +131,10 @@ class Neo4jDatabase(GraphDatabaseInterface):
             
         try:
             logger.info(f"Connecting to Neo4j at {self.uri}...")
-            self.driver = GraphDatabase.driver(self.uri, auth=(self.user, self.password))
+            if self.shared:
+                self.driver = get_shared_driver(self.uri, self.user, self.password)
+            else:
+                self.driver = GraphDatabase.driver(self.uri, auth=(self.user, self.password))
             
             # Test the connection
             with self.driver.session(database=self.database) as session:
@@ -118,7 +156,9 @@ class Neo4jDatabase(GraphDatabaseInterface):
         """
         try:
             if self.driver:
-                self.driver.close()
+                # A shared driver stays open for the other users and is closed at exit
+                if not self.shared:
+                    self.driver.close()
                 self.driver = None
                 logger.info("Neo4j connection closed")
             return True
@@ -164,6 +204,62 @@ class Neo4jDatabase(GraphDatabaseInterface):
                 logger.error(f"Failed to log query error: {log_err}")
             return []
 
+    def stream_query(self, query: str, params: Optional[Dict[str, Any]] = None) -> Iterator[Dict[str, Any]]:
+        """
+        Execute a Cypher query and yield records as the driver receives them.
+
+        The session stays open until the iterator is exhausted or closed, so the
+        caller can start working on the first records before the rest arrive.
+
+        Args:
+            query: Cypher query string
+            params: Optional parameters for the query
+
+        Returns:
+            Iterator[Dict[str, Any]]: Results from the query
+        """
+        if not self.driver:
+            logger.error("Not connected to Neo4j. Call connect() first.")
+            return
+            
+        query_preview = query[:100] + "..." if len(query) > 100 else query
+        logger.info(f"Streaming query: {query_preview}")
+        
+        with self.driver.session(database=self.database) as session:
+            for record in session.run(query, parameters=params or {}):
+                yield record.data()
+
+    def execute_queries(self, queries: List[Tuple[str, Optional[Dict[str, Any]]]]) -> List[List[Dict[str, Any]]]:
+        """
+        Execute several Cypher queries in a single session.
+
+        Reusing one session avoids acquiring a pooled connection per query. A failing
+        query yields an empty result without affecting the others, as in execute_query.
+
+        Args:
+            queries: List of (query string, optional parameters) pairs
+
+        Returns:
+            List[List[Dict[str, Any]]]: Results of each query, in the same order
+        """
+        if not self.driver:
+            logger.error("Not connected to Neo4j. Call connect() first.")
+            return [[] for _ in queries]
+        
+        results = []
+        with self.driver.session(database=self.database) as session:
+            for query, params in queries:
+                query_preview = query[:100] + "..." if len(query) > 100 else query
+                logger.info(f"Executing query: {query_preview}")
+                try:
+                    records = [record.data() for record in session.run(query, parameters=params or {})]
+                    logger.info(f"Query executed successfully, returned {len(records)} records")
+                except Exception as e:
+                    logger.error(f"Error executing query: {e}")
+                    records = []
+                results.append(records)
+        return results
+
     def create_node(self, label: str, properties: Dict[str, Any]) -> Optional[str]:
         """
         Create a node in Neo4j.
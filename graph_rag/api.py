@@ -0,0 +1,315 @@
+"""
+Graph RAG API - FastAPI application exposing the Graph RAG agent.
+
+Run with an ASGI server, e.g. `uvicorn graph_rag.api:app` or `python scripts/run_api.py`.
+"""
+
+from contextlib import asynccontextmanager
+from anyio import to_thread
+from fastapi import FastAPI, HTTPException, Depends, Request, Response
+from fastapi.responses import JSONResponse, ORJSONResponse
+from pydantic import BaseModel
+from typing import Dict, List, Any, Optional
+import logging
+import os
+import sys
+import json
+import time
+import hashlib
+import orjson
+from datetime import datetime, date
+
+logger = logging.getLogger(__name__)
+
+# Add the current directory to the path
+sys.path.insert(0, os.getcwd())
+
+# Custom JSON encoder to handle datetime objects
+class DateTimeEncoder(json.JSONEncoder):
+    def default(self, obj):
+        if isinstance(obj, (datetime, date)):
+            return obj.isoformat()
+        return super(DateTimeEncoder, self).default(obj)
+
+def serializable_dict(obj):
+    """Convert an object to a serializable dictionary."""
+    if isinstance(obj, (str, int, float, bool, type(None))):
+        return obj
+    elif isinstance(obj, (datetime, date)):
+        return obj.isoformat()
+    elif isinstance(obj, dict):
+        return {k: serializable_dict(v) for k, v in obj.items()}
+    elif isinstance(obj, (list, tuple, set)):
+        return [serializable_dict(x) for x in obj]
+    else:
+        return str(obj)
+
+# Import the required modules
+def setup_schema_and_agent():
+    """Create the schema manager and Graph RAG agent."""
+    try:
+        # First try importing the modules as a package
+        from agents.rag_orchestrator import GraphRAGAgent
+        from schema.manager import SchemaManager
+        
+        # Create a schema manager
+        schema_manager = SchemaManager()
+        
+        # Create the agent
+        graph_rag_agent = GraphRAGAgent(preload_schema=False)
+        
+        return schema_manager, graph_rag_agent
+    except ImportError:
+        # Fall back to simpler imports
+        import sys
+        sys.path.append(".")  # Add current directory to path
+        
+        from schema.manager import SchemaManager
+        
+        # Create schema manager
+        schema_manager = SchemaManager()
+        
+        # Create a simple agent class
+        class SimpleGraphRAGAgent:
+            def __init__(self):
+                self.schema_manager = schema_manager
+            
+            def process_question(self, question):
+                return {
+                    "answer": f"This is a placeholder answer for: {question}",
+                    "reasoning": "Simple reasoning process",
+                    "evidence": ["No evidence available in simplified mode"],
+                    "confidence": 0.5,
+                    "processing_time": 0.0
+                }
+                
+            def refresh_schema(self):
+                return True
+        
+        # Return simplified implementations
+        return schema_manager, SimpleGraphRAGAgent()
+
+def create_schema_and_agent():
+    """
+    Create the schema manager and Graph RAG agent, falling back to minimal
+    implementations if the modules cannot be loaded.
+    
+    Returns:
+        Tuple of (schema_manager, graph_rag_agent)
+    """
+    try:
+        return setup_schema_and_agent()
+    except Exception as e:
+        logger.error(f"Error setting up modules: {e}")
+        error_message = str(e)
+        
+        # Create minimal implementations for testing the API
+        class SimpleSchemaManager:
+            def get_schema(self, force_refresh=False):
+                return {"node_types": {}, "relationship_types": {}}
+                
+        class SimpleGraphRAGAgent:
+            def process_question(self, question):
+                return {
+                    "answer": f"API is running but modules could not be loaded. Error: {error_message}",
+                    "reasoning": "Error in setup",
+                    "evidence": [],
+                    "confidence": 0.0,
+                    "processing_time": 0.0
+                }
+                
+            def refresh_schema(self):
+                return False
+                
+        return SimpleSchemaManager(), SimpleGraphRAGAgent()
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """
+    Build the agent and warm up the schema and embedding model before serving
+    requests, so the first query does not pay the cold-start cost.
+    """
+    schema_manager, graph_rag_agent = create_schema_and_agent()
+    
+    # Model loading and schema retrieval are blocking, keep them off the event loop
+    if hasattr(graph_rag_agent, "warm_up"):
+        await to_thread.run_sync(graph_rag_agent.warm_up)
+    try:
+        await to_thread.run_sync(schema_manager.get_schema)
+    except Exception as e:
+        logger.warning(f"Failed to preload schema: {e}")
+    
+    app.state.schema_manager = schema_manager
+    app.state.agent = graph_rag_agent
+    yield
+    
+    # Persist the semantic response and embedding caches so they survive restarts
+    if hasattr(graph_rag_agent, "save_caches"):
+        await to_thread.run_sync(graph_rag_agent.save_caches)
+
+# Define API models
+class QuestionRequest(BaseModel):
+    question: str
+
+class AnswerResponse(BaseModel):
+    answer: str
+    reasoning: str
+    evidence: List[str]
+    confidence: float
+    processing_time: float
+
+class SchemaResponse(BaseModel):
+    success: bool
+    message: str
+    schema_data: Optional[Dict[str, Any]] = None  # Renamed from 'schema' to avoid shadowing BaseModel attribute
+
+# Create FastAPI application
+app = FastAPI(
+    title="Taxonomy Graph RAG API",
+    description="API for querying taxonomy information using a graph RAG approach",
+    version="1.0.0",
+    lifespan=lifespan,
+    default_response_class=ORJSONResponse
+)
+
+# Serialized /schema response and its ETag, rebuilt when invalidated by
+# /schema/refresh or after SCHEMA_RESPONSE_TTL seconds
+SCHEMA_RESPONSE_TTL = 300
+_schema_cache = {"etag": None, "bytes": b"", "created_at": 0.0}
+
+def invalidate_schema_cache():
+    """Drop the cached serialized schema so the next request rebuilds it."""
+    _schema_cache["etag"] = None
+    _schema_cache["bytes"] = b""
+
+# Dependency to get the schema for endpoints
+async def get_schema(request: Request):
+    """Get the serialized schema response and its ETag."""
+    if _schema_cache["etag"] is not None and time.time() - _schema_cache["created_at"] < SCHEMA_RESPONSE_TTL:
+        return _schema_cache["etag"], _schema_cache["bytes"]
+    
+    try:
+        # Get the raw schema data for API response
+        schema_data = request.app.state.schema_manager.get_schema()
+        
+        # Convert to serializable form
+        blob = orjson.dumps({
+            "success": True,
+            "message": "Schema retrieved successfully",
+            "schema_data": serializable_dict(schema_data)
+        })
+    except Exception as e:
+        logger.error(f"Error retrieving schema: {e}")
+        raise HTTPException(status_code=500, detail=f"Failed to retrieve schema: {str(e)}")
+    
+    _schema_cache["etag"] = '"' + hashlib.sha256(blob).hexdigest() + '"'
+    _schema_cache["bytes"] = blob
+    _schema_cache["created_at"] = time.time()
+    return _schema_cache["etag"], blob
+
+@app.post("/query", response_model=AnswerResponse)
+async def query_taxonomy(request: QuestionRequest, http_request: Request):
+    """
+    Query the taxonomy with a natural language question.
+    
+    Args:
+        request: Object containing the question
+        
+    Returns:
+        Object containing the answer and supporting information
+    """
+    try:
+        # Process the question in a worker thread, so other requests are served
+        # while it waits on the database and the LLM
+        raw_result = await to_thread.run_sync(http_request.app.state.agent.process_question, request.question)
+        
+        # Convert to serializable form
+        result = serializable_dict(raw_result)
+        
+        # Extract the relevant fields for the response
+        response = {
+            "answer": result.get("answer", ""),
+            "reasoning": result.get("reasoning", ""),
+            "evidence": result.get("evidence", []),
+            "confidence": result.get("confidence", 0.0),
+            "processing_time": result.get("processing_time", 0.0)
+        }
+        
+        # Returning the response directly skips re-validating it through the Pydantic model
+        return ORJSONResponse(content=response)
+    
+    except Exception as e:
+        logger.error(f"Error processing question: {e}")
+        # Return a fallback response instead of raising an exception
+        return {
+            "answer": f"Sorry, an error occurred while processing your question: {str(e)}",
+            "reasoning": "Error in processing",
+            "evidence": [],
+            "confidence": 0.0,
+            "processing_time": 0.0
+        }
+
+@app.get("/schema", response_model=SchemaResponse)
+async def get_current_schema(request: Request, schema: tuple = Depends(get_schema)):
+    """
+    Get the current graph schema information.
+    
+    Supports conditional requests: clients sending the ETag of their copy in
+    If-None-Match receive 304 Not Modified while the schema is unchanged.
+    
+    Returns:
+        Object containing the current schema
+    """
+    etag, blob = schema
+    if request.headers.get("if-none-match") == etag:
+        return Response(status_code=304, headers={"ETag": etag})
+    
+    return Response(content=blob, media_type="application/json", headers={"ETag": etag})
+
+@app.post("/schema/refresh", response_model=SchemaResponse)
+async def refresh_schema(request: Request):
+    """
+    Force a refresh of the graph schema information.
+    
+    Returns:
+        Object indicating success or failure
+    """
+    try:
+        success = request.app.state.agent.refresh_schema()
+        invalidate_schema_cache()
+        
+        if success:
+            # Get the newly refreshed schema
+            schema_data = request.app.state.schema_manager.get_schema(force_refresh=True)
+            
+            # Convert to serializable form
+            schema_data = serializable_dict(schema_data)
+            
+            return {
+                "success": True,
+                "message": "Schema refreshed successfully",
+                "schema_data": schema_data
+            }
+        else:
+            return {
+                "success": False,
+                "message": "Failed to refresh schema",
+                "schema_data": None
+            }
+    except Exception as e:
+        logger.error(f"Error refreshing schema: {e}")
+        return {
+            "success": False,
+            "message": f"Error refreshing schema: {str(e)}",
+            "schema_data": None
+        }
+
+@app.get("/health")
+async def health_check():
+    """
+    Health check endpoint.
+    
+    Returns:
+        Object indicating the service is up
+    """
+    return {"status": "ok", "service": "graph-rag-api"}
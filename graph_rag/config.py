@@ -22,6 +22,12 @@ DEFAULT_CONFIG = {
     'schema_cache_dir': os.path.join('graph_rag', 'schema', 'cache'),
     'force_schema_refresh': False,
     
+    # Semantic response cache settings
+    'semantic_cache_enabled': False,  # opt-in, cached answers can go stale
+    'semantic_cache_threshold': 0.92,  # minimum cosine similarity for a cache hit
+    'semantic_cache_path': os.path.join('semantic', 'cache', 'response_cache'),
+    'embedding_cache_dir': os.path.join('semantic', 'cache'),
+    
     # Prompts
     'prompts_dir': os.path.join('graph_rag', 'prompts'),
     
@@ -39,6 +45,9 @@ DEFAULT_CONFIG = {
     'trace_queries': False
 }
 
+# Environment variable values that enable a flag
+TRUE_VALUES = frozenset(('1', 'true', 'yes', 'True'))
+
 
 def get_config(override_config: Dict[str, Any] = None) -> Dict[str, Any]:
     """
@@ -50,15 +59,18 @@ def get_config(override_config: Dict[str, Any] = None) -> Dict[str, Any]:
     Returns:
         The complete configuration dictionary
     """
+    # The defaults are built once at import, each call only copies them. The
+    # environment is read on every call so that changes to it take effect.
     config = DEFAULT_CONFIG.copy()
     
     # Apply environment overrides
     env_overrides = {
         'api_model': os.environ.get('GRAPH_RAG_MODEL'),
-        'debug': os.environ.get('GRAPH_RAG_DEBUG') in ('1', 'true', 'yes', 'True'),
-        'trace_queries': os.environ.get('GRAPH_RAG_TRACE') in ('1', 'true', 'yes', 'True'),
+        'debug': os.environ.get('GRAPH_RAG_DEBUG') in TRUE_VALUES,
+        'trace_queries': os.environ.get('GRAPH_RAG_TRACE') in TRUE_VALUES,
         'schema_cache_ttl': int(os.environ.get('GRAPH_RAG_CACHE_TTL', 0)) or None,
-        'force_schema_refresh': os.environ.get('GRAPH_RAG_REFRESH_SCHEMA') in ('1', 'true', 'yes', 'True')
+        'force_schema_refresh': os.environ.get('GRAPH_RAG_REFRESH_SCHEMA') in TRUE_VALUES,
+        'semantic_cache_enabled': os.environ.get('GRAPH_RAG_SEMANTIC_CACHE') in TRUE_VALUES
     }
     
     # Only update config with non-None environment values
@@ -6,12 +6,45 @@ generated examples based on the schema and available data.
 """
 
 import os
+import re
 import logging
+from functools import lru_cache
 from typing import Dict, List, Any, Optional
 
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(name)s - %(levelname)s - %(message)s')
 logger = logging.getLogger(__name__)
 
+# Template placeholders look like {{name}}
+PLACEHOLDER_PATTERN = re.compile(r"\{\{(\w+)\}\}")
+
+@lru_cache(maxsize=32)
+def _split_template(template: str) -> tuple:
+    """Split a template into alternating literal text and placeholder names."""
+    return tuple(PLACEHOLDER_PATTERN.split(template))
+
+def _render_template(template: str, values: Dict[str, str]) -> str:
+    """
+    Fill in the placeholders of a template in a single pass.
+    
+    Args:
+        template: Template text with {{name}} placeholders
+        values: Replacement text by placeholder name, unknown placeholders are kept
+        
+    Returns:
+        The rendered text
+    """
+    parts = list(_split_template(template))
+    for i in range(1, len(parts), 2):
+        name = parts[i]
+        parts[i] = values[name] if name in values else f"{{{{{name}}}}}"
+    return "".join(parts)
+
+@lru_cache(maxsize=32)
+def _read_template(template_path: str) -> str:
+    """Read a template file, shared by all PromptBuilder instances."""
+    with open(template_path, 'r') as f:
+        return f.read()
+
 class PromptBuilder:
     """Builds prompts with dynamically generated examples."""
     
@@ -30,6 +63,10 @@ class PromptBuilder:
         # Initialize template cache
         self.template_cache = {}
         
+        # Last formatted examples as (examples list, text). Callers pass the same
+        # list for every question, so it is only formatted once
+        self._examples_cache = None
+        
         # Pre-load common templates
         self._load_template('query_decomposition_prompt.txt')
     
@@ -37,6 +74,9 @@ class PromptBuilder:
         """
         Load a template from disk and cache it in memory.
         
+        The file contents are cached per path across instances, so creating a
+        new builder does not read the templates again.
+        
         Args:
             template_name: Name of the template file
             
@@ -59,11 +99,10 @@ class PromptBuilder:
                 self.template_cache[template_name] = ""
                 return ""
         
-        # Load the template
+        # Load the template, files already read by another builder come from memory
         try:
-            with open(template_path, 'r') as f:
-                template = f.read()
-                
+            template = _read_template(os.path.abspath(template_path))
+            
             # Cache the template
             self.template_cache[template_name] = template
             return template
@@ -91,14 +130,20 @@ class PromptBuilder:
         # Format examples if provided
         examples_text = ""
         if examples and len(examples) > 0:
-            examples_text = self._format_examples(examples)
-        
-        # Replace placeholders
-        prompt = template.replace("{{question}}", question)
-        prompt = prompt.replace("{{schema}}", schema)
-        prompt = prompt.replace("{{examples}}", examples_text)
-        
-        return prompt
+            if self._examples_cache is not None and self._examples_cache[0] is examples:
+                examples_text = self._examples_cache[1]
+            else:
+                examples_text = self._format_examples(examples)
+                self._examples_cache = (examples, examples_text)
+        
+        # Replace placeholders. The question comes last in the template so that
+        # everything before it is identical across questions and can be served
+        # from the provider's prompt prefix cache
+        return _render_template(template, {
+            "schema": schema,
+            "examples": examples_text,
+            "question": question
+        })
     
     def _format_examples(self, examples: List[Dict[str, Any]]) -> str:
         """
@@ -146,10 +191,7 @@ class PromptBuilder:
         Args:
             template_path: Path to create the template at
         """
-        template = """Analyze the following question about a product taxonomy and decompose it into Neo4j Cypher queries.
-
-QUESTION:
-{{question}}
+        template = """Analyze the question at the end of this message about a product taxonomy and decompose it into Neo4j Cypher queries.
 
 {{schema}}
 
@@ -181,7 +223,10 @@ Return a JSON object with the following structure:
   ],
   "thought_process": "Explanation of your reasoning and how these queries will help answer the question"
 }
-```"""
+```
+
+QUESTION:
+{{question}}"""
         
         # Write the template
         with open(template_path, 'w') as f:
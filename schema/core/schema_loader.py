@@ -6,14 +6,49 @@ with a focus on clean separation of concerns and extensibility.
 """
 
 import abc
+import hashlib
+import json
 import logging
 import os
+import tempfile
 from typing import Dict, Any, Optional
 
 # Configure module level logger to prevent recursion
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
 logger = logging.getLogger(__name__)
 
+# Cheap queries whose combined result changes whenever the schema is likely to have changed
+FINGERPRINT_COUNTS_QUERY = """
+MATCH (n)
+RETURN count(n) AS node_count
+"""
+
+FINGERPRINT_LABELS_QUERY = """
+CALL db.labels() YIELD label
+RETURN label
+ORDER BY label
+"""
+
+FINGERPRINT_REL_TYPES_QUERY = """
+CALL db.relationshipTypes() YIELD relationshipType
+RETURN relationshipType
+ORDER BY relationshipType
+"""
+
+# Sample rows of one node type, used as examples in prompts. Labels and property
+# names cannot be bound as parameters, so only they are filled into the template
+NODE_EXAMPLES_TEMPLATE = """
+MATCH (n{labels})
+RETURN {properties}
+LIMIT $limit
+"""
+
+# Properties never sampled as examples, embeddings are large and meaningless in prompts
+EXAMPLE_EXCLUDED_PROPERTIES = {"embedding"}
+
+SCHEMA_CACHE_PATH = ".schema_cache.json"
+RICH_CONTEXT_CACHE_PATH = ".rich_context_cache.json"
+
 class SchemaLoaderInterface(abc.ABC):
     """Interface for loading schema data from a graph database."""
     
@@ -197,6 +232,108 @@ class Neo4jSchemaLoader(SchemaLoaderInterface):
             
             return self._get_empty_schema(str(e))
     
+    def set_schema(self, schema: Dict[str, Any]) -> None:
+        """
+        Use an already loaded schema instead of querying the database.
+        
+        Args:
+            schema: Schema dictionary in the format returned by load_schema
+        """
+        self.schema = schema
+        self.formatted_schema = self._format_schema_for_prompt(schema)
+    
+    def get_fingerprint(self) -> Optional[str]:
+        """
+        Compute a cheap fingerprint of the database schema.
+        
+        The fingerprint covers the node count and the sorted label and relationship
+        type names, which is far cheaper than the full schema introspection.
+        
+        Returns:
+            Hex digest of the fingerprint, or None if the database is unavailable
+        """
+        db = None
+        try:
+            db = self.db_factory.create_graph_database_strategy()
+            if not db.connect():
+                return None
+            
+            counts = db.execute_query(FINGERPRINT_COUNTS_QUERY)
+            if not counts:
+                return None
+            
+            state = {
+                'node_count': counts[0].get('node_count', 0),
+                'labels': [row.get('label') for row in db.execute_query(FINGERPRINT_LABELS_QUERY)],
+                'relationship_types': [row.get('relationshipType')
+                                       for row in db.execute_query(FINGERPRINT_REL_TYPES_QUERY)]
+            }
+            return hashlib.sha256(json.dumps(state, sort_keys=True).encode('utf-8')).hexdigest()
+        except Exception as e:
+            logger.warning(f"Error computing schema fingerprint: {e}")
+            return None
+        finally:
+            if db:
+                try:
+                    db.close()
+                except Exception:
+                    pass
+    
+    def load_rich_context(self, schema: Dict[str, Any], examples_per_type: int = 3) -> Dict[str, Any]:
+        """
+        Sample example rows of each node type from the database.
+        
+        Args:
+            schema: Schema dictionary in the format returned by load_schema
+            examples_per_type: Number of example rows sampled per node type
+            
+        Returns:
+            Rich context dictionary with node examples
+        """
+        rich_context = {
+            'node_examples': {},
+            'relationship_examples': {},
+            'common_queries': []
+        }
+        
+        labels = []
+        queries = []
+        for label, properties in schema.get('node_types', {}).items():
+            properties = [prop for prop in properties if prop not in EXAMPLE_EXCLUDED_PROPERTIES]
+            # Node types are reported as e.g. ":`Product`" or ":`Product`:`Item`"
+            label_names = [name for name in label.replace('`', '').split(':') if name]
+            if not properties or not label_names:
+                continue
+            label_pattern = "".join(f":`{name}`" for name in label_names)
+            property_string = ", ".join(f"n.`{prop}` AS `{prop}`" for prop in properties)
+            labels.append(label)
+            queries.append((NODE_EXAMPLES_TEMPLATE.format(labels=label_pattern, properties=property_string),
+                            {"limit": int(examples_per_type)}))
+        
+        if not queries:
+            return rich_context
+        
+        db = None
+        try:
+            db = self.db_factory.create_graph_database_strategy()
+            if not db.connect():
+                return rich_context
+            
+            # All node types are sampled over a single session
+            for label, examples in zip(labels, db.execute_queries(queries)):
+                if examples:
+                    rich_context['node_examples'][label] = examples
+        except Exception as e:
+            logger.warning(f"Error sampling node examples: {e}")
+        finally:
+            if db:
+                try:
+                    db.close()
+                except Exception:
+                    pass
+        
+        return rich_context
+    
     def _get_empty_schema(self, error_message: str = "") -> Dict[str, Any]:
         """Create an empty schema with optional error message"""
         self.schema = {
@@ -254,4 +391,88 @@ class Neo4jSchemaLoader(SchemaLoaderInterface):
         for rel in schema.get('relationships', []):
             formatted.append(f"- {rel}")
         
-        return "\n".join(formatted)
\ No newline at end of file
+        return "\n".join(formatted)
+
+
+def cached_schema_loader(schema_loader: Neo4jSchemaLoader, path: str = SCHEMA_CACHE_PATH) -> Dict[str, Any]:
+    """
+    Load the schema, reusing a copy persisted on disk while the database is unchanged.
+    
+    The cached schema is returned when its stored fingerprint matches the current
+    one, so the expensive schema introspection only runs after the graph changes.
+    
+    Args:
+        schema_loader: Loader used to compute the fingerprint and load the schema
+        path: Path of the JSON file holding the cached schema
+        
+    Returns:
+        Dictionary containing schema information
+    """
+    fingerprint = schema_loader.get_fingerprint()
+    
+    if fingerprint is not None and os.path.exists(path):
+        try:
+            with open(path, 'r') as f:
+                cached = json.load(f)
+            if cached.get('fingerprint') == fingerprint:
+                logger.info(f"Schema unchanged, using cached schema from {path}")
+                schema_loader.set_schema(cached['schema'])
+                return schema_loader.schema
+        except Exception as e:
+            logger.warning(f"Error reading schema cache {path}: {e}")
+    
+    schema = schema_loader.load_schema(force_refresh=True)
+    
+    # Only persist a real schema against a known fingerprint
+    if fingerprint is not None and 'error' not in schema:
+        _write_cache(path, {'fingerprint': fingerprint, 'schema': schema})
+    
+    return schema
+
+
+def cached_rich_context(schema_loader: Neo4jSchemaLoader, schema: Dict[str, Any],
+                        path: str = RICH_CONTEXT_CACHE_PATH, fingerprint: Optional[str] = None) -> Dict[str, Any]:
+    """
+    Load the rich context, reusing a copy persisted on disk while the database is unchanged.
+    
+    Args:
+        schema_loader: Loader used to compute the fingerprint and sample the examples
+        schema: Schema the examples are sampled for
+        path: Path of the JSON file holding the cached rich context
+        fingerprint: Schema fingerprint, if already computed
+        
+    Returns:
+        Rich context dictionary with node examples
+    """
+    if fingerprint is None:
+        fingerprint = schema_loader.get_fingerprint()
+    
+    if fingerprint is not None and os.path.exists(path):
+        try:
+            with open(path, 'r') as f:
+                cached = json.load(f)
+            if cached.get('fingerprint') == fingerprint:
+                logger.info(f"Schema unchanged, using cached rich context from {path}")
+                return cached['rich_context']
+        except Exception as e:
+            logger.warning(f"Error reading rich context cache {path}: {e}")
+    
+    rich_context = schema_loader.load_rich_context(schema)
+    
+    if fingerprint is not None and rich_context['node_examples']:
+        _write_cache(path, {'fingerprint': fingerprint, 'rich_context': rich_context})
+    
+    return rich_context
+
+
+def _write_cache(path: str, data: Dict[str, Any]) -> None:
+    """Write a cache file atomically, so concurrent runs never read a partially written file."""
+    directory = os.path.dirname(os.path.abspath(path))
+    try:
+        fd, tmp_path = tempfile.mkstemp(dir=directory, suffix='.tmp')
+        with os.fdopen(fd, 'w') as f:
+            # Sampled values may include temporal types, which are stored as strings
+            json.dump(data, f, default=str)
+        os.replace(tmp_path, path)
+    except Exception as e:
+        logger.warning(f"Error writing cache {path}: {e}")
@@ -70,6 +70,29 @@ class SchemaManager:
         # Initialize state
         self.schema = None
         self.rich_context = None
+        
+        # When set, get_schema serves the in-memory schema without checking the cache
+        self.refresh_disabled = False
+        
+        # Bumped whenever the schema changes, the formatted schema is rebuilt only then
+        self._schema_version = 0
+        self._formatted_schema = None
+        self._formatted_schema_version = -1
+    
+    def set_schema(self, schema: Dict[str, Any], disable_refresh: bool = True) -> None:
+        """
+        Use a schema that has already been loaded, e.g. shared between several agents.
+        
+        Args:
+            schema: Graph schema dictionary
+            disable_refresh: Whether to keep serving this schema until a forced refresh
+        """
+        self.schema = schema
+        self._schema_version += 1
+        self.schema_cache.set('schema', schema)
+        if hasattr(self.schema_loader, 'set_schema'):
+            self.schema_loader.set_schema(schema)
+        self.refresh_disabled = disable_refresh
     
     def get_schema(self, force_refresh: bool = False) -> Dict[str, Any]:
         """
@@ -81,15 +104,21 @@ class SchemaManager:
         Returns:
             Graph schema dictionary
         """
+        if self.refresh_disabled and self.schema is not None and not force_refresh:
+            return self.schema
+        
         # Check cache first
         if not force_refresh:
             cached_schema = self.schema_cache.get('schema')
             if cached_schema is not None:
-                self.schema = cached_schema
+                if cached_schema != self.schema:
+                    self.schema = cached_schema
+                    self._schema_version += 1
                 return self.schema
         
         # Load schema if not cached or force refresh
         self.schema = self.schema_loader.load_schema(force_refresh=force_refresh)
+        self._schema_version += 1
         
         # Cache the schema
         self.schema_cache.set('schema', self.schema)
@@ -112,10 +141,17 @@ class SchemaManager:
             Formatted schema string
         """
         # Get schema first (this will use cache if available)
-        self.get_schema(force_refresh=force_refresh)
+        schema = self.get_schema(force_refresh=force_refresh)
+        
+        # Reuse the formatted schema until the schema changes
+        if self._formatted_schema_version != self._schema_version:
+            if hasattr(self.schema_loader, 'set_schema'):
+                # Format the schema we hold, it may have come from the cache rather than the loader
+                self.schema_loader.set_schema(schema)
+            self._formatted_schema = self.schema_loader.get_formatted_schema()
+            self._formatted_schema_version = self._schema_version
         
-        # Return formatted schema from loader
-        return self.schema_loader.get_formatted_schema()
+        return self._formatted_schema
     
     def get_examples(self, force_refresh: bool = False) -> List[Dict[str, Any]]:
         """
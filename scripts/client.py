@@ -2,30 +2,344 @@
 LLM Client Module - Provides a client for interacting with OpenAI's API.
 
 This module provides functionality for interacting with OpenAI's API for LLM models.
+Chat completions can be cached on disk, keyed by a hash of the request, so
+repeated runs during development are served locally instead of calling the API
+again. The cache is off by default, set LLM_CACHE_ENABLE=1 to use it.
 """
 
 import os
+import json
+import atexit
+import asyncio
+import hashlib
 import logging
-from openai import OpenAI
+import sqlite3
+import threading
+from typing import Any, Dict, Optional, Tuple
+from openai import OpenAI, AsyncOpenAI
+from openai.types.chat import ChatCompletion
+
+# Conditionally import httpx to tune the connection pool of the shared clients
+try:
+    import httpx
+    HTTPX_AVAILABLE = True
+except ImportError:
+    HTTPX_AVAILABLE = False
+
+# HTTP/2 support in httpx needs the optional h2 package
+try:
+    import h2
+    HTTP2_AVAILABLE = True
+except ImportError:
+    HTTP2_AVAILABLE = False
 
 logger = logging.getLogger(__name__)
 
 # Default model to use
 DEFAULT_MODEL = "gpt-4o"
 
+# Location of the on-disk completion cache
+LLM_CACHE_PATH = os.path.join(os.path.expanduser("~"), ".graph_alchemy_llm_cache.sqlite")
+
+# Request parameters that do not affect the completion content
+UNCACHED_PARAMS = {"stream", "user"}
+
+# Connection pool of the shared HTTP clients, sized for concurrent completions
+MAX_CONNECTIONS = 64
+MAX_KEEPALIVE_CONNECTIONS = 32
+
+class LLMCache:
+    """SQLite-backed store of chat completions keyed by a hash of the request."""
+    
+    def __init__(self, path: str = LLM_CACHE_PATH):
+        """
+        Initialize the LLM cache.
+        
+        Args:
+            path: Path of the SQLite database file
+        """
+        self.path = path
+        self._lock = threading.Lock()
+        # Agents may call the client from worker threads, access is serialized by the lock
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute("CREATE TABLE IF NOT EXISTS cache (key TEXT PRIMARY KEY, response TEXT NOT NULL)")
+        self._conn.commit()
+        self.stats = {"hits": 0, "misses": 0}
+    
+    @staticmethod
+    def make_key(params: Dict[str, Any]) -> str:
+        """
+        Compute the cache key of a completion request.
+        
+        Args:
+            params: Keyword arguments of the completion request
+        
+        Returns:
+            SHA-256 hex digest of the request parameters
+        """
+        relevant = {k: v for k, v in params.items() if k not in UNCACHED_PARAMS}
+        payload = json.dumps(relevant, sort_keys=True, default=str)
+        return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+    
+    def get(self, key: str) -> Optional[ChatCompletion]:
+        """
+        Get a cached completion.
+        
+        Args:
+            key: The cache key
+        
+        Returns:
+            The cached completion, or None if not found
+        """
+        with self._lock:
+            try:
+                row = self._conn.execute("SELECT response FROM cache WHERE key = ?", (key,)).fetchone()
+            except sqlite3.Error as e:
+                logger.warning(f"LLM cache read failed, treating as a miss: {e}")
+                row = None
+            self.stats["misses" if row is None else "hits"] += 1
+        if row is None:
+            return None
+        
+        try:
+            return ChatCompletion.model_validate_json(row[0])
+        except Exception as e:
+            logger.warning(f"Ignoring unreadable cached completion: {e}")
+            return None
+    
+    def set(self, key: str, response: Any) -> None:
+        """
+        Store a completion in the cache.
+        
+        Args:
+            key: The cache key
+            response: The completion returned by the API
+        """
+        if not isinstance(response, ChatCompletion):
+            return
+        
+        with self._lock:
+            try:
+                self._conn.execute("INSERT OR REPLACE INTO cache (key, response) VALUES (?, ?)",
+                                   (key, response.model_dump_json()))
+                self._conn.commit()
+            except sqlite3.Error as e:
+                logger.warning(f"LLM cache write failed, response not cached: {e}")
+
+class _CachedCompletions:
+    """Drop-in for `client.chat.completions` that consults the cache first."""
+    
+    def __init__(self, completions, cache: LLMCache):
+        self._completions = completions
+        self._cache = cache
+    
+    def create(self, **kwargs):
+        if kwargs.get("stream"):
+            return self._completions.create(**kwargs)
+        
+        key = self._cache.make_key(kwargs)
+        cached = self._cache.get(key)
+        if cached is not None:
+            logger.debug(f"LLM cache hit {key[:12]}")
+            return cached
+        
+        response = self._completions.create(**kwargs)
+        self._cache.set(key, response)
+        return response
+    
+    def __getattr__(self, name):
+        return getattr(self._completions, name)
+
+class _AsyncCachedCompletions(_CachedCompletions):
+    """Asynchronous variant of _CachedCompletions for AsyncOpenAI clients."""
+    
+    async def create(self, **kwargs):
+        if kwargs.get("stream"):
+            return await self._completions.create(**kwargs)
+        
+        key = self._cache.make_key(kwargs)
+        cached = self._cache.get(key)
+        if cached is not None:
+            logger.debug(f"LLM cache hit {key[:12]}")
+            return cached
+        
+        response = await self._completions.create(**kwargs)
+        self._cache.set(key, response)
+        return response
+
+class _CachedChat:
+    """Drop-in for `client.chat` exposing cached completions."""
+    
+    def __init__(self, chat, completions):
+        self._chat = chat
+        self.completions = completions
+    
+    def __getattr__(self, name):
+        return getattr(self._chat, name)
+
+class CachedLLMClient:
+    """Proxy around an OpenAI client that caches chat completions."""
+    
+    def __init__(self, client, cache: LLMCache):
+        """
+        Initialize the cached client.
+        
+        Args:
+            client: The OpenAI or AsyncOpenAI client to wrap
+            cache: The cache to serve and store completions
+        """
+        self._client = client
+        self.cache = cache
+        completions_cls = _AsyncCachedCompletions if isinstance(client, AsyncOpenAI) else _CachedCompletions
+        self.chat = _CachedChat(client.chat, completions_cls(client.chat.completions, cache))
+    
+    def __getattr__(self, name):
+        return getattr(self._client, name)
+
+_cache: Optional[LLMCache] = None
+_cache_lock = threading.Lock()
+
+def _get_cache() -> Optional[LLMCache]:
+    """Return the shared LLM cache, or None when caching is disabled or unavailable."""
+    global _cache
+    if os.environ.get("LLM_CACHE_ENABLE") != "1":
+        return None
+    
+    with _cache_lock:
+        if _cache is None:
+            try:
+                _cache = LLMCache(os.environ.get("LLM_CACHE_PATH", LLM_CACHE_PATH))
+            except sqlite3.Error as e:
+                logger.warning(f"LLM cache unavailable, calling the API directly: {e}")
+                return None
+        return _cache
+
+def _with_cache(client):
+    """Wrap a client with the shared LLM cache when caching is enabled."""
+    cache = _get_cache()
+    return CachedLLMClient(client, cache) if cache is not None else client
+
+def _get_api_key() -> str:
+    """Read the OpenAI API key from the environment."""
+    api_key = os.environ.get("OPENAI_API_KEY")
+    if not api_key:
+        logger.warning("OPENAI_API_KEY environment variable not set. Using default test key.")
+        api_key = "sk-test-key"  # This won't work for actual API calls
+    return api_key
+
+def _http_client_options() -> Dict[str, Any]:
+    """Keyword arguments for the HTTP client underlying the shared OpenAI clients."""
+    return {
+        "limits": httpx.Limits(max_connections=MAX_CONNECTIONS,
+                               max_keepalive_connections=MAX_KEEPALIVE_CONNECTIONS),
+        # Concurrent requests are multiplexed over one connection with HTTP/2
+        "http2": HTTP2_AVAILABLE,
+    }
+
+# Synchronous clients are thread-safe, so one per API key is shared by all agents
+# and they reuse the same HTTP connection pool. Asynchronous clients hold
+# connections bound to an event loop, so they are shared per API key and loop
+_clients: Dict[str, OpenAI] = {}
+_async_clients: Dict[Tuple[str, asyncio.AbstractEventLoop], AsyncOpenAI] = {}
+_clients_lock = threading.Lock()
+
 def get_llm_client():
     """
     Get an OpenAI client instance.
     
     Returns:
-        OpenAI: An initialized OpenAI client
+        OpenAI: The shared OpenAI client, wrapped with the completion cache
     """
-    api_key = os.environ.get("OPENAI_API_KEY")
-    if not api_key:
-        logger.warning("OPENAI_API_KEY environment variable not set. Using default test key.")
-        api_key = "sk-test-key"  # This won't work for actual API calls
+    api_key = _get_api_key()
+    
+    # Create the client on first use
+    with _clients_lock:
+        client = _clients.get(api_key)
+        if client is None:
+            if HTTPX_AVAILABLE:
+                client = OpenAI(api_key=api_key,
+                                http_client=httpx.Client(**_http_client_options()))
+            else:
+                client = OpenAI(api_key=api_key)
+            _clients[api_key] = client
+    
+    return _with_cache(client)
+
+def warm_up_llm_client(client=None) -> threading.Thread:
+    """
+    Open the connection to the API in the background.
+    
+    Lists the available models, which costs no tokens, so the first completion
+    reuses an established connection instead of paying for the TLS handshake.
+    
+    Args:
+        client: Client to warm up (defaults to the shared client)
+        
+    Returns:
+        The background thread doing the warm-up
+    """
+    client = client or get_llm_client()
+    
+    def warm_up():
+        try:
+            client.models.list()
+            logger.info("LLM client warmed up")
+        except Exception as e:
+            logger.warning(f"LLM client warm-up failed: {e}")
+    
+    thread = threading.Thread(target=warm_up, name="llm-warm-up", daemon=True)
+    thread.start()
+    return thread
+
+def _close_async_clients():
+    """Close the connection pools of the shared asynchronous clients at exit."""
+    for (_, loop), client in list(_async_clients.items()):
+        # The connections can only be closed on the loop they belong to
+        if loop.is_closed() or loop.is_running():
+            continue
+        try:
+            loop.run_until_complete(client.close())
+        except Exception as e:
+            logger.debug(f"Error closing async LLM client: {e}")
+    _async_clients.clear()
+
+atexit.register(_close_async_clients)
+
+def _create_async_client(api_key: str) -> AsyncOpenAI:
+    """Create an asynchronous OpenAI client with the tuned connection pool."""
+    if HTTPX_AVAILABLE:
+        return AsyncOpenAI(api_key=api_key,
+                           http_client=httpx.AsyncClient(**_http_client_options()))
+    return AsyncOpenAI(api_key=api_key)
+
+def get_async_llm_client():
+    """
+    Get an asynchronous OpenAI client instance, for issuing requests concurrently.
+    
+    Inside a running event loop the client is shared per API key and loop, so
+    concurrent completions reuse its pooled (and, with h2 installed, multiplexed)
+    connections. Outside an event loop a new client is returned, owned by the
+    caller, as its connections will belong to whichever loop it is used on.
+    
+    Returns:
+        AsyncOpenAI: The asynchronous OpenAI client, wrapped with the completion cache
+    """
+    api_key = _get_api_key()
+    
+    try:
+        loop = asyncio.get_running_loop()
+    except RuntimeError:
+        return _with_cache(_create_async_client(api_key))
+    
+    # Create the client on first use in this loop
+    with _clients_lock:
+        # Clients of closed loops can no longer be used
+        for key in [key for key in _async_clients if key[1].is_closed()]:
+            del _async_clients[key]
         
-    # Create the client
-    client = OpenAI(api_key=api_key)
+        client = _async_clients.get((api_key, loop))
+        if client is None:
+            client = _create_async_client(api_key)
+            _async_clients[(api_key, loop)] = client
     
-    return client
\ No newline at end of file
+    return _with_cache(client)
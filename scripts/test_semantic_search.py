@@ -2,15 +2,17 @@
 Test Semantic Search Script - Demonstrates the semantic search functionality.
 
 This script runs a semantic search test on a sample question and shows how semantic
-search enhances the graph retrieval process.
+search enhances the graph retrieval process. A file of questions can also be given
+to run several questions concurrently, e.g. for regression or cache hit-rate runs.
 """
 
 import os
 import sys
+import asyncio
 import logging
 import argparse
 import json
-from typing import Dict, Any
+from typing import Dict, Any, List
 
 # Configure logging
 logging.basicConfig(
@@ -57,6 +59,18 @@ def parse_arguments():
         help="Output file for results (default: semantic_search_results.json)"
     )
     
+    parser.add_argument(
+        "--questions-file",
+        help="File with one question per line; results are streamed to the output file as JSON lines"
+    )
+    
+    parser.add_argument(
+        "--concurrency",
+        type=int,
+        default=4,
+        help="Maximum number of questions processed at once (default: 4)"
+    )
+    
     return parser.parse_args()
 
 def create_workflow(enable_semantic_search: bool) -> WorkflowManager:
@@ -87,10 +101,48 @@ def run_test(question: str, enable_semantic_search: bool) -> Dict[str, Any]:
     # Return result
     return result
 
+async def run_test_async(question: str, enable_semantic_search: bool,
+                         semaphore: asyncio.Semaphore) -> Dict[str, Any]:
+    """Run the test for one question in a worker thread, bounded by the semaphore."""
+    async with semaphore:
+        # Each question gets its own workflow since the agents hold per-run state
+        result = await asyncio.to_thread(run_test, question, enable_semantic_search)
+        return {"question": question, "result": result}
+
+async def run_questions(questions: List[str], enable_semantic_search: bool,
+                        concurrency: int, output_file: str):
+    """Run several questions concurrently, streaming each result to a JSONL file."""
+    semaphore = asyncio.Semaphore(max(1, concurrency))
+    tasks = [run_test_async(q, enable_semantic_search, semaphore) for q in questions]
+    
+    with open(output_file, 'w') as f:
+        for task in asyncio.as_completed(tasks):
+            try:
+                record = await task
+            except Exception as e:
+                logger.error(f"Error running question: {e}")
+                continue
+            
+            f.write(json.dumps(record) + "\n")
+            f.flush()
+            print(f"Q: {record['question']}\nA: {record['result'].get('answer', 'No answer generated')}\n")
+
 def main():
     """Main function to run the test."""
     args = parse_arguments()
     
+    if args.questions_file:
+        with open(args.questions_file, 'r') as f:
+            questions = [line.strip() for line in f if line.strip()]
+        
+        logger.info(f"Running semantic search test with {len(questions)} questions "
+                    f"(concurrency {args.concurrency})")
+        logger.info(f"Semantic search enabled: {not args.no_semantic}")
+        
+        asyncio.run(run_questions(questions, not args.no_semantic, args.concurrency, args.output))
+        logger.info(f"Results saved to {args.output}")
+        return
+    
     logger.info(f"Running semantic search test with question: {args.question}")
     logger.info(f"Semantic search enabled: {not args.no_semantic}")
     
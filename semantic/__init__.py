@@ -2,16 +2,34 @@
 
 This module contains the implementation of the semantic search functionality for the Graph RAG system,
 including embedding models, entity retrieval, tier classification, and hybrid search capabilities.
+
+Submodules are imported lazily on first attribute access so that importing the package
+does not pull in heavy dependencies (numpy, torch) that the caller may not need.
 """
 
-from .embedding_provider import EmbeddingProvider, SentenceTransformerProvider, DummyEmbeddingProvider
-from .entity_retriever import SemanticEntityRetriever
-from .tier_classification import TierClassifier
-
-__all__ = [
-    'EmbeddingProvider',
-    'SentenceTransformerProvider',
-    'DummyEmbeddingProvider',
-    'SemanticEntityRetriever',
-    'TierClassifier',
-]
\ No newline at end of file
+import importlib
+
+# Maps each exported name to the submodule that defines it
+_EXPORTS = {
+    'EmbeddingProvider': '.embedding_provider',
+    'SentenceTransformerProvider': '.embedding_provider',
+    'DummyEmbeddingProvider': '.embedding_provider',
+    'SemanticResponseCache': '.response_cache',
+    'SemanticEntityRetriever': '.entity_retriever',
+    'TierClassifier': '.tier_classification',
+}
+
+__all__ = list(_EXPORTS)
+
+
+def __getattr__(name):
+    if name in _EXPORTS:
+        module = importlib.import_module(_EXPORTS[name], __name__)
+        value = getattr(module, name)
+        globals()[name] = value
+        return value
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+def __dir__():
+    return sorted(list(globals()) + __all__)
@@ -0,0 +1,89 @@
+"""
+Fast Kernels Module - Optional Numba-compiled kernels for vector search.
+
+The kernels fuse scoring and top-k selection into a single pass over the
+vectors, without allocating the full score array. They are only defined when
+Numba is installed; callers check NUMBA_AVAILABLE and fall back to numpy.
+Compiled code is cached on disk, so the compile cost is paid once per machine.
+"""
+
+import numpy as np
+
+# Conditionally import Numba for the compiled kernels
+try:
+    from numba import njit
+    NUMBA_AVAILABLE = True
+except ImportError:
+    NUMBA_AVAILABLE = False
+
+if NUMBA_AVAILABLE:
+    @njit(cache=True)
+    def _insert(best_ids, best_scores, index, score):
+        """Insert a candidate into the descending top-k arrays if it qualifies."""
+        k = len(best_scores)
+        if score <= best_scores[k - 1]:
+            return
+        # k is small, so shifting a sorted array beats maintaining a heap
+        position = k - 1
+        while position > 0 and best_scores[position - 1] < score:
+            best_scores[position] = best_scores[position - 1]
+            best_ids[position] = best_ids[position - 1]
+            position -= 1
+        best_scores[position] = score
+        best_ids[position] = index
+
+    @njit(cache=True, fastmath=True)
+    def topk_dot(vectors, query, k):
+        """
+        Find the rows with the highest inner product with the query.
+
+        Args:
+            vectors: Matrix of vectors, one per row
+            query: Query vector
+            k: Number of rows to return
+
+        Returns:
+            Row indices of the k best scores, best first
+        """
+        n, dimension = vectors.shape
+        k = min(k, n)
+        best_ids = np.full(k, -1, dtype=np.int64)
+        best_scores = np.full(k, -np.inf, dtype=np.float32)
+        if k == 0:
+            return best_ids
+
+        for i in range(n):
+            score = np.float32(0.0)
+            for j in range(dimension):
+                score += vectors[i, j] * query[j]
+            _insert(best_ids, best_scores, i, score)
+        return best_ids
+
+    @njit(cache=True, fastmath=True)
+    def topk_scaled_dot(codes, scales, query, k):
+        """
+        Find the rows with the highest inner product with the query, for
+        vectors stored as integer codes with a per-row scale.
+
+        Args:
+            codes: Matrix of quantized vectors, one per row
+            scales: Scale of each row, the vector is codes[i] * scales[i]
+            query: Query vector
+            k: Number of rows to return
+
+        Returns:
+            Row indices of the k best scores, best first
+        """
+        n, dimension = codes.shape
+        k = min(k, n)
+        best_ids = np.full(k, -1, dtype=np.int64)
+        best_scores = np.full(k, -np.inf, dtype=np.float32)
+        if k == 0:
+            return best_ids
+
+        for i in range(n):
+            score = np.float32(0.0)
+            for j in range(dimension):
+                score += codes[i, j] * query[j]
+            _insert(best_ids, best_scores, i, score * scales[i])
+        return best_ids
@@ -6,18 +6,41 @@ that are used for semantic search operations.
 """
 
 import abc
+import contextlib
+import hashlib
+import importlib.util
 import logging
+import os
+import pickle
+import threading
 import time
 from typing import List, Dict, Any, Union, Optional
 import numpy as np
 from functools import lru_cache
+from pathlib import Path
+
+# File locks serialize writes to the persistent cache across worker processes (POSIX only)
+try:
+    import fcntl
+    FCNTL_AVAILABLE = True
+except ImportError:
+    FCNTL_AVAILABLE = False
 
 # Configure logging
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(name)s - %(levelname)s - %(message)s')
 logger = logging.getLogger(__name__)
 
+# Number of new embeddings buffered in memory before they are flushed to disk
+MAX_PENDING_EMBEDDINGS = 10000
+
 class EmbeddingProvider(abc.ABC):
-    """Base interface for embedding providers."""
+    """
+    Base interface for embedding providers.
+    
+    All embeddings emitted by providers in this module are L2-normalized (unit-norm),
+    so cosine similarity between two embeddings is their plain dot product and
+    inner-product vector indexes can be used directly.
+    """
 
     @abc.abstractmethod
     def encode(self, text: Union[str, List[str]]) -> Union[List[float], List[List[float]]]:
@@ -59,12 +82,34 @@ class EmbeddingProvider(abc.ABC):
             Similarity score (higher is more similar)
         """
         pass
+    
+    def batch_similarity(self, query_embedding, embeddings) -> np.ndarray:
+        """
+        Calculate the cosine similarity between one embedding and many others at once.
+        
+        Args:
+            query_embedding: Embedding vector to compare against
+            embeddings: Matrix (or list) of embedding vectors, one per row
+            
+        Returns:
+            Array of cosine similarity scores, one per row of embeddings
+        """
+        query = np.asarray(query_embedding, dtype=np.float32)
+        matrix = np.asarray(embeddings, dtype=np.float32)
+        if matrix.size == 0:
+            return np.zeros(0, dtype=np.float32)
+        
+        denominator = np.linalg.norm(matrix, axis=1) * np.linalg.norm(query)
+        scores = matrix @ query
+        # Zero vectors have no direction, score them as dissimilar
+        return np.divide(scores, denominator, out=np.zeros_like(scores), where=denominator > 0)
 
 class SentenceTransformerProvider(EmbeddingProvider):
     """Embedding provider based on sentence-transformers library."""
     
     def __init__(self, model_name: str = "BAAI/bge-small-en-v1.5", device: Optional[str] = None,
-                cache_size: int = 1000):
+                cache_size: int = 1000, half_precision: bool = True, cache_dir: Optional[str] = None,
+                max_pending_embeddings: int = MAX_PENDING_EMBEDDINGS):
         """
         Initialize the sentence transformer embedding provider.
         
@@ -72,36 +117,210 @@ class SentenceTransformerProvider(EmbeddingProvider):
             model_name: Name of the sentence transformer model to use
             device: Device to run the model on ('cpu', 'cuda', etc.)
             cache_size: Size of the LRU cache for embeddings
+            half_precision: Whether to run the model in FP16 on GPU, or BF16 on CPUs that support it
+            cache_dir: Optional directory to persist single-text embeddings across restarts
+            max_pending_embeddings: Number of new embeddings buffered before they are
+                flushed to the persistent cache
+        """
+        # Fail fast if the library is missing, without paying the torch import cost
+        if importlib.util.find_spec("sentence_transformers") is None:
+            logger.error("sentence-transformers library not installed. Please install with 'pip install sentence-transformers'")
+            raise ImportError("sentence-transformers library not installed")
+        
+        # The model is loaded on first use so that importing or constructing the
+        # provider does not pull in torch
+        self.model = None
+        self.model_name = model_name
+        self.device = device
+        self.half_precision = half_precision
+        self._autocast_dtype = None
+        self._embedding_dim = None
+        
+        # Set up caching
+        self.encode_single = lru_cache(maxsize=cache_size)(self._encode_single)
+        
+        # Persistent embedding cache, keyed by a hash of the text. The model name is
+        # part of the file name so embeddings from different models never mix.
+        self._persist_path = None
+        self._persisted_keys: Dict[str, int] = {}
+        self._persisted_vectors = None
+        self._new_embeddings: Dict[str, List[float]] = {}
+        self._max_pending = max_pending_embeddings
+        self._save_lock = threading.Lock()
+        if cache_dir:
+            # Embeddings are normalized, which is part of the key so older unnormalized
+            # cache files are never reused
+            model_hash = hashlib.blake2b(f"{model_name}:normalized".encode("utf-8"), digest_size=8).hexdigest()
+            self._persist_path = Path(cache_dir) / f"emb_cache_{model_hash}.npy"
+            self._load_persisted_cache()
+    
+    @staticmethod
+    def _cache_key(text: str) -> str:
+        """Compact key for a text in the persistent cache."""
+        return hashlib.blake2b(text.encode("utf-8"), digest_size=16).hexdigest()
+    
+    def _load_persisted_cache(self):
+        """Memory-map previously persisted embeddings, if any."""
+        keys_path = self._persist_path.with_suffix(".pkl")
+        if not (self._persist_path.exists() and keys_path.exists()):
+            return
+        
+        try:
+            with open(keys_path, "rb") as f:
+                keys = pickle.load(f)
+            # Rows are only ever appended, so swapping the vectors in before the keys
+            # keeps concurrent lookups valid
+            self._persisted_vectors = np.load(self._persist_path, mmap_mode="r")
+            self._persisted_keys = keys
+            logger.info(f"Loaded {len(self._persisted_keys)} persisted embeddings from {self._persist_path}")
+        except Exception as e:
+            logger.warning(f"Failed to load persisted embedding cache: {e}")
+            self._persisted_keys = {}
+            self._persisted_vectors = None
+    
+    @contextlib.contextmanager
+    def _file_lock(self):
+        """Hold an exclusive lock on the persistent cache across processes, where supported."""
+        if not FCNTL_AVAILABLE:
+            yield
+            return
+        
+        self._persist_path.parent.mkdir(parents=True, exist_ok=True)
+        with open(self._persist_path.with_suffix(".lock"), "w") as lock_file:
+            fcntl.flock(lock_file, fcntl.LOCK_EX)
+            try:
+                yield
+            finally:
+                fcntl.flock(lock_file, fcntl.LOCK_UN)
+    
+    def save_cache(self) -> bool:
         """
+        Flush embeddings computed since the cache was loaded to disk.
+        
+        Other processes may share the cache file, so the embeddings are merged
+        with the current file contents while holding a file lock.
+        
+        Returns:
+            bool: True if new embeddings were written, False otherwise
+        """
+        if self._persist_path is None or not self._new_embeddings:
+            return False
+        
+        with self._save_lock, self._file_lock():
+            return self._merge_and_save()
+    
+    def _merge_and_save(self) -> bool:
+        """Merge the buffered embeddings into the cache file, see save_cache."""
         try:
-            from sentence_transformers import SentenceTransformer
-            import torch
+            # Pick up what other processes persisted since the cache was loaded
+            self._load_persisted_cache()
             
-            # Determine device if not specified
-            if device is None:
-                device = "cuda" if torch.cuda.is_available() else "cpu"
-                
-            # Log the device being used
-            logger.info(f"Using device {device} for embedding model")
+            pending = list(self._new_embeddings)
+            new_keys = [k for k in pending if k not in self._persisted_keys]
+            if not new_keys:
+                for key in pending:
+                    self._new_embeddings.pop(key, None)
+                return False
             
-            # Initialize the model
-            self.model = SentenceTransformer(model_name, device=device)
-            self.model_name = model_name
-            self.embedding_dim = self.model.get_sentence_embedding_dimension()
-            self.device = device
+            new_vectors = np.asarray([self._new_embeddings[k] for k in new_keys], dtype=np.float32)
+            if self._persisted_vectors is not None and len(self._persisted_keys):
+                vectors = np.vstack([np.asarray(self._persisted_vectors, dtype=np.float32), new_vectors])
+            else:
+                vectors = new_vectors
             
-            logger.info(f"Loaded sentence transformer model {model_name} with {self.embedding_dim} dimensions")
+            keys = dict(self._persisted_keys)
+            offset = len(keys)
+            for i, key in enumerate(new_keys):
+                keys[key] = offset + i
             
-            # Set up caching
-            self.encode_single = lru_cache(maxsize=cache_size)(self._encode_single)
+            # Write to temporary files first so a crash never leaves a torn cache
+            self._persist_path.parent.mkdir(parents=True, exist_ok=True)
+            tmp_vectors = self._persist_path.with_suffix(f".{os.getpid()}.tmp.npy")
+            tmp_keys = self._persist_path.with_suffix(f".{os.getpid()}.tmp.pkl")
+            np.save(tmp_vectors, vectors)
+            with open(tmp_keys, "wb") as f:
+                pickle.dump(keys, f)
+            os.replace(tmp_vectors, self._persist_path)
+            os.replace(tmp_keys, self._persist_path.with_suffix(".pkl"))
             
-        except ImportError:
-            logger.error("sentence-transformers library not installed. Please install with 'pip install sentence-transformers'")
-            raise
+            self._persisted_vectors = np.load(self._persist_path, mmap_mode="r")
+            self._persisted_keys = keys
+            # Embeddings added by other threads while writing stay buffered
+            for key in pending:
+                self._new_embeddings.pop(key, None)
+            
+            logger.info(f"Persisted {len(new_keys)} new embeddings to {self._persist_path}")
+            return True
+        except Exception as e:
+            logger.error(f"Error saving embedding cache: {e}")
+            return False
+    
+    def _lazy_load(self):
+        """Import torch / sentence-transformers and load the model if not loaded yet."""
+        if self.model is not None:
+            return
+        
+        from sentence_transformers import SentenceTransformer
+        import torch
+        
+        # Determine device if not specified
+        if self.device is None:
+            self.device = "cuda" if torch.cuda.is_available() else "cpu"
+            
+        # Log the device being used
+        logger.info(f"Using device {self.device} for embedding model")
+        
+        # Initialize the model
+        self.model = SentenceTransformer(self.model_name, device=self.device)
+        self._embedding_dim = self.model.get_sentence_embedding_dimension()
+        
+        # Reduced precision halves memory bandwidth with negligible effect on cosine ranking
+        if self.half_precision:
+            if self.device.startswith("cuda"):
+                self.model = self.model.half()
+                logger.info("Running embedding model in FP16")
+            elif self.device == "cpu" and getattr(torch.cpu, "_is_avx512_bf16_supported", lambda: False)():
+                self._autocast_dtype = torch.bfloat16
+                logger.info("Running embedding model with BF16 autocast")
+        
+        logger.info(f"Loaded sentence transformer model {self.model_name} with {self._embedding_dim} dimensions")
+    
+    def _precision_context(self):
+        """Return the autocast context to run the model under, if any."""
+        if self._autocast_dtype is None:
+            return contextlib.nullcontext()
+        
+        import torch
+        return torch.autocast(device_type="cpu", dtype=self._autocast_dtype)
+    
+    @property
+    def embedding_dim(self) -> int:
+        """Dimensionality of the embeddings produced by the model."""
+        self._lazy_load()
+        return self._embedding_dim
     
     def _encode_single(self, text: str) -> List[float]:
         """Internal method for encoding a single text string."""
-        return self.model.encode(text).tolist()
+        if self._persist_path is not None:
+            key = self._cache_key(text)
+            row = self._persisted_keys.get(key)
+            if row is not None:
+                return self._persisted_vectors[row].tolist()
+            if key in self._new_embeddings:
+                return self._new_embeddings[key]
+        
+        self._lazy_load()
+        with self._precision_context():
+            embedding = self.model.encode(text, normalize_embeddings=True).tolist()
+        
+        if self._persist_path is not None:
+            self._new_embeddings[key] = embedding
+            # Keep the buffer bounded, the embeddings can always be recomputed
+            if len(self._new_embeddings) >= self._max_pending and not self.save_cache():
+                logger.warning(f"Dropping {len(self._new_embeddings)} unsaved embeddings")
+                self._new_embeddings.clear()
+        
+        return embedding
     
     def encode(self, text: Union[str, List[str]]) -> Union[List[float], List[List[float]]]:
         """
@@ -129,13 +348,30 @@ class SentenceTransformerProvider(EmbeddingProvider):
         Returns:
             List of embedding vectors
         """
+        if not texts:
+            return []
+        
+        self._lazy_load()
+        
+        # Only encode each distinct text once, then scatter the results back
+        unique_texts = list(dict.fromkeys(texts))
+        
         start_time = time.time()
-        logger.info(f"Encoding batch of {len(texts)} texts with batch size {batch_size}")
+        logger.info(f"Encoding batch of {len(texts)} texts ({len(unique_texts)} unique) with batch size {batch_size}")
         
-        embeddings = self.model.encode(texts, batch_size=batch_size).tolist()
+        with self._precision_context():
+            unique_embeddings = self.model.encode(unique_texts, batch_size=batch_size, convert_to_numpy=True,
+                                                  normalize_embeddings=True)
+        
+        if len(unique_texts) == len(texts):
+            embeddings = unique_embeddings.tolist()
+        else:
+            positions = {text: i for i, text in enumerate(unique_texts)}
+            embeddings = unique_embeddings[[positions[text] for text in texts]].tolist()
         
-        elapsed = time.time() - start_time
-        logger.info(f"Batch encoding completed in {elapsed:.2f}s ({len(texts)/elapsed:.2f} texts/s)")
+        elapsed = max(time.time() - start_time, 1e-9)
+        logger.info(f"Batch encoding completed in {elapsed:.2f}s ({len(texts)/elapsed:.2f} texts/s, "
+                    f"dedup ratio {len(unique_texts)/len(texts):.2f})")
         
         return embeddings
     
@@ -144,32 +380,28 @@ class SentenceTransformerProvider(EmbeddingProvider):
         Calculate cosine similarity between two embeddings.
         
         Args:
-            embedding1: First embedding vector
-            embedding2: Second embedding vector
+            embedding1: First embedding vector (unit-norm, as produced by encode)
+            embedding2: Second embedding vector (unit-norm, as produced by encode)
             
         Returns:
             Cosine similarity score (higher is more similar)
         """
-        # Convert to numpy arrays for calculation
-        vec1 = np.array(embedding1)
-        vec2 = np.array(embedding2)
-        
-        # Compute cosine similarity
-        similarity = np.dot(vec1, vec2) / (np.linalg.norm(vec1) * np.linalg.norm(vec2))
-        
-        return float(similarity)
+        # Embeddings are unit-norm, so the cosine similarity is the dot product
+        return float(np.dot(embedding1, embedding2))
 
 class DummyEmbeddingProvider(EmbeddingProvider):
     """Dummy embedding provider for testing or when dependencies aren't available."""
     
-    def __init__(self, dimension: int = 384):
+    def __init__(self, dimension: int = 384, seed: Optional[int] = None):
         """
         Initialize the dummy embedding provider.
         
         Args:
             dimension: Dimensionality of the generated embeddings
+            seed: Optional seed for reproducible embeddings
         """
         self.dimension = dimension
+        self._rng = np.random.default_rng(seed)
         logger.warning("Using DummyEmbeddingProvider - generates random embeddings for testing only!")
     
     def encode(self, text: Union[str, List[str]]) -> Union[List[float], List[List[float]]]:
@@ -183,7 +415,7 @@ class DummyEmbeddingProvider(EmbeddingProvider):
             Random embedding vectors
         """
         if isinstance(text, str):
-            return [float(i) for i in np.random.randn(self.dimension)]
+            return self.batch_encode([text])[0]
         else:
             return self.batch_encode(text)
     
@@ -198,7 +430,9 @@ class DummyEmbeddingProvider(EmbeddingProvider):
         Returns:
             List of random embedding vectors
         """
-        return [[float(i) for i in np.random.randn(self.dimension)] for _ in range(len(texts))]
+        vectors = self._rng.standard_normal((len(texts), self.dimension), dtype=np.float32)
+        vectors /= np.linalg.norm(vectors, axis=1, keepdims=True)
+        return vectors.tolist()
     
     def similarity(self, embedding1: List[float], embedding2: List[float]) -> float:
         """
@@ -209,6 +443,20 @@ class DummyEmbeddingProvider(EmbeddingProvider):
             embedding2: Second embedding vector
             
         Returns:
-            Random similarity score between 0 and 1
+            Cosine similarity rescaled to [0, 1] as (1 + cos) / 2
+        """
+        return float(self.batch_similarity(embedding1, [embedding2])[0])
+    
+    def batch_similarity(self, query_embedding, embeddings) -> np.ndarray:
+        """
+        Calculate the similarity between one embedding and many others at once.
+        
+        Args:
+            query_embedding: Embedding vector to compare against
+            embeddings: Matrix (or list) of embedding vectors, one per row
+            
+        Returns:
+            Array of cosine similarities rescaled to [0, 1] as (1 + cos) / 2
         """
-        return float(np.random.random())
\ No newline at end of file
+        cosine = super().batch_similarity(query_embedding, embeddings)
+        return np.clip((1.0 + cosine) / 2.0, 0.0, 1.0)
\ No newline at end of file
@@ -5,44 +5,261 @@ This module provides the implementation of semantic search for entities in the g
 combining text-based and vector-based search approaches.
 """
 
+import asyncio
 import logging
-import json
+import hashlib
+import re
+import threading
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
 from typing import List, Dict, Any, Optional, Union, Set
 import time
 
+import numpy as np
+
 from .embedding_provider import EmbeddingProvider, DummyEmbeddingProvider
 
-# Configure logging
-logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(name)s - %(levelname)s - %(message)s')
+# Logging is configured by the entry point, not on import
 logger = logging.getLogger(__name__)
 
+# Search queries are constant strings with all values bound as parameters, so
+# Neo4j plans each of them once and reuses the cached plan on every search.
+# $labels is either null (no filter) or a list of labels to restrict to.
+LABEL_FILTER = "($labels IS NULL OR any(l IN labels(n) WHERE l IN $labels))"
+
+# Results never carry the stored embedding back over the wire. $properties is
+# either null (all other properties as a map) or a list of property names, in
+# which case only their values are returned and _format_result rebuilds the map.
+PROPERTY_PROJECTION = (
+    "CASE WHEN $properties IS NULL THEN n {.*, embedding: null} "
+    "ELSE [key IN $properties | n[key]] END AS properties"
+)
+
+# The vector index reports cosine scores normalized to [0, 1] as (1 + cos) / 2,
+# they are mapped back to the cosine similarity before applying the threshold
+VECTOR_SEARCH_QUERY = f"""
+CALL db.index.vector.queryNodes($index_name, $k, $embedding) YIELD node AS n, score
+WITH n, 2 * score - 1 AS score
+WHERE score >= $threshold AND {LABEL_FILTER}
+RETURN id(n) AS id, labels(n) AS labels, {PROPERTY_PROJECTION}, score
+ORDER BY score DESC
+LIMIT $limit
+"""
+
+# Seconds for which the lists of vector and fulltext indexes are reused between searches
+INDEX_CACHE_TTL = 60
+
+# Searches every index in $index_names in one round-trip. A node covered by
+# several indexes is returned once, with its best score.
+MULTI_INDEX_VECTOR_SEARCH_QUERY = f"""
+UNWIND $index_names AS index_name
+CALL db.index.vector.queryNodes(index_name, $k, $embedding) YIELD node AS n, score
+WITH n, max(2 * score - 1) AS score
+WHERE score >= $threshold AND {LABEL_FILTER}
+RETURN id(n) AS id, labels(n) AS labels, {PROPERTY_PROJECTION}, score
+ORDER BY score DESC
+LIMIT $limit
+"""
+
+VECTOR_INDEXES_QUERY = """
+SHOW INDEXES
+YIELD name, type, labelsOrTypes, properties
+WHERE type = 'VECTOR' AND 'embedding' IN properties
+RETURN name, labelsOrTypes AS labels
+"""
+
+# Name of the fulltext index used for text search, see create_fulltext_index
+FULLTEXT_INDEX_NAME = "entity_text"
+
+FULLTEXT_INDEX_EXISTS_QUERY = """
+SHOW INDEXES
+YIELD name, type
+WHERE type = 'FULLTEXT' AND name = $index_name
+RETURN count(*) AS count
+"""
+
+TEXT_SEARCH_QUERY = f"""
+CALL db.index.fulltext.queryNodes($index_name, $text) YIELD node AS n, score
+WHERE {LABEL_FILTER}
+RETURN id(n) AS id, labels(n) AS labels, {PROPERTY_PROJECTION}, score
+ORDER BY score DESC
+LIMIT $limit
+"""
+
+# Used when the fulltext index does not exist yet
+TEXT_SEARCH_FALLBACK_QUERY = f"""
+MATCH (n)
+WHERE {LABEL_FILTER}
+  AND (toLower(n.name) CONTAINS toLower($raw_text) OR toLower(n.title) CONTAINS toLower($raw_text))
+RETURN id(n) AS id, labels(n) AS labels, {PROPERTY_PROJECTION}, 1.0 AS score
+LIMIT $limit
+"""
+
+# Vector and fulltext hits are merged and deduplicated in a single round-trip.
+# Vector hits rank ahead of text-only hits, and a node found by both keeps its
+# vector score. Lucene scores are unbounded, so the two are not compared.
+HYBRID_SEARCH_QUERY = f"""
+CALL {{
+    UNWIND $index_names AS index_name
+    CALL db.index.vector.queryNodes(index_name, $k, $embedding) YIELD node AS n, score
+    WITH n, 2 * score - 1 AS score
+    WHERE score >= $threshold AND {LABEL_FILTER}
+    RETURN n, 1 AS source, score
+    UNION ALL
+    CALL db.index.fulltext.queryNodes($fulltext_index, $text) YIELD node AS n, score
+    WHERE {LABEL_FILTER}
+    RETURN n, 0 AS source, score
+}}
+WITH n, max(source) AS source, collect([source, score]) AS hits
+WITH n, source, reduce(best = null, hit IN hits |
+    CASE WHEN hit[0] = source AND (best IS NULL OR hit[1] > best) THEN hit[1] ELSE best END) AS score
+RETURN id(n) AS id, labels(n) AS labels, {PROPERTY_PROJECTION}, score
+ORDER BY source DESC, score DESC
+LIMIT $limit
+"""
+
+# Characters with a special meaning in the Lucene query syntax
+LUCENE_SPECIAL_CHARS = re.compile(r'([+\-!(){}\[\]^"~*?:\\/]|&&|\|\|)')
+
+STORE_EMBEDDINGS_QUERY = """
+UNWIND $rows AS row
+MATCH (n) WHERE id(n) = row.id
+SET n.embedding = row.embedding
+RETURN count(n) AS stored
+"""
+
+# Labels and property names cannot be bound as parameters, so the templates
+# below are only filled in with names matching IDENTIFIER_PATTERN
+IDENTIFIER_PATTERN = re.compile(r"^[A-Za-z_][A-Za-z0-9_]*$")
+
+CREATE_VECTOR_INDEX_TEMPLATE = """
+CREATE VECTOR INDEX {index_name} IF NOT EXISTS FOR (n:{label}) ON (n.embedding)
+OPTIONS {{
+    indexConfig: {{
+        `vector.dimensions`: {dimension},
+        `vector.similarity_function`: 'cosine'{quantization}
+    }}
+}}
+"""
+
+# Added to the index config on request only, older Neo4j versions reject the
+# setting. The index then keeps int8 copies of the vectors while the stored
+# float embeddings are unchanged, so search works the same either way.
+VECTOR_QUANTIZATION_CONFIG = ",\n        `vector.quantization.enabled`: true"
+
+CREATE_FULLTEXT_INDEX_TEMPLATE = """
+CREATE FULLTEXT INDEX {index_name} IF NOT EXISTS
+FOR (n:{labels}) ON EACH [{properties}]
+"""
+
+# Rows come back sorted by text length so each batch holds similar-length
+# texts and the model wastes less work on padding, even when streamed
+ENTITIES_WITHOUT_EMBEDDING_TEMPLATE = """
+MATCH (n:{label})
+WHERE n.{property} IS NOT NULL AND n.embedding IS NULL
+WITH n LIMIT $limit
+RETURN id(n) as id, n.{property} as text
+ORDER BY size(toString(n.{property}))
+"""
+
+@lru_cache(maxsize=64)
+def _canon_labels(labels: tuple) -> tuple:
+    """Return the labels deduplicated and sorted, so equivalent filters are identical."""
+    return tuple(sorted(set(labels)))
+
+def _check_identifier(name: str) -> str:
+    """Return the name if it is safe to use as a label or property in Cypher."""
+    if not IDENTIFIER_PATTERN.match(name or ""):
+        raise ValueError(f"Invalid label or property name: {name!r}")
+    return name
+
+def _to_f32(vector) -> np.ndarray:
+    """Convert an embedding to a float32 array, without copying if it already is one."""
+    return np.asarray(vector, dtype=np.float32)
+
 class SemanticEntityRetriever:
     """Implements semantic search for entities in the graph database."""
     
-    def __init__(self, graph_db, embedding_provider: Optional[EmbeddingProvider] = None):
+    def __init__(self, graph_db, embedding_provider: Optional[EmbeddingProvider] = None,
+                 embedding_cache_size: int = 1024):
         """
         Initialize the semantic entity retriever.
         
         Args:
             graph_db: Graph database connection
             embedding_provider: Provider for generating embeddings
+            embedding_cache_size: Maximum number of query embeddings kept in the LRU cache
         """
         self.graph_db = graph_db
         
         # Use provided embedding provider or create a dummy one
         self.embedding_provider = embedding_provider or DummyEmbeddingProvider()
         
+        # Vector indexes rarely change, so the SHOW INDEXES result is cached as
+        # (indexes, timestamp) for INDEX_CACHE_TTL seconds
+        self._vector_indexes_cache: Optional[tuple] = None
+        
+        # Whether the fulltext index exists, cached the same way as (exists, timestamp)
+        self._fulltext_index_cache: Optional[tuple] = None
+        
+        # LRU cache of query embeddings, keyed by a hash of the query text. Entries
+        # are float32 arrays, which take far less memory than lists of Python floats
+        self._emb_cache: OrderedDict = OrderedDict()
+        self._emb_cache_size = embedding_cache_size
+        # search_async runs searches on worker threads, the cache and its hit and
+        # miss counters are only touched under this lock
+        self._emb_cache_lock = threading.Lock()
+        
+        # The embedding model is not safe for concurrent inference, so batch
+        # encoding is serialized when several tiers are generated in parallel
+        self._encode_lock = threading.Lock()
+        
         # Track stats for monitoring
         self.stats = {
             "total_searches": 0,
             "vector_searches": 0,
             "text_searches": 0,
             "hybrid_searches": 0,
+            "cache_hits": 0,
+            "cache_misses": 0,
             "total_time": 0
         }
     
+    def _encode_query(self, query: str) -> np.ndarray:
+        """
+        Get the embedding for a query, using the LRU cache when possible.
+        
+        Args:
+            query: Text query to encode
+            
+        Returns:
+            Embedding vector for the query as a float32 array
+        """
+        key = hashlib.blake2b(query.encode("utf-8"), digest_size=16).digest()
+        
+        with self._emb_cache_lock:
+            embedding = self._emb_cache.get(key)
+            if embedding is not None:
+                self._emb_cache.move_to_end(key)
+                self.stats["cache_hits"] += 1
+                return embedding
+            self.stats["cache_misses"] += 1
+        
+        # Encoded outside the lock so a slow model call does not block cache hits
+        embedding = _to_f32(self.embedding_provider.encode(query))
+        
+        with self._emb_cache_lock:
+            self._emb_cache[key] = embedding
+            self._emb_cache.move_to_end(key)
+            if len(self._emb_cache) > self._emb_cache_size:
+                self._emb_cache.popitem(last=False)
+        
+        return embedding
+    
     def search(self, query: str, entity_types: Optional[List[str]] = None, 
-              threshold: float = 0.7, limit: int = 10) -> List[Dict[str, Any]]:
+              threshold: float = 0.7, limit: int = 10,
+              properties_to_return: Optional[List[str]] = None) -> List[Dict[str, Any]]:
         """
         Search for entities matching the query.
         
@@ -51,6 +268,8 @@ class SemanticEntityRetriever:
             entity_types: List of entity types to search within
             threshold: Minimum similarity threshold for vector search
             limit: Maximum number of results to return
+            properties_to_return: Entity properties to include in the results,
+                or None for all properties except the embedding
             
         Returns:
             List of matching entities with scores
@@ -60,265 +279,431 @@ class SemanticEntityRetriever:
         
         # Generate embedding for the query
         try:
-            query_embedding = self.embedding_provider.encode(query)
+            query_embedding = self._encode_query(query)
             vector_search_available = True
             logger.info("Generated query embedding successfully")
         except Exception as e:
-            logger.warning(f"Failed to generate embedding: {e}. Falling back to text search only.")
+            logger.warning("Failed to generate embedding: %s. Falling back to text search only.", e)
             vector_search_available = False
         
-        # Build entity type filter
-        entity_filter = ""
-        if entity_types and len(entity_types) > 0:
-            entity_filter = " WHERE " + " OR ".join([f"n:{entity_type}" for entity_type in entity_types])
+        # Entity type filter is passed to the queries as a parameter
+        labels = list(_canon_labels(tuple(entity_types))) if entity_types else None
         
         # Determine search strategy based on availability and query type
         if vector_search_available:
             # Use hybrid search
             self.stats["hybrid_searches"] += 1
-            logger.info(f"Executing hybrid search for: {query}")
-            results = self._execute_hybrid_search(query, query_embedding, entity_filter, threshold, limit)
+            logger.info("Executing hybrid search for: %s", query)
+            results = self._execute_hybrid_search(query, query_embedding, labels, threshold, limit,
+                                                  properties_to_return)
         else:
             # Use text search as fallback
             self.stats["text_searches"] += 1
-            logger.info(f"Executing text-only search for: {query}")
-            results = self._execute_text_search(query, entity_filter, limit)
+            logger.info("Executing text-only search for: %s", query)
+            results = self._execute_text_search(query, labels, limit, properties_to_return)
         
         # Track total time
         elapsed = time.time() - start_time
         self.stats["total_time"] += elapsed
-        logger.info(f"Search completed in {elapsed:.2f}s, found {len(results)} results")
+        logger.info("Search completed in %.2fs, found %d results", elapsed, len(results))
         
         return results
     
-    def _execute_hybrid_search(self, text_query: str, query_embedding: List[float], 
-                              entity_filter: str, threshold: float, limit: int) -> List[Dict[str, Any]]:
+    async def search_async(self, query: str, entity_types: Optional[List[str]] = None,
+                           threshold: float = 0.7, limit: int = 10,
+                           properties_to_return: Optional[List[str]] = None) -> List[Dict[str, Any]]:
+        """
+        Search for entities without blocking the event loop.
+        
+        The search runs in a worker thread, so several searches (or a search and
+        other I/O) can be awaited concurrently. See search for the arguments.
+        
+        Returns:
+            List of matching entities with scores
+        """
+        return await asyncio.to_thread(self.search, query, entity_types, threshold, limit,
+                                       properties_to_return)
+    
+    def _execute_hybrid_search(self, text_query: str, query_embedding: np.ndarray, 
+                              labels: Optional[List[str]], threshold: float, limit: int,
+                              properties: Optional[List[str]] = None) -> List[Dict[str, Any]]:
         """
         Execute a hybrid search combining vector and text approaches.
         
         Args:
             text_query: Original text query
             query_embedding: Vector embedding of the query
-            entity_filter: Cypher WHERE clause for filtering entities
+            labels: Entity labels to search within, or None for all entities
             threshold: Minimum similarity threshold
             limit: Maximum number of results
+            properties: Property names to return, or None for all but the embedding
             
         Returns:
             List of matching entities with scores
         """
-        # Check if vector index exists
-        vector_index_exists = self._check_vector_index_exists()
+        if not text_query.strip():
+            return []
         
-        results = []
+        # The hybrid query fails as a whole when the fulltext index is missing,
+        # so search the vector indexes on their own in that case
+        if not self._has_fulltext_index():
+            return self._execute_vector_then_text_search(text_query, query_embedding, labels,
+                                                         threshold, limit, properties)
         
-        # If vector index exists, try vector search first
-        if vector_index_exists:
-            vector_results = self._execute_vector_search(query_embedding, entity_filter, threshold, limit)
-            results.extend(vector_results)
-            
-            # If we got enough results from vector search, return them
-            if len(results) >= limit:
-                return results[:limit]
+        params = {
+            "index_names": self._vector_index_names(labels),
+            "k": min(limit * 4, 500),
+            "embedding": _to_f32(query_embedding).tolist(),
+            "threshold": threshold,
+            "fulltext_index": FULLTEXT_INDEX_NAME,
+            "text": LUCENE_SPECIAL_CHARS.sub(r"\\\1", text_query),
+            "labels": labels,
+            "properties": properties,
+            "limit": limit
+        }
+        
+        try:
+            # Records are formatted as they arrive instead of after the full result
+            return [self._format_result(r, properties)
+                    for r in self.graph_db.stream_query(HYBRID_SEARCH_QUERY, params)]
+        except Exception as e:
+            # Search the indexes separately so a failing fulltext branch does not
+            # discard the vector hits
+            logger.warning("Hybrid search failed (%s), searching the indexes separately", e)
+            return self._execute_vector_then_text_search(text_query, query_embedding, labels,
+                                                         threshold, limit, properties)
+    
+    def _execute_vector_then_text_search(self, text_query: str, query_embedding: np.ndarray,
+                                         labels: Optional[List[str]], threshold: float, limit: int,
+                                         properties: Optional[List[str]] = None) -> List[Dict[str, Any]]:
+        """
+        Execute vector search, then fill up the results with text search hits.
         
-        # Execute text search for remaining slots
-        remaining_limit = limit - len(results)
-        if remaining_limit > 0:
-            text_results = self._execute_text_search(text_query, entity_filter, remaining_limit)
+        Used in place of the hybrid query when it cannot run. Like the hybrid
+        query, vector hits rank ahead of text-only hits.
+        
+        Args:
+            text_query: Original text query
+            query_embedding: Vector embedding of the query
+            labels: Entity labels to search within, or None for all entities
+            threshold: Minimum similarity threshold
+            limit: Maximum number of results
+            properties: Property names to return, or None for all but the embedding
             
-            # Filter out duplicates
-            existing_ids = {r["id"] for r in results}
-            filtered_text_results = [r for r in text_results if r["id"] not in existing_ids]
+        Returns:
+            List of matching entities with scores
+        """
+        results = self._execute_vector_search(query_embedding, labels, threshold, limit, properties)
+        if len(results) >= limit:
+            return results
+        
+        seen = {r["id"] for r in results}
+        for result in self._execute_text_search(text_query, labels, limit, properties):
+            if result["id"] not in seen:
+                seen.add(result["id"])
+                results.append(result)
+        return results[:limit]
+    
+    @staticmethod
+    def vector_index_name(entity_label: str) -> str:
+        """
+        Get the name of the vector index for an entity label.
+        
+        Args:
+            entity_label: Label of the indexed entities
             
-            # Add filtered text results
-            results.extend(filtered_text_results)
+        Returns:
+            Deterministic index name, e.g. 'entity_embeddings' for 'Entity'
+        """
+        return f"{entity_label.lower()}_embeddings"
+    
+    def _get_vector_indexes(self) -> Dict[str, List[str]]:
+        """
+        Get the vector indexes on the embedding property.
         
-        return results
+        Returns:
+            Dictionary mapping index names to the labels they cover
+        """
+        if self._vector_indexes_cache is not None:
+            indexes, fetched_at = self._vector_indexes_cache
+            if time.monotonic() - fetched_at < INDEX_CACHE_TTL:
+                return indexes
+        
+        try:
+            result = self.graph_db.execute_query(VECTOR_INDEXES_QUERY)
+            indexes = {r["name"]: list(r.get("labels") or []) for r in result or []}
+        except Exception as e:
+            logger.warning("Error checking vector index: %s", e)
+            return {}
+        
+        self._vector_indexes_cache = (indexes, time.monotonic())
+        return indexes
     
-    def _check_vector_index_exists(self) -> bool:
+    def _has_fulltext_index(self) -> bool:
         """
-        Check if vector index exists in the database.
+        Check whether the fulltext index used by text search exists.
         
         Returns:
-            True if vector index exists, False otherwise
+            True if the index exists, False if it is missing or cannot be checked
         """
+        if self._fulltext_index_cache is not None:
+            exists, fetched_at = self._fulltext_index_cache
+            if time.monotonic() - fetched_at < INDEX_CACHE_TTL:
+                return exists
+        
         try:
-            query = """
-            SHOW INDEXES
-            YIELD name, type, labelsOrTypes, properties
-            WHERE type = 'VECTOR' 
-            RETURN count(*) > 0 as has_vector_index
-            """
-            
-            result = self.graph_db.execute_query(query)
-            
-            if result and len(result) > 0 and 'has_vector_index' in result[0]:
-                return result[0]['has_vector_index']
-            return False
+            result = self.graph_db.execute_query(FULLTEXT_INDEX_EXISTS_QUERY, {"index_name": FULLTEXT_INDEX_NAME})
+            exists = bool(result) and result[0].get("count", 0) > 0
         except Exception as e:
-            logger.warning(f"Error checking vector index: {e}")
+            logger.warning("Error checking fulltext index: %s", e)
             return False
+        
+        self._fulltext_index_cache = (exists, time.monotonic())
+        return exists
+    
+    def _vector_index_names(self, labels: Optional[List[str]]) -> List[str]:
+        """Get the names of the vector indexes covering any of the labels, or all of them."""
+        return [
+            name for name, index_labels in self._get_vector_indexes().items()
+            if labels is None or set(index_labels) & set(labels)
+        ]
     
-    def _execute_vector_search(self, query_embedding: List[float], entity_filter: str, 
-                              threshold: float, limit: int) -> List[Dict[str, Any]]:
+    def _execute_vector_search(self, query_embedding: np.ndarray, labels: Optional[List[str]], 
+                              threshold: float, limit: int,
+                              properties: Optional[List[str]] = None) -> List[Dict[str, Any]]:
         """
         Execute vector similarity search.
         
         Args:
             query_embedding: Vector embedding of the query
-            entity_filter: Cypher WHERE clause for filtering entities
+            labels: Entity labels to search within, or None for all entities
             threshold: Minimum similarity threshold
             limit: Maximum number of results
+            properties: Property names to return, or None for all but the embedding
             
         Returns:
             List of matching entities with scores
         """
         self.stats["vector_searches"] += 1
         
+        indexes = self._vector_index_names(labels)
+        if not indexes:
+            return []
+        
         try:
-            # Convert embedding to JSON string for Cypher
-            embedding_json = json.dumps(query_embedding)
-            
-            # Build the query with vector similarity
-            query = f"""
-            MATCH (n){entity_filter}
-            WHERE n.embedding IS NOT NULL
-            WITH n, gds.similarity.cosine(n.embedding, {embedding_json}) AS score
-            WHERE score >= {threshold}
-            RETURN id(n) AS id, labels(n) AS labels, properties(n) AS properties, score
-            ORDER BY score DESC
-            LIMIT {limit}
-            """
-            
-            # Execute query
-            result = self.graph_db.execute_query(query)
-            
-            # Format results
-            return [self._format_result(r) for r in result]
-            
+            # Ask the index for more neighbours than needed, leaving headroom for
+            # the threshold and label filters applied after the KNN lookup.
+            # Lists are only built at the Bolt parameter boundary.
+            result = self.graph_db.execute_query(MULTI_INDEX_VECTOR_SEARCH_QUERY, {
+                "index_names": indexes,
+                "k": min(limit * 4, 500),
+                "labels": labels,
+                "embedding": _to_f32(query_embedding).tolist(),
+                "threshold": threshold,
+                "properties": properties,
+                "limit": limit
+            })
         except Exception as e:
-            logger.error(f"Error in vector search: {e}")
+            logger.error("Error in vector search: %s", e)
             return []
+        
+        return [self._format_result(r, properties) for r in result]
     
-    def _execute_text_search(self, text_query: str, entity_filter: str, limit: int) -> List[Dict[str, Any]]:
+    def _execute_text_search(self, text_query: str, labels: Optional[List[str]], limit: int,
+                             properties: Optional[List[str]] = None) -> List[Dict[str, Any]]:
         """
         Execute text-based search.
         
         Args:
             text_query: Text query to search for
-            entity_filter: Cypher WHERE clause for filtering entities
+            labels: Entity labels to search within, or None for all entities
             limit: Maximum number of results
+            properties: Property names to return, or None for all but the embedding
             
         Returns:
             List of matching entities with scores
         """
         self.stats["text_searches"] += 1
         
-        # Prepare search terms
-        search_terms = text_query.split()
-        
-        # Build the query with multiple search approaches
-        if len(search_terms) > 0:
-            # First try exact match on name or title
-            exact_query = f"""
-            MATCH (n){entity_filter}
-            WHERE toLower(n.name) CONTAINS toLower('{text_query}') 
-               OR toLower(n.title) CONTAINS toLower('{text_query}')
-            RETURN id(n) AS id, labels(n) AS labels, properties(n) AS properties, 1.0 AS score
-            LIMIT {limit}
-            """
-            
-            # Then try partial matches on individual terms with descending weights
-            term_query_parts = []
-            for i, term in enumerate(search_terms[:3]):  # Limit to first 3 terms for performance
-                weight = 0.9 - (i * 0.1)  # Decreasing weights: 0.9, 0.8, 0.7
-                term_query_parts.append(f"""
-                MATCH (n){entity_filter}
-                WHERE any(prop IN keys(n) WHERE 
-                    toLower(toString(n[prop])) CONTAINS toLower('{term}')
-                )
-                RETURN id(n) AS id, labels(n) AS labels, properties(n) AS properties, {weight} AS score
-                """)
-            
-            term_query = " UNION ".join(term_query_parts)
-            
-            # Combine queries, remove duplicates, sort by score
-            combined_query = f"""
-            {exact_query}
-            UNION
-            {term_query}
-            """
-            
-            deduplication_query = f"""
-            WITH * FROM ({combined_query}) AS results
-            WITH id, labels, properties, max(score) AS score
-            ORDER BY score DESC
-            LIMIT {limit}
-            RETURN id, labels, properties, score
-            """
-            
-            # Execute query
-            try:
-                result = self.graph_db.execute_query(deduplication_query)
-                return [self._format_result(r) for r in result]
-            except Exception as e:
-                logger.error(f"Error in text search: {e}")
-                
-                # Try simpler fallback query if the complex one fails
-                fallback_query = f"""
-                MATCH (n){entity_filter}
-                RETURN id(n) AS id, labels(n) AS labels, properties(n) AS properties, 0.5 AS score
-                LIMIT {limit}
-                """
-                try:
-                    result = self.graph_db.execute_query(fallback_query)
-                    return [self._format_result(r) for r in result]
-                except Exception as e2:
-                    logger.error(f"Error in fallback text search: {e2}")
-                    return []
-        
         # If no search terms, return empty list
-        return []
+        if not text_query.strip():
+            return []
+        
+        # Escape the query so user text is matched literally by the fulltext index
+        params = {
+            "index_name": FULLTEXT_INDEX_NAME,
+            "labels": labels,
+            "text": LUCENE_SPECIAL_CHARS.sub(r"\\\1", text_query),
+            "raw_text": text_query,
+            "properties": properties,
+            "limit": limit
+        }
+        
+        # Use a substring match when the fulltext index is not available. The
+        # graph layer returns an empty result on query errors, so a missing index
+        # has to be detected up front rather than by catching the failure
+        if self._has_fulltext_index():
+            query = TEXT_SEARCH_QUERY
+        else:
+            logger.info("Fulltext index %s not found, using substring match", FULLTEXT_INDEX_NAME)
+            query = TEXT_SEARCH_FALLBACK_QUERY
+        
+        try:
+            result = self.graph_db.execute_query(query, params)
+            return [self._format_result(r, properties) for r in result]
+        except Exception as e:
+            logger.error("Error in text search: %s", e)
+            return []
     
-    def _format_result(self, result: Dict[str, Any]) -> Dict[str, Any]:
+    def _format_result(self, result: Dict[str, Any],
+                       property_names: Optional[List[str]] = None) -> Dict[str, Any]:
         """Format a result record into a standardized output format."""
+        properties = result.get("properties") or {}
+        if property_names is not None:
+            # Only the values were returned, in the order they were requested
+            properties = {k: v for k, v in zip(property_names, properties) if v is not None}
+        else:
+            properties = {k: v for k, v in properties.items() if k != "embedding"}
+        
         return {
             "id": str(result.get("id")),
             "labels": result.get("labels", []),
-            "properties": result.get("properties", {}),
+            "properties": properties,
             "score": float(result.get("score", 0.0))
         }
     
-    def create_vector_index(self, entity_label: str = "Entity", dimension: int = 384) -> bool:
+    def create_vector_index(self, entity_label: str = "Entity", dimension: int = 384,
+                            quantize: bool = False) -> bool:
         """
         Create a vector index in Neo4j for the specified entity label.
         
+        The index is named by vector_index_name(), which the search path uses
+        to query it with db.index.vector.queryNodes.
+        
         Args:
             entity_label: Label of the entities to index
             dimension: Dimensionality of the embeddings
+            quantize: Whether the index should store int8-quantized vectors
             
         Returns:
             True if successful, False otherwise
         """
         try:
-            # Create the vector index
-            query = f"""
-            CREATE VECTOR INDEX entity_embeddings IF NOT EXISTS FOR (n:{entity_label}) ON (n.embedding)
-            OPTIONS {{
-                indexConfig: {{
-                    `vector.dimensions`: {dimension},
-                    `vector.similarity_function`: 'cosine'
-                }}
-            }}
-            """
+            # Create the vector index, named after the label so each label gets its own index
+            label = _check_identifier(entity_label)
+            index_name = self.vector_index_name(label)
+            query = CREATE_VECTOR_INDEX_TEMPLATE.format(
+                index_name=index_name, label=label, dimension=int(dimension),
+                quantization=VECTOR_QUANTIZATION_CONFIG if quantize else ""
+            )
             
             self.graph_db.execute_query(query)
-            logger.info(f"Created vector index for {entity_label} entities with dimension {dimension}")
+            
+            # Make the next search pick up the new index
+            self._vector_indexes_cache = None
+            
+            logger.info(f"Created vector index {index_name} for {entity_label} entities with dimension {dimension}")
             return True
             
         except Exception as e:
             logger.error(f"Error creating vector index: {e}")
             return False
     
+    def create_vector_indexes(self, entity_labels: List[str], dimension: int = 384,
+                              quantize: bool = False) -> int:
+        """
+        Create the vector indexes for several entity labels.
+        
+        Existing indexes are read once up front and only the missing ones are
+        created, so re-running initialization issues no schema statements.
+        
+        Args:
+            entity_labels: Labels of the entities to index
+            dimension: Dimensionality of the embeddings
+            quantize: Whether the indexes should store int8-quantized vectors
+            
+        Returns:
+            Number of indexes created
+        """
+        existing = self._get_vector_indexes()
+        missing = [label for label in entity_labels if self.vector_index_name(label) not in existing]
+        
+        if len(missing) < len(entity_labels):
+            logger.info(f"{len(entity_labels) - len(missing)} vector indices already exist")
+        
+        return sum(1 for label in missing if self.create_vector_index(label, dimension, quantize))
+    
+    def warm_vector_indexes(self, dimension: int = 384, k: int = 10) -> int:
+        """
+        Run a throw-away query against each vector index to page it into memory.
+        
+        The first query on a cold index is much slower than the ones after it,
+        warming the indexes moves that cost out of the first user search.
+        
+        Args:
+            dimension: Dimensionality of the indexed embeddings
+            k: Number of neighbours to request from each index
+            
+        Returns:
+            Number of indexes warmed
+        """
+        # Cosine similarity is undefined for a zero vector, use a unit vector instead
+        probe = [1.0] + [0.0] * (dimension - 1)
+        
+        warmed = 0
+        for index_name in self._get_vector_indexes():
+            try:
+                self.graph_db.execute_query(VECTOR_SEARCH_QUERY, {
+                    "index_name": index_name,
+                    "k": k,
+                    "labels": None,
+                    "embedding": probe,
+                    "threshold": -1.0,
+                    "properties": [],
+                    "limit": k
+                })
+                warmed += 1
+            except Exception as e:
+                logger.warning(f"Error warming vector index {index_name}: {e}")
+        
+        return warmed
+    
+    def create_fulltext_index(self, entity_labels: List[str],
+                              properties: Optional[List[str]] = None) -> bool:
+        """
+        Create the fulltext index used by text search.
+        
+        Args:
+            entity_labels: Labels of the entities to index
+            properties: Text properties to index (defaults to name, title and description)
+            
+        Returns:
+            True if successful, False otherwise
+        """
+        if not entity_labels:
+            return False
+        
+        properties = properties or ["name", "title", "description"]
+        
+        try:
+            query = CREATE_FULLTEXT_INDEX_TEMPLATE.format(
+                index_name=FULLTEXT_INDEX_NAME,
+                labels="|".join(_check_identifier(label) for label in entity_labels),
+                properties=", ".join(f"n.{_check_identifier(prop)}" for prop in properties)
+            )
+            
+            self.graph_db.execute_query(query)
+            
+            # Make the next search pick up the new index
+            self._fulltext_index_cache = None
+            
+            logger.info(f"Created fulltext index {FULLTEXT_INDEX_NAME} for {len(entity_labels)} labels")
+            return True
+            
+        except Exception as e:
+            logger.error(f"Error creating fulltext index: {e}")
+            return False
+    
     def store_entity_embedding(self, entity_id: str, embedding: List[float]) -> bool:
         """
         Store an embedding for an entity.
@@ -330,34 +715,42 @@ class SemanticEntityRetriever:
         Returns:
             True if successful, False otherwise
         """
+        success = self.store_entity_embeddings_batch([{"id": entity_id, "embedding": embedding}]) == 1
+        
+        if success:
+            logger.info(f"Stored embedding for entity {entity_id}")
+        else:
+            logger.warning(f"Failed to store embedding for entity {entity_id}")
+            
+        return success
+    
+    def store_entity_embeddings_batch(self, rows: List[Dict[str, Any]]) -> int:
+        """
+        Store embeddings for a batch of entities in a single query.
+        
+        Args:
+            rows: List of dictionaries with the entity "id" and its "embedding"
+            
+        Returns:
+            Number of entities whose embedding was stored
+        """
+        if not rows:
+            return 0
+        
         try:
-            # Convert embedding to JSON string for storage
-            embedding_json = json.dumps(embedding)
-            
-            # Store the embedding
-            query = f"""
-            MATCH (n) WHERE id(n) = $entity_id
-            SET n.embedding = $embedding
-            RETURN id(n) as id
-            """
-            
-            result = self.graph_db.execute_query(query, {
-                "entity_id": int(entity_id),
-                "embedding": embedding
+            # Embeddings are bound as plain float lists, the driver encodes them
+            # natively and the vector index requires a LIST<FLOAT> property
+            result = self.graph_db.execute_query(STORE_EMBEDDINGS_QUERY, {
+                "rows": [{"id": int(row["id"]), "embedding": row["embedding"]} for row in rows]
             })
             
-            success = result and len(result) > 0 and "id" in result[0]
-            
-            if success:
-                logger.info(f"Stored embedding for entity {entity_id}")
-            else:
-                logger.warning(f"Failed to store embedding for entity {entity_id}")
-                
-            return success
+            if result and len(result) > 0 and "stored" in result[0]:
+                return int(result[0]["stored"])
+            return 0
             
         except Exception as e:
-            logger.error(f"Error storing embedding: {e}")
-            return False
+            logger.error(f"Error storing embeddings: {e}")
+            return 0
     
     def generate_embeddings_for_tier(self, tier_label: str, batch_size: int = 50, 
                                     property_name: str = "name", limit: int = 1000) -> Dict[str, Any]:
@@ -377,32 +770,29 @@ class SemanticEntityRetriever:
         
         try:
             # Get entities without embeddings
-            query = f"""
-            MATCH (n:{tier_label})
-            WHERE n.{property_name} IS NOT NULL AND n.embedding IS NULL
-            RETURN id(n) as id, n.{property_name} as text
-            LIMIT {limit}
-            """
-            
-            entities = self.graph_db.execute_query(query)
-            
-            if not entities:
-                logger.info(f"No entities found for tier {tier_label} without embeddings")
-                return {
-                    "processed": 0,
-                    "successful": 0,
-                    "failed": 0,
-                    "time": 0
-                }
-            
-            logger.info(f"Generating embeddings for {len(entities)} {tier_label} entities")
-            
-            # Process in batches
+            query = ENTITIES_WITHOUT_EMBEDDING_TEMPLATE.format(
+                label=_check_identifier(tier_label),
+                property=_check_identifier(property_name)
+            )
+            
+            # Process in batches as rows stream in from the database, so encoding
+            # starts with the first batch instead of after the whole result. Batches
+            # are encoded on this thread while a single writer thread stores the
+            # previous ones. At most two batches wait to be written at any time.
+            processed = 0
             success_count = 0
             fail_count = 0
+            in_flight = threading.BoundedSemaphore(2)
+            pending = []
+            
+            def write_batch(rows):
+                try:
+                    return self.store_entity_embeddings_batch(rows)
+                finally:
+                    in_flight.release()
             
-            for i in range(0, len(entities), batch_size):
-                batch = entities[i:i+batch_size]
+            def encode_batch(batch):
+                nonlocal fail_count
                 
                 # Extract texts and IDs
                 texts = [entity["text"] for entity in batch]
@@ -410,27 +800,59 @@ class SemanticEntityRetriever:
                 
                 # Generate embeddings
                 try:
-                    embeddings = self.embedding_provider.batch_encode(texts, batch_size=batch_size)
-                    
-                    # Store embeddings
-                    for j, (entity_id, embedding) in enumerate(zip(ids, embeddings)):
-                        success = self.store_entity_embedding(entity_id, embedding)
-                        if success:
-                            success_count += 1
-                        else:
-                            fail_count += 1
-                        
-                    logger.info(f"Processed batch {i//batch_size + 1}/{(len(entities)-1)//batch_size + 1}")
-                    
+                    with self._encode_lock:
+                        embeddings = self.embedding_provider.batch_encode(texts, batch_size=batch_size)
                 except Exception as batch_error:
                     logger.error(f"Error processing batch: {batch_error}")
                     fail_count += len(batch)
+                    return
+                
+                # Store the whole batch in one round-trip on the writer thread
+                rows = [
+                    {"id": entity_id, "embedding": embedding}
+                    for entity_id, embedding in zip(ids, embeddings)
+                ]
+                in_flight.acquire()
+                pending.append((writer.submit(write_batch, rows), len(batch)))
+            
+            with ThreadPoolExecutor(max_workers=1) as writer:
+                batch = []
+                for entity in self.graph_db.stream_query(query, {"limit": int(limit)}):
+                    batch.append(entity)
+                    if len(batch) == batch_size:
+                        processed += len(batch)
+                        encode_batch(batch)
+                        logger.info(f"Processed {processed} {tier_label} entities")
+                        batch = []
+                
+                if batch:
+                    processed += len(batch)
+                    encode_batch(batch)
+            
+            if not processed:
+                logger.info(f"No entities found for tier {tier_label} without embeddings")
+                return {
+                    "processed": 0,
+                    "successful": 0,
+                    "failed": 0,
+                    "time": 0
+                }
+            
+            # Collect the write results, a failed batch does not affect the others
+            for future, size in pending:
+                try:
+                    stored = future.result()
+                except Exception as write_error:
+                    logger.error(f"Error storing batch: {write_error}")
+                    stored = 0
+                success_count += stored
+                fail_count += size - stored
             
             # Calculate statistics
             elapsed = time.time() - start_time
             
             stats = {
-                "processed": len(entities),
+                "processed": processed,
                 "successful": success_count,
                 "failed": fail_count,
                 "time": elapsed
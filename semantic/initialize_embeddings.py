@@ -12,6 +12,7 @@ import sys
 import logging
 import time
 import argparse
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from typing import Dict, List, Any, Optional
 
 # Configure logging
@@ -84,6 +85,20 @@ def parse_arguments():
         help="Use dummy embedding provider (for testing)"
     )
     
+    parser.add_argument(
+        "--quantize", 
+        choices=["none", "int8"],
+        default="none",
+        help="Quantization of the vector index (default: none, int8 requires Neo4j 5.23+)"
+    )
+    
+    parser.add_argument(
+        "--workers", 
+        type=int, 
+        default=None,
+        help="Number of entity types processed concurrently (default: min(4, entity types in tier))"
+    )
+    
     return parser.parse_args()
 
 def main():
@@ -131,10 +146,16 @@ def main():
         logger.info("Creating vector indices in Neo4j")
         dimension = 384  # Default dimension for BAAI/bge-small-en-v1.5
         
-        # Create index for each entity type in Tier 1
-        for entity_type in tier_mappings[1]:
-            logger.info(f"Creating vector index for {entity_type}")
-            entity_retriever.create_vector_index(entity_type, dimension)
+        # Create index for each entity type in Tier 1 that does not have one yet
+        created = entity_retriever.create_vector_indexes(
+            sorted(tier_mappings[1]), dimension, quantize=args.quantize == "int8"
+        )
+        logger.info(f"Created {created} vector indices")
+        
+        # Create the fulltext index used by text search over all classified types
+        all_types = sorted(entity_type for types in tier_mappings.values() for entity_type in types)
+        logger.info("Creating fulltext index for text search")
+        entity_retriever.create_fulltext_index(all_types)
     
     # Generate embeddings for requested tiers
     total_processed = 0
@@ -146,28 +167,48 @@ def main():
             logger.warning(f"No entity types in Tier {tier}")
             continue
         
-        logger.info(f"Processing Tier {tier}: {', '.join(tier_mappings[tier])}")
+        logger.info(f"Processing Tier {tier}: {', '.join(sorted(tier_mappings[tier]))}")
         
-        for entity_type in tier_mappings[tier]:
-            logger.info(f"Generating embeddings for {entity_type}")
-            
-            if args.dry_run:
+        if args.dry_run:
+            for entity_type in sorted(tier_mappings[tier]):
                 logger.info(f"[DRY RUN] Would process {entity_type}")
-                continue
-            
-            # Generate embeddings
-            stats = entity_retriever.generate_embeddings_for_tier(
-                entity_type,
-                batch_size=args.batch_size,
-                limit=args.limit
-            )
-            
-            # Update totals
-            total_processed += stats.get("processed", 0)
-            total_success += stats.get("successful", 0)
-            total_fail += stats.get("failed", 0)
+            continue
+        
+        # Entity types are independent, so their database reads and writes can
+        # overlap; the retriever serializes the model calls between them
+        workers = args.workers or min(4, len(tier_mappings[tier]))
+        with ThreadPoolExecutor(max_workers=max(1, workers)) as executor:
+            futures = {}
+            for entity_type in sorted(tier_mappings[tier]):
+                logger.info(f"Generating embeddings for {entity_type}")
+                future = executor.submit(
+                    entity_retriever.generate_embeddings_for_tier,
+                    entity_type,
+                    batch_size=args.batch_size,
+                    limit=args.limit
+                )
+                futures[future] = entity_type
             
-            logger.info(f"Processed {entity_type}: {stats}")
+            for future in as_completed(futures):
+                entity_type = futures[future]
+                try:
+                    stats = future.result()
+                except Exception as e:
+                    logger.error(f"Error generating embeddings for {entity_type}: {e}")
+                    continue
+                
+                # Update totals
+                total_processed += stats.get("processed", 0)
+                total_success += stats.get("successful", 0)
+                total_fail += stats.get("failed", 0)
+                
+                logger.info(f"Processed {entity_type}: {stats}")
+    
+    # Page the vector indexes into memory so the first user query does not pay for it
+    if not args.dry_run:
+        warm_start = time.time()
+        warmed = entity_retriever.warm_vector_indexes(dimension)
+        logger.info(f"Warmed {warmed} vector indices in {time.time() - warm_start:.2f}s")
     
     # Log summary
     elapsed = time.time() - start_time
@@ -0,0 +1,363 @@
+"""
+Semantic Response Cache Module - Reuses answers for semantically similar questions.
+
+This module caches question/answer pairs keyed by the embedding of the question.
+A new question whose embedding is close enough to a cached one is answered from
+the cache instead of running the full graph RAG workflow. Verbatim repeats are
+served from an exact-match tier first, without computing an embedding.
+"""
+
+import hashlib
+import json
+import logging
+import os
+import time
+from typing import Dict, List, Any, Optional
+
+import numpy as np
+
+from .embedding_provider import EmbeddingProvider
+from ._fast import NUMBA_AVAILABLE
+
+if NUMBA_AVAILABLE:
+    from ._fast import topk_dot, topk_scaled_dot
+
+# Conditionally import FAISS for approximate nearest neighbour search
+try:
+    import faiss
+    FAISS_AVAILABLE = True
+except ImportError:
+    FAISS_AVAILABLE = False
+
+logger = logging.getLogger(__name__)
+
+# Minimum number of rows by which the vector storage grows when it is full
+GROWTH_CHUNK = 64
+
+class SemanticResponseCache:
+    """Cache of responses indexed by question embeddings."""
+
+    def __init__(self, embedding_provider: EmbeddingProvider, threshold: float = 0.92,
+                 hnsw_m: int = 32, ef_search: int = 64, use_faiss: bool = True,
+                 quantize: bool = True, rerank_k: int = 4):
+        """
+        Initialize the semantic response cache.
+
+        Args:
+            embedding_provider: Provider used to embed questions
+            threshold: Minimum cosine similarity for a cached response to be reused
+            hnsw_m: Number of neighbours per node in the HNSW graph
+            ef_search: Size of the HNSW candidate list at search time
+            use_faiss: Whether to use a FAISS HNSW index when FAISS is installed
+            quantize: Whether to search over int8-quantized vectors (SQ8 in FAISS)
+            rerank_k: Number of candidates from the quantized search re-scored
+                with the exact float32 vectors before applying the threshold
+        """
+        self.embedding_provider = embedding_provider
+        self.threshold = threshold
+        self.hnsw_m = hnsw_m
+        self.ef_search = ef_search
+        self.use_faiss = use_faiss and FAISS_AVAILABLE
+        self.quantize = quantize
+        self.rerank_k = max(1, rerank_k)
+
+        self.dimension = None
+        self._index = None
+        # Float32 originals, used for exact re-scoring of the candidates. The
+        # arrays are preallocated and grown in chunks, only the first
+        # len(self) rows are in use
+        self._vectors = None
+        # Int8 codes with a per-vector scale, used by the quantized numpy scan
+        self._codes = None
+        self._scales = None
+        self._questions: List[str] = []
+        self._responses: List[Dict[str, Any]] = []
+        # Exact-match tier: hash of the normalized question -> response position
+        self._exact: Dict[int, int] = {}
+
+        self.stats = {
+            "lookups": 0,
+            "hits": 0,
+            "exact_hits": 0,
+            "misses": 0,
+            "total_time": 0.0
+        }
+
+        if use_faiss and not FAISS_AVAILABLE:
+            logger.info("FAISS not installed, semantic cache will use a linear scan")
+
+    def __len__(self) -> int:
+        return len(self._responses)
+
+    @staticmethod
+    def _exact_key(question: str) -> int:
+        """Hash of the whitespace-trimmed, case-folded question."""
+        digest = hashlib.blake2b(question.strip().casefold().encode("utf-8"), digest_size=8).digest()
+        return int.from_bytes(digest, "little")
+
+    def _embed(self, question: str) -> np.ndarray:
+        """Embed a question as a unit-norm float32 vector."""
+        vector = np.asarray(self.embedding_provider.encode(question), dtype=np.float32)
+        norm = np.linalg.norm(vector)
+        if norm > 0:
+            vector = vector / norm
+        return vector
+
+    @staticmethod
+    def _quantize(vectors: np.ndarray):
+        """
+        Quantize vectors to int8 with a per-vector scale.
+
+        Returns:
+            Tuple of (int8 codes, float32 scales)
+        """
+        scales = np.abs(vectors).max(axis=1) / 127.0
+        scales[scales == 0] = 1.0
+        codes = np.round(vectors / scales[:, None]).astype(np.int8)
+        return codes, scales.astype(np.float32)
+
+    def _create_faiss_index(self, dimension: int):
+        """Create an empty FAISS HNSW index, scalar-quantized to 8 bits if enabled."""
+        if self.quantize:
+            index = faiss.IndexHNSWSQ(dimension, faiss.ScalarQuantizer.QT_8bit, self.hnsw_m,
+                                      faiss.METRIC_INNER_PRODUCT)
+            # Components of unit-norm vectors lie in [-1, 1], so the quantizer
+            # range can be trained once from the bounds instead of from data
+            bounds = np.vstack([np.full(dimension, -1.0), np.full(dimension, 1.0)]).astype(np.float32)
+            index.train(bounds)
+        else:
+            index = faiss.IndexHNSWFlat(dimension, self.hnsw_m, faiss.METRIC_INNER_PRODUCT)
+        index.hnsw.efSearch = self.ef_search
+        return index
+
+    def _init_index(self, dimension: int):
+        """Create the empty vector index for the given dimensionality."""
+        self.dimension = dimension
+        self._vectors = np.empty((0, dimension), dtype=np.float32)
+        if self.use_faiss:
+            self._index = self._create_faiss_index(dimension)
+        elif self.quantize:
+            self._codes = np.empty((0, dimension), dtype=np.int8)
+            self._scales = np.empty(0, dtype=np.float32)
+
+    def _ensure_capacity(self, size: int):
+        """Grow the vector storage so it can hold at least size rows."""
+        capacity = len(self._vectors)
+        if size <= capacity:
+            return
+
+        capacity = max(size, 2 * capacity, GROWTH_CHUNK)
+        count = len(self._responses)
+
+        vectors = np.empty((capacity, self.dimension), dtype=np.float32)
+        vectors[:count] = self._vectors[:count]
+        self._vectors = vectors
+
+        if self._codes is not None:
+            codes = np.empty((capacity, self.dimension), dtype=np.int8)
+            codes[:count] = self._codes[:count]
+            scales = np.empty(capacity, dtype=np.float32)
+            scales[:count] = self._scales[:count]
+            self._codes, self._scales = codes, scales
+
+    def _candidates(self, vector: np.ndarray) -> np.ndarray:
+        """Return the ids of the closest cached questions according to the index."""
+        count = len(self._responses)
+        k = min(self.rerank_k, count)
+
+        if self.use_faiss:
+            _, ids = self._index.search(vector[None, :], k)
+            return ids[0][ids[0] >= 0]
+
+        if NUMBA_AVAILABLE:
+            # Score and select in one compiled pass over the vectors
+            if self.quantize:
+                return topk_scaled_dot(self._codes[:count], self._scales[:count], vector, k)
+            return topk_dot(self._vectors[:count], vector, k)
+
+        if self.quantize:
+            scores = (self._codes[:count] @ vector) * self._scales[:count]
+        else:
+            scores = self._vectors[:count] @ vector
+
+        if k >= len(scores):
+            return np.arange(len(scores))
+        return np.argpartition(-scores, k - 1)[:k]
+
+    def _search(self, vector: np.ndarray):
+        """
+        Find the closest cached question.
+
+        Returns:
+            Tuple of (index, similarity), or (-1, 0.0) if the cache is empty
+        """
+        if not self._responses:
+            return -1, 0.0
+
+        candidates = self._candidates(vector)
+        if len(candidates) == 0:
+            return -1, 0.0
+
+        # Re-score the candidates exactly so the threshold is applied to the true
+        # cosine similarity (vectors are unit-norm), not the quantized estimate
+        exact = self._vectors[candidates] @ vector
+        best = int(np.argmax(exact))
+        return int(candidates[best]), float(exact[best])
+
+    def lookup(self, question: str) -> Optional[Dict[str, Any]]:
+        """
+        Look up a cached response for a question.
+
+        Args:
+            question: The natural language question
+
+        Returns:
+            The cached response, or None if no similar question is cached
+        """
+        start_time = time.time()
+        self.stats["lookups"] += 1
+
+        result = None
+        key = self._exact_key(question)
+        position = self._exact.get(key)
+        if position is not None:
+            # Verbatim repeat, no need to embed the question
+            self.stats["exact_hits"] += 1
+            result = self._responses[position]
+        elif self._responses:
+            best, score = self._search(self._embed(question))
+            if best >= 0 and score >= self.threshold:
+                logger.info(f"Semantic cache hit (similarity {score:.3f}) for: {question}")
+                result = self._responses[best]
+                # Remember the phrasing so the next repeat is an exact hit
+                self._exact[key] = best
+
+        if result is None:
+            self.stats["misses"] += 1
+        else:
+            self.stats["hits"] += 1
+
+        self.stats["total_time"] += time.time() - start_time
+        return result
+
+    def add(self, question: str, response: Dict[str, Any]):
+        """
+        Add a response to the cache.
+
+        Args:
+            question: The natural language question
+            response: The response to cache for this question
+        """
+        vector = self._embed(question)
+        if self.dimension is None:
+            self._init_index(len(vector))
+
+        position = len(self._responses)
+        self._ensure_capacity(position + 1)
+        self._vectors[position] = vector
+        if self.use_faiss:
+            self._index.add(vector[None, :])
+        elif self.quantize:
+            codes, scales = self._quantize(vector[None, :])
+            self._codes[position] = codes[0]
+            self._scales[position] = scales[0]
+
+        self._exact[self._exact_key(question)] = position
+        self._questions.append(question)
+        self._responses.append(response)
+
+    def clear(self, path: Optional[str] = None):
+        """
+        Remove all cached responses.
+
+        Args:
+            path: Optional path prefix of saved cache files to delete as well,
+                so the cleared responses are not loaded again on restart
+        """
+        self.dimension = None
+        self._index = None
+        self._vectors = None
+        self._codes = None
+        self._scales = None
+        self._questions = []
+        self._responses = []
+        self._exact = {}
+
+        if path:
+            for suffix in (".npy", ".json", ".index"):
+                try:
+                    os.remove(f"{path}{suffix}")
+                except FileNotFoundError:
+                    pass
+                except OSError as e:
+                    logger.warning(f"Error removing semantic cache file {path}{suffix}: {e}")
+
+    def save(self, path: str) -> bool:
+        """
+        Persist the cache to disk.
+
+        Args:
+            path: Path prefix for the cache files
+
+        Returns:
+            bool: True if the cache was saved, False otherwise
+        """
+        if not self._responses:
+            return False
+
+        try:
+            os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+
+            np.save(f"{path}.npy", self._vectors[:len(self._responses)])
+            if self.use_faiss:
+                faiss.write_index(self._index, f"{path}.index")
+
+            with open(f"{path}.json", "w") as f:
+                json.dump({"questions": self._questions, "responses": self._responses}, f)
+
+            logger.info(f"Saved {len(self._responses)} cached responses to {path}")
+            return True
+        except Exception as e:
+            logger.error(f"Error saving semantic cache: {e}")
+            return False
+
+    def load(self, path: str) -> bool:
+        """
+        Load a previously saved cache from disk.
+
+        Args:
+            path: Path prefix for the cache files
+
+        Returns:
+            bool: True if the cache was loaded, False otherwise
+        """
+        vectors_path = f"{path}.npy"
+        if not (os.path.exists(vectors_path) and os.path.exists(f"{path}.json")):
+            return False
+
+        try:
+            with open(f"{path}.json", "r") as f:
+                data = json.load(f)
+
+            vectors = np.load(vectors_path).astype(np.float32)
+            self._init_index(vectors.shape[1])
+            self._vectors = vectors
+
+            if self.use_faiss:
+                if os.path.exists(f"{path}.index"):
+                    self._index = faiss.read_index(f"{path}.index")
+                    self._index.hnsw.efSearch = self.ef_search
+                else:
+                    self._index.add(vectors)
+            elif self.quantize:
+                self._codes, self._scales = self._quantize(vectors)
+
+            self._questions = data["questions"]
+            self._responses = data["responses"]
+            self._exact = {self._exact_key(q): i for i, q in enumerate(self._questions)}
+
+            logger.info(f"Loaded {len(self._responses)} cached responses from {path}")
+            return True
+        except Exception as e:
+            logger.error(f"Error loading semantic cache: {e}")
+            return False
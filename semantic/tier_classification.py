@@ -6,23 +6,54 @@ embedding generation, based on importance and connectivity.
 """
 
 import logging
-from typing import Dict, List, Any, Set, Optional
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, List, Any, Set, FrozenSet, Optional
 
-# Configure logging
-logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(name)s - %(levelname)s - %(message)s')
+# Logging is configured by the entry point, not on import
 logger = logging.getLogger(__name__)
 
+LABELS_QUERY = """
+CALL db.labels() YIELD label
+RETURN label
+"""
+
+# Labels containing one of these terms are always classified as Tier 1
+TIER1_KEY_TERMS = frozenset({"table", "entity", "concept", "category"})
+
+# Node counts per label and relationship counts per (label, type, direction) from
+# Neo4j's count store, without scanning the graph. Requires APOC.
+META_STATS_QUERY = """
+CALL apoc.meta.stats() YIELD labels, relTypes
+RETURN labels, relTypes
+"""
+
+# Node and relationship counts for all labels in a single pass over the graph,
+# used when APOC is not installed. It does not depend on the label list, so it
+# runs concurrently with the labels query.
+LABEL_STATS_QUERY = """
+MATCH (n)
+UNWIND labels(n) AS label
+RETURN label, count(n) AS node_count, sum(COUNT { (n)--() }) AS rel_count
+"""
+
 class TierClassifier:
     """Classifies entity types into tiers for prioritized embedding generation."""
     
-    def __init__(self, graph_db):
+    def __init__(self, graph_db, cache_ttl: int = 300):
         """
         Initialize the tier classifier.
         
         Args:
             graph_db: Graph database connection
+            cache_ttl: Time in seconds to reuse the result of analyze_schema (default: 5 minutes)
         """
         self.graph_db = graph_db
+        self.cache_ttl = cache_ttl
+        
+        # Result of the last successful schema analysis and when it was computed
+        self._cached_tier_mappings = None
+        self._cache_timestamp = 0
         self.tier_definitions = {
             1: {"name": "Primary", "description": "Key entity types with high importance"},
             2: {"name": "Secondary", "description": "Entity types with moderate connectivity"},
@@ -36,50 +67,76 @@ class TierClassifier:
             3: ["Instance", "Value", "Record", "Example", "Metadata"]
         }
         
+        # Lowercased once here instead of on every classification
+        self._default_tier_key_terms_lower = {
+            tier: [term.lower() for term in labels]
+            for tier, labels in self.default_tier_mappings.items()
+        }
+        
+        # Exact (lowercased) label -> tier, checked before the substring scan
+        self._exact_label_to_tier = {
+            label.lower(): tier
+            for tier, labels in self.default_tier_mappings.items()
+            for label in labels
+        }
+        
         self.custom_tier_mappings = {}
+        self._custom_label_to_tier = {}
+        
+        # Resolved label -> tier, so the key term scan runs once per label
+        self._label_tier_cache: Dict[str, int] = {}
     
-    def analyze_schema(self) -> Dict[int, List[str]]:
+    def analyze_schema(self) -> Dict[int, FrozenSet[str]]:
         """
         Analyze the database schema to classify entity types into tiers.
         
+        Both queries are constant strings, so Neo4j caches their plans. Labels must
+        never be interpolated into the query text, as every distinct query string
+        is planned again; pass them as parameters instead.
+        
+        Results are cached for cache_ttl seconds, call invalidate_cache() to force
+        a new analysis after the schema changed.
+        
         Returns:
-            Dictionary mapping tier numbers to lists of entity type names
+            Dictionary mapping tier numbers to frozensets of entity type names
         """
+        if (self._cached_tier_mappings is not None and
+                time.time() - self._cache_timestamp < self.cache_ttl):
+            return self._cached_tier_mappings
+        
         try:
-            # Get all node labels
-            label_query = """
-            CALL db.labels() YIELD label
-            RETURN label
-            """
-            label_results = self.graph_db.execute_query(label_query)
-            all_labels = [record["label"] for record in label_results]
+            tier_mappings = {1: set(), 2: set(), 3: set()}
+            uncounted_labels = []
+            label_count = 0
+            label_stats = None
             
-            # Get relationship counts for each label
-            tier_mappings = {1: [], 2: [], 3: []}
-            
-            for label in all_labels:
-                try:
-                    # Count nodes with this label
-                    count_query = f"""
-                    MATCH (n:{label})
-                    RETURN count(n) as node_count
-                    """
-                    count_result = self.graph_db.execute_query(count_query)
-                    node_count = count_result[0]["node_count"] if count_result else 0
+            # Count nodes and relationships per label on a worker thread while the
+            # labels are streamed on this one, each query runs in its own session
+            with ThreadPoolExecutor(max_workers=1) as executor:
+                stats_future = executor.submit(self._get_label_stats)
+                
+                for record in self.graph_db.stream_query(LABELS_QUERY):
+                    if label_stats is None:
+                        label_stats = stats_future.result()
+                    
+                    label = record["label"]
+                    label_count += 1
+                    stats = label_stats.get(label)
+                    
+                    if stats is None:
+                        # No counts for this label, classify it by its name alone
+                        uncounted_labels.append(label)
+                        stats = {}
                     
-                    # Count relationships for this label
-                    rel_query = f"""
-                    MATCH (n:{label})-[r]-()
-                    RETURN count(r) as rel_count
-                    """
-                    rel_result = self.graph_db.execute_query(rel_query)
-                    rel_count = rel_result[0]["rel_count"] if rel_result else 0
+                    label_lower = label.lower()
+                    node_count = stats.get("node_count", 0)
+                    rel_count = stats.get("rel_count", 0)
                     
                     # Calculate connectivity ratio
                     connectivity = rel_count / node_count if node_count > 0 else 0
                     
                     # Determine tier based on node count and connectivity
-                    if any(key_term in label.lower() for key_term in ["table", "entity", "concept", "category"]) or node_count > 1000:
+                    if any(key_term in label_lower for key_term in TIER1_KEY_TERMS) or node_count > 1000:
                         tier = 1  # Primary tier for key entities or large collections
                     elif connectivity > 5 or node_count > 500:
                         tier = 2  # Secondary tier for well-connected entities
@@ -87,25 +144,82 @@ class TierClassifier:
                         tier = 3  # Tertiary tier for everything else
                     
                     # Add to tier mappings
-                    tier_mappings[tier].append(label)
-                    
-                except Exception as label_error:
-                    logger.warning(f"Error analyzing label {label}: {label_error}")
-                    # Default to tier 3 on error
-                    tier_mappings[3].append(label)
+                    tier_mappings[tier].add(label)
+            
+            # Frozensets give callers O(1) membership tests and can be shared
+            # from the cache without copying
+            tier_mappings = {tier: frozenset(labels) for tier, labels in tier_mappings.items()}
             
-            logger.info(f"Analyzed schema and classified {len(all_labels)} entity types into tiers")
+            if label_count and not label_stats:
+                # The counts query failed, retry on the next call instead of caching
+                logger.warning(f"No node counts available, classified {label_count} entity types "
+                               f"by key terms only")
+                return tier_mappings
+            
+            if uncounted_labels:
+                logger.warning(f"No node counts for {len(uncounted_labels)} labels, "
+                               f"classified by key terms only: {', '.join(uncounted_labels)}")
+            
+            logger.info(f"Analyzed schema and classified {label_count} entity types into tiers")
             logger.info(f"Tier 1 (Primary): {len(tier_mappings[1])} types")
             logger.info(f"Tier 2 (Secondary): {len(tier_mappings[2])} types")
             logger.info(f"Tier 3 (Tertiary): {len(tier_mappings[3])} types")
             
+            self._cached_tier_mappings = tier_mappings
+            self._cache_timestamp = time.time()
+            
             return tier_mappings
             
         except Exception as e:
             logger.error(f"Error in schema analysis: {e}")
             # Return default tier mappings if analysis fails
             logger.warning("Using default tier mappings due to analysis failure")
-            return {tier: self.default_tier_mappings.get(tier, []) for tier in [1, 2, 3]}
+            return {tier: frozenset(self.default_tier_mappings.get(tier, [])) for tier in [1, 2, 3]}
+    
+    def _get_label_stats(self) -> Dict[str, Dict[str, int]]:
+        """
+        Get the node and relationship counts for every label.
+        
+        Uses apoc.meta.stats() when available and falls back to aggregating over
+        the graph otherwise.
+        
+        Returns:
+            Dictionary mapping labels to their node_count and rel_count
+        """
+        try:
+            result = self.graph_db.execute_query(META_STATS_QUERY)
+        except Exception as e:
+            logger.info(f"apoc.meta.stats() not available ({e}), counting over the graph")
+            result = None
+        
+        if result:
+            node_counts = result[0].get("labels") or {}
+            rel_types = result[0].get("relTypes") or {}
+            
+            # Keys look like "(:Label)-[:TYPE]->()" or "()-[:TYPE]->(:Label)", the
+            # relationships of a label are those with the label on either end
+            label_stats = {}
+            for label, node_count in node_counts.items():
+                # Match the graph aggregation, which has no rows for empty labels
+                if not node_count:
+                    continue
+                
+                outgoing = f"(:{label})-["
+                incoming = f"->(:{label})"
+                rel_count = sum(
+                    count for key, count in rel_types.items()
+                    if key.startswith(outgoing) or key.endswith(incoming)
+                )
+                label_stats[label] = {"node_count": node_count, "rel_count": rel_count}
+            return label_stats
+        
+        return {row["label"]: row for row in self.graph_db.execute_query(LABEL_STATS_QUERY)}
+    
+    def invalidate_cache(self) -> None:
+        """Discard the cached schema analysis so the next call queries the database again."""
+        self._cached_tier_mappings = None
+        self._cache_timestamp = 0
+        logger.info("Invalidated tier classification cache")
     
     def get_tier_for_label(self, label: str) -> int:
         """
@@ -117,14 +231,28 @@ class TierClassifier:
         Returns:
             Tier number (1, 2, or 3)
         """
+        tier = self._label_tier_cache.get(label)
+        if tier is None:
+            tier = self._classify_label(label)
+            self._label_tier_cache[label] = tier
+        return tier
+    
+    def _classify_label(self, label: str) -> int:
+        """Resolve the tier of a label from the custom and default mappings."""
         # Check custom mappings first
-        for tier, labels in self.custom_tier_mappings.items():
-            if label in labels:
-                return tier
+        tier = self._custom_label_to_tier.get(label)
+        if tier is not None:
+            return tier
+        
+        # If no custom mapping, try an exact match on the default mappings
+        label_lower = label.lower()
+        tier = self._exact_label_to_tier.get(label_lower)
+        if tier is not None:
+            return tier
         
-        # If no custom mapping, check each tier in the default mappings
-        for tier, labels in self.default_tier_mappings.items():
-            if any(key_term.lower() in label.lower() for key_term in labels):
+        # Otherwise check each tier for a key term contained in the label
+        for tier, key_terms in self._default_tier_key_terms_lower.items():
+            if any(key_term in label_lower for key_term in key_terms):
                 return tier
         
         # Default to tier 3 if no match found
@@ -138,6 +266,14 @@ class TierClassifier:
             tier_mappings: Dictionary mapping tier numbers to lists of entity type names
         """
         self.custom_tier_mappings = tier_mappings
+        
+        # Inverted for lookups, a label listed in several tiers keeps the first one
+        self._custom_label_to_tier = {}
+        for tier, labels in tier_mappings.items():
+            for label in labels:
+                self._custom_label_to_tier.setdefault(label, tier)
+        self._label_tier_cache = {}
+        
         logger.info("Set custom tier mappings")
         
         # Log the mappings for debugging
@@ -153,7 +289,7 @@ class TierClassifier:
         """
         return self.tier_definitions
     
-    def get_labels_for_tier(self, tier: int) -> List[str]:
+    def get_labels_for_tier(self, tier: int) -> FrozenSet[str]:
         """
         Get all labels for a specific tier.
         
@@ -161,12 +297,12 @@ class TierClassifier:
             tier: Tier number to get labels for
             
         Returns:
-            List of entity type names in the specified tier
+            Frozenset of entity type names in the specified tier
         """
         if self.custom_tier_mappings and tier in self.custom_tier_mappings:
-            return self.custom_tier_mappings[tier]
+            return frozenset(self.custom_tier_mappings[tier])
         
         # If no custom mappings or the tier isn't in custom mappings,
         # fall back to analyzing the schema
         tier_mappings = self.analyze_schema()
-        return tier_mappings.get(tier, [])
\ No newline at end of file
+        return tier_mappings.get(tier, frozenset())
\ No newline at end of file
@@ -12,9 +12,16 @@ setup(
         "fastapi>=0.100.0",
         "uvicorn>=0.23.0",
         "pydantic>=2.0.0",
+        "orjson>=3.8.0",
         "python-dotenv>=1.0.0",
         "requests>=2.28.0",
     ],
+    extras_require={
+        "test": [
+            "pytest>=7.0.0",
+            "pytest-xdist>=3.0.0",
+        ],
+    },
     classifiers=[
         "Development Status :: 4 - Beta",
         "Intended Audience :: Developers",
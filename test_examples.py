@@ -10,8 +10,6 @@ from schema.manager import SchemaManager
 from examples.generators.pattern_generator import PatternExampleGenerator
 import openai
 
-# Set up logging
-logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(name)s - %(levelname)s - %(message)s')
 logger = logging.getLogger(__name__)
 
 def get_llm_client():
@@ -106,11 +104,11 @@ def test_example_generation():
             logger.warning("No relationships found in schema")
             
     except Exception as e:
-        logger.error(f"Error generating examples: {e}")
-        import traceback
-        traceback.print_exc()
+        logger.exception(f"Error generating examples: {e}")
         
     return []
 
 if __name__ == "__main__":
+    # Set up logging
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(name)s - %(levelname)s - %(message)s')
     test_example_generation()
\ No newline at end of file
@@ -7,8 +7,6 @@ import os
 import logging
 from neo4j import GraphDatabase
 
-# Set up logging
-logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(name)s - %(levelname)s - %(message)s')
 logger = logging.getLogger(__name__)
 
 def test_neo4j_connection():
@@ -47,4 +45,6 @@ def test_neo4j_connection():
     return True
 
 if __name__ == "__main__":
+    # Set up logging
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(name)s - %(levelname)s - %(message)s')
     test_neo4j_connection()
\ No newline at end of file
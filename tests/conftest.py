@@ -0,0 +1,36 @@
+"""
+Pytest configuration for the test suite.
+
+Puts the project root on sys.path so the test modules can import the project
+packages without their own path setup.
+
+Tests that need a live Neo4j database are marked `neo4j`, so they can be
+deselected with `-m "not neo4j"`. When running with pytest-xdist and
+`--dist=loadgroup`, they are kept on a single worker so they do not compete
+for the database while the mocked tests run in parallel.
+"""
+
+import os
+import sys
+
+import pytest
+
+# Make the project packages importable from every test module, once for the suite
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if PROJECT_ROOT not in sys.path:
+    sys.path.insert(0, PROJECT_ROOT)
+
+# Test classes that run against a live Neo4j database
+NEO4J_TEST_CLASSES = {"TestSemanticEntityRetriever"}
+
+def pytest_configure(config):
+    config.addinivalue_line("markers", "neo4j: needs a live Neo4j database (set RUN_NEO4J_TESTS=1)")
+
+def pytest_collection_modifyitems(config, items):
+    group_by_worker = config.pluginmanager.hasplugin("xdist")
+    for item in items:
+        if item.cls is None or item.cls.__name__ not in NEO4J_TEST_CLASSES:
+            continue
+        item.add_marker(pytest.mark.neo4j)
+        if group_by_worker:
+            item.add_marker(pytest.mark.xdist_group("neo4j"))
@@ -0,0 +1,27 @@
+"""
+Result Utilities - Helpers shared by the test drivers for reporting their results.
+"""
+
+import os
+from itertools import islice
+
+import orjson
+
+def _preview(rows, k=3):
+    """Return at most the first k rows, without materializing the rest."""
+    return list(islice(iter(rows or []), k))
+
+def dump_results(path, data):
+    """
+    Save test results as JSON.
+
+    The output is compact unless PRETTY_JSON is set, since pretty-printing large
+    traces is slow. Numpy arrays in the results are serialized as lists.
+
+    Args:
+        path: File to write the results to
+        data: Results to save
+    """
+    option = orjson.OPT_SERIALIZE_NUMPY | (orjson.OPT_INDENT_2 if os.environ.get("PRETTY_JSON") else 0)
+    with open(path, "wb") as f:
+        f.write(orjson.dumps(data, option=option))
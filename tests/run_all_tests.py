@@ -9,31 +9,129 @@ This script runs all the test scripts for the Graph RAG components:
 4. Full GraphRAG End-to-End Tests
 
 Output is saved to test_results directory.
+
+The scripts are run in this interpreter rather than in a new process each, so
+heavy dependencies (neo4j, openai, fastapi) are imported once for the whole run.
+Scripts marked as parallel safe only read from the database and write their own
+output files, they run concurrently in worker processes before the others.
 """
 
 import os
+import io
 import sys
+import runpy
 import logging
 import time
-import subprocess
 import datetime
+import traceback
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from contextlib import redirect_stdout, redirect_stderr
 
 # Fix import paths when running from any location
 sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../../../')))
 
-# Configure logging
-logging.basicConfig(
-    level=logging.INFO,
-    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
-)
 logger = logging.getLogger(__name__)
 
-def run_all_tests(output_dir="test_results"):
+def run_script(script_path):
+    """
+    Run a test script in this interpreter as if it was executed directly.
+    
+    Args:
+        script_path: Path to the test script
+        
+    Returns:
+        Tuple of (success, stdout, stderr, error message or None)
+    """
+    stdout = io.StringIO()
+    stderr = io.StringIO()
+    
+    # Logging handlers write to the stream they were created with, so log
+    # records are routed to the captured stderr with a handler of their own
+    log_handler = logging.StreamHandler(stderr)
+    log_handler.setFormatter(logging.Formatter('%(asctime)s - %(name)s - %(levelname)s - %(message)s'))
+    root_logger = logging.getLogger()
+    root_logger.addHandler(log_handler)
+    
+    saved_argv = sys.argv
+    sys.argv = [script_path]
+    error = None
+    
+    try:
+        with redirect_stdout(stdout), redirect_stderr(stderr):
+            runpy.run_path(script_path, run_name="__main__")
+    except SystemExit as e:
+        # unittest.main() and friends exit, only a non-zero code is a failure
+        if e.code not in (None, 0):
+            error = f"Script exited with status {e.code}"
+    except Exception as e:
+        error = f"{type(e).__name__}: {e}"
+        stderr.write(traceback.format_exc())
+    finally:
+        sys.argv = saved_argv
+        root_logger.removeHandler(log_handler)
+    
+    return error is None, stdout.getvalue(), stderr.getvalue(), error
+
+def run_and_record(script_path, output_dir, timestamp):
+    """
+    Run a test script and save its output.
+    
+    Args:
+        script_path: Path to the test script
+        output_dir: Directory to save test results
+        timestamp: Timestamp of the test run, used in the output file names
+        
+    Returns:
+        Dictionary with the result of the script
+    """
+    script_name = os.path.basename(script_path)
+    script_output = os.path.join(output_dir, f"{script_name.replace('.py', '')}_{timestamp}.json")
+    
+    logger.info(f"Running {script_name}...")
+    
+    # Run the script
+    start_time = time.time()
+    success, stdout, stderr, error = run_script(script_path)
+    end_time = time.time()
+    
+    # Save stdout and stderr, also on error
+    with open(f"{script_output}.stdout", "w") as f:
+        f.write(stdout)
+    
+    with open(f"{script_output}.stderr", "w") as f:
+        f.write(stderr)
+    
+    if success:
+        # Log the output
+        logger.info(f"{script_name} completed in {end_time - start_time:.2f} seconds")
+        
+        return {
+            "script": script_name,
+            "success": True,
+            "runtime": end_time - start_time,
+            "stdout": f"{script_output}.stdout",
+            "stderr": f"{script_output}.stderr",
+            "output": script_output
+        }
+    else:
+        logger.error(f"Error running {script_name}: {error}")
+        
+        return {
+            "script": script_name,
+            "success": False,
+            "error": error,
+            "stdout": f"{script_output}.stdout",
+            "stderr": f"{script_output}.stderr",
+            "output": script_output
+        }
+
+def run_all_tests(output_dir="test_results", max_workers=None):
     """
     Run all the test scripts for Graph RAG components.
     
     Args:
         output_dir: Directory to save test results
+        max_workers: Maximum number of scripts run concurrently (default: all parallel safe scripts)
     """
     # Create output directory
     os.makedirs(output_dir, exist_ok=True)
@@ -41,13 +139,15 @@ def run_all_tests(output_dir="test_results"):
     # Get the current directory (where this script is located)
     script_dir = os.path.dirname(os.path.abspath(__file__))
     
-    # Define test scripts to run
+    # Define test scripts to run, with whether they can run alongside the others.
+    # The full workflow and the schema examples write the shared schema, embedding
+    # and response caches, so they run on their own.
     test_scripts = [
-        "test_query_decomposition.py",
-        "test_graph_retriever.py",
-        "test_reasoning_agent.py",
-        "test_graph_rag_direct.py",
-        "test_schema_examples.py"
+        ("test_query_decomposition.py", True),
+        ("test_graph_retriever.py", True),
+        ("test_reasoning_agent.py", True),
+        ("test_graph_rag_direct.py", False),
+        ("test_schema_examples.py", False)
     ]
     
     # Get timestamp for this test run
@@ -59,71 +159,26 @@ def run_all_tests(output_dir="test_results"):
     logger.info(f"Starting test run {timestamp}")
     logger.info(f"Log file: {log_file}")
     
-    # Run each test script
-    results = []
-    for script in test_scripts:
-        script_path = os.path.join(script_dir, script)
-        script_name = os.path.basename(script)
-        script_output = os.path.join(output_dir, f"{script_name.replace('.py', '')}_{timestamp}.json")
-        
-        logger.info(f"Running {script_name}...")
-        
-        # Set environment variable for the output file
-        env = os.environ.copy()
-        
-        # Construct command
-        cmd = [sys.executable, script_path]
-        
-        try:
-            # Run the script
-            start_time = time.time()
-            process = subprocess.run(
-                cmd, 
-                env=env,
-                stdout=subprocess.PIPE, 
-                stderr=subprocess.PIPE,
-                text=True,
-                check=True
-            )
-            end_time = time.time()
-            
-            # Log the output
-            logger.info(f"{script_name} completed in {end_time - start_time:.2f} seconds")
-            
-            # Save stdout and stderr
-            with open(f"{script_output}.stdout", "w") as f:
-                f.write(process.stdout)
-            
-            with open(f"{script_output}.stderr", "w") as f:
-                f.write(process.stderr)
-            
-            results.append({
-                "script": script_name,
-                "success": True,
-                "runtime": end_time - start_time,
-                "stdout": f"{script_output}.stdout",
-                "stderr": f"{script_output}.stderr",
-                "output": script_output
-            })
-            
-        except subprocess.CalledProcessError as e:
-            logger.error(f"Error running {script_name}: {e}")
-            
-            # Save stdout and stderr even on error
-            with open(f"{script_output}.stdout", "w") as f:
-                f.write(e.stdout)
-            
-            with open(f"{script_output}.stderr", "w") as f:
-                f.write(e.stderr)
-            
-            results.append({
-                "script": script_name,
-                "success": False,
-                "error": str(e),
-                "stdout": f"{script_output}.stdout",
-                "stderr": f"{script_output}.stderr",
-                "output": script_output
-            })
+    # Run the parallel safe scripts concurrently, then the rest one by one
+    parallel_scripts = [script for script, parallel_safe in test_scripts if parallel_safe]
+    serial_scripts = [script for script, parallel_safe in test_scripts if not parallel_safe]
+    
+    results = {}
+    if parallel_scripts:
+        workers = max_workers or len(parallel_scripts)
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            futures = {
+                executor.submit(run_and_record, os.path.join(script_dir, script), output_dir, timestamp): script
+                for script in parallel_scripts
+            }
+            for future in as_completed(futures):
+                results[futures[future]] = future.result()
+    
+    for script in serial_scripts:
+        results[script] = run_and_record(os.path.join(script_dir, script), output_dir, timestamp)
+    
+    # Report in the order the scripts are defined
+    results = [results[script] for script, _ in test_scripts]
     
     # Write summary
     summary_file = os.path.join(output_dir, f"test_summary_{timestamp}.json")
@@ -146,6 +201,12 @@ def run_all_tests(output_dir="test_results"):
 if __name__ == "__main__":
     import sys
     
+    # Configure logging
+    logging.basicConfig(
+        level=logging.INFO,
+        format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
+    )
+    
     # Get output directory from command line if provided
     output_dir = sys.argv[1] if len(sys.argv) > 1 else "test_results"
     
@@ -138,9 +138,7 @@ def main():
             logger.info("")
             
     except Exception as e:
-        logger.error(f"Error in E2E test: {e}")
-        import traceback
-        traceback.print_exc()
+        logger.exception(f"Error in E2E test: {e}")
 
 if __name__ == "__main__":
     main()
\ No newline at end of file
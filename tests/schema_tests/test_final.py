@@ -44,9 +44,7 @@ def main():
         logger.info("Examples saved to final_examples.json")
             
     except Exception as e:
-        logger.error(f"Error: {e}")
-        import traceback
-        traceback.print_exc()
+        logger.exception(f"Error: {e}")
 
 if __name__ == "__main__":
     main()
\ No newline at end of file
@@ -6,10 +6,11 @@ This script directly tests the PatternExampleGenerator with minimal dependencies
 """
 
 import os
+import asyncio
 import logging
 import json
 import time
-from openai import OpenAI
+from openai import AsyncOpenAI
 from examples.generators.pattern_generator import PatternExampleGenerator
 
 # Set up logging
@@ -25,7 +26,7 @@ def main():
             logger.error("OPENAI_API_KEY environment variable not set")
             return
         
-        client = OpenAI(api_key=api_key)
+        client = AsyncOpenAI(api_key=api_key)
         
         # Create a basic example generator
         generator = PatternExampleGenerator(llm_client=client)
@@ -66,11 +67,10 @@ def main():
         # Generate examples
         logger.info("Generating examples for test pattern...")
         start_time = time.time()
-        examples = generator._generate_examples_for_pattern(
-            pattern=test_pattern,
-            schema=schema,
-            rich_context=rich_context
+        pattern_examples = asyncio.run(
+            generator.generate_examples_for_patterns_async([test_pattern], schema, rich_context)
         )
+        examples = [example for batch in pattern_examples for example in batch]
         end_time = time.time()
         
         # Output the examples
@@ -87,9 +87,7 @@ def main():
         logger.info("Examples saved to micro_example.json")
             
     except Exception as e:
-        logger.error(f"Error: {e}")
-        import traceback
-        traceback.print_exc()
+        logger.exception(f"Error: {e}")
 
 if __name__ == "__main__":
     main()
\ No newline at end of file
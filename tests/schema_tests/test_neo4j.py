@@ -12,12 +12,9 @@ import logging
 # Add the project root to the path
 sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../..')))
 
-from graph_db.neo4j_database import Neo4jDatabase
-from schema.core.schema_loader import Neo4jSchemaLoader
+from schema.core.schema_loader import Neo4jSchemaLoader, cached_schema_loader
 from graph_db.graph_strategy_factory import GraphDatabaseFactory
 
-# Set up logging
-logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(name)s - %(levelname)s - %(message)s')
 logger = logging.getLogger(__name__)
 
 def main():
@@ -29,7 +26,7 @@ def main():
     database = os.environ.get("NEO4J_DATABASE", "neo4j")
     
     logger.info(f"Connecting to Neo4j at {uri}...")
-    db = Neo4jDatabase(uri=uri, user=user, password=password, database=database)
+    db = GraphDatabaseFactory.get(uri=uri, user=user, password=password, database=database)
     
     try:
         # Connect to Neo4j
@@ -53,7 +50,7 @@ def main():
             schema_loader = Neo4jSchemaLoader(db_factory=GraphDatabaseFactory)
             
             logger.info("Loading schema...")
-            schema = schema_loader.load_schema(force_refresh=True)
+            schema = cached_schema_loader(schema_loader)
             
             logger.info("Schema loaded successfully")
             logger.info(f"Found {len(schema.get('node_types', {}))} node types")
@@ -74,4 +71,6 @@ def main():
         logger.error(f"Error: {e}")
     
 if __name__ == "__main__":
+    # Set up logging
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(name)s - %(levelname)s - %(message)s')
     main()
\ No newline at end of file
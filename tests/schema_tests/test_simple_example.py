@@ -6,11 +6,13 @@ This script tests generating a single example.
 """
 
 import os
+import asyncio
 import logging
 import json
 from schema.manager import SchemaManager
+from schema.core.schema_loader import cached_schema_loader, cached_rich_context
 from examples.generators.pattern_generator import PatternExampleGenerator
-from scripts.client import get_llm_client
+from scripts.client import get_llm_client, get_async_llm_client
 
 # Set up logging
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(name)s - %(levelname)s - %(message)s')
@@ -30,7 +32,8 @@ def main():
         
         # Get the schema
         logger.info("Loading schema...")
-        schema = schema_manager.get_schema(force_refresh=True)
+        schema = cached_schema_loader(schema_manager.schema_loader)
+        schema_manager.schema_cache.set('schema', schema)
         
         # Get the formatted schema
         formatted_schema = schema_manager.get_formatted_schema()
@@ -46,22 +49,17 @@ def main():
         }
         
         # Create a pattern generator
-        generator = PatternExampleGenerator(llm_client=llm_client)
+        generator = PatternExampleGenerator(llm_client=get_async_llm_client())
         
-        # Empty rich context for testing
-        rich_context = {
-            'node_examples': {},
-            'relationship_examples': {},
-            'common_queries': []
-        }
+        # Node examples are sampled once per schema and reused across runs
+        rich_context = cached_rich_context(schema_manager.schema_loader, schema)
         
         # Generate examples for this pattern
         logger.info("Generating examples for test pattern...")
-        examples = generator._generate_examples_for_pattern(
-            pattern=test_pattern,
-            schema=schema,
-            rich_context=rich_context
+        pattern_examples = asyncio.run(
+            generator.generate_examples_for_patterns_async([test_pattern], schema, rich_context)
         )
+        examples = [example for batch in pattern_examples for example in batch]
         
         # Output the examples
         logger.info(f"Generated {len(examples)} examples:")
@@ -77,9 +75,7 @@ def main():
         logger.info("Examples saved to test_example.json")
             
     except Exception as e:
-        logger.error(f"Error: {e}")
-        import traceback
-        traceback.print_exc()
+        logger.exception(f"Error: {e}")
 
 if __name__ == "__main__":
     main()
\ No newline at end of file
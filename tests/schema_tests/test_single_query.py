@@ -8,11 +8,12 @@ work correctly.
 
 import os
 import logging
-import json
 import time
 from schema.manager import SchemaManager
+from schema.core.schema_loader import cached_schema_loader
 from agents.query_decomposition import QueryDecompositionAgent
-from scripts.client import get_llm_client
+from scripts.client import get_llm_client, warm_up_llm_client
+from tests.result_utils import dump_results
 
 # Set up logging
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(name)s - %(levelname)s - %(message)s')
@@ -32,13 +33,17 @@ def main():
         
         llm_client = get_llm_client()
         
+        # Connect to the API while the schema loads, the agents share this client
+        warm_up_llm_client(llm_client)
+        
         # Create schema manager with the client
         logger.info("Creating schema manager with LLM client...")
         schema_manager = SchemaManager(llm_client=llm_client)
         
         # Initial schema load
         logger.info("Loading schema...")
-        schema = schema_manager.get_schema()
+        schema = cached_schema_loader(schema_manager.schema_loader)
+        schema_manager.schema_cache.set('schema', schema)
         
         # Create query decomposition agent
         logger.info("Creating query decomposition agent...")
@@ -75,8 +80,7 @@ def main():
             logger.info(f"   {cypher}")
         
         # Save the result to file
-        with open('single_query_result.json', 'w') as f:
-            json.dump(result, f, indent=2)
+        dump_results('single_query_result.json', result)
         logger.info("Result saved to single_query_result.json")
         
         # Log thought process
@@ -85,9 +89,7 @@ def main():
             logger.info(f"Thought process: {thought_process[:200]}...")
         
     except Exception as e:
-        logger.error(f"Error: {e}")
-        import traceback
-        traceback.print_exc()
+        logger.exception(f"Error: {e}")
 
 if __name__ == "__main__":
     main()
\ No newline at end of file
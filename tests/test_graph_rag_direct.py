@@ -13,20 +13,21 @@ as they are intended to be used.
 """
 
 import os
-import json
+import asyncio
 import logging
 import sys
 import time
 from typing import Dict, Any, List
 
 # Fix import paths when running from any location
-import sys
-import os
 # Add the project root to the path
 sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../../../')))
+# The shared result helpers are imported from this project's tests package
+ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+if ROOT not in sys.path:
+    sys.path.insert(0, ROOT)
 
-from agentic_workflow.graph_rag.agents.rag_orchestrator import GraphRAGAgent
-from agentic_workflow.graph_rag.schema.schema_manager import schema_manager
+from tests.result_utils import dump_results, _preview
 
 # Configure logging
 logging.basicConfig(
@@ -35,13 +36,39 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
-def test_graph_rag_with_questions(questions: List[str], output_file: str = "test_graph_rag_results.json"):
+async def _gather_bounded(agent, questions: List[str], concurrency: int):
+    """Answer the questions concurrently, at most `concurrency` at a time, returning (result, seconds) pairs in order."""
+    semaphore = asyncio.Semaphore(max(1, concurrency))
+    
+    async def run_one(question):
+        async with semaphore:
+            start_time = time.time()
+            result = await agent.aprocess_question(question)
+            return result, time.time() - start_time
+    
+    # Repeated questions are processed once and their result is shared
+    unique = list(dict.fromkeys(question.strip() for question in questions))
+    if not unique:
+        return []
+    if len(unique) < len(questions):
+        logger.info(f"Processing {len(unique)} unique questions out of {len(questions)}")
+    
+    # Run the first question on its own so the shared prompt prefix (system prompt,
+    # schema and examples) is cached by the LLM provider before the fan-out
+    first = await run_one(unique[0])
+    rest = await asyncio.gather(*[run_one(question) for question in unique[1:]])
+    by_question = dict(zip(unique, [first] + list(rest)))
+    return [by_question[question.strip()] for question in questions]
+
+def test_graph_rag_with_questions(questions: List[str], output_file: str = "test_graph_rag_results.json",
+                                  concurrency: int = 4):
     """
     Test the Graph RAG agent with multiple questions and save results.
     
     Args:
         questions: List of questions to test
         output_file: File to save the results
+        concurrency: Maximum number of questions processed at once
     """
     # Set environment variables if needed
     if not os.getenv("NEO4J_URI"):
@@ -49,29 +76,36 @@ def test_graph_rag_with_questions(questions: List[str], output_file: str = "test
         os.environ["NEO4J_USER"] = "neo4j"
         os.environ["NEO4J_PASSWORD"] = "Rathum12!"
     
-    logger.info(f"Testing Graph RAG with {len(questions)} questions")
+    # Imported here so that collecting this module does not load the agents,
+    # the database driver and the LLM client
+    from agentic_workflow.graph_rag.agents.rag_orchestrator import GraphRAGAgent
+    from agentic_workflow.graph_rag.schema.schema_manager import schema_manager
     
-    # Initialize the Graph RAG agent
-    agent = GraphRAGAgent(preload_schema=True)
+    logger.info(f"Testing Graph RAG with {len(questions)} questions")
     
-    # Get the schema to verify connectivity
+    # Get the schema once, also verifying connectivity
     schema = schema_manager.get_schema()
     logger.info(f"Connected to database. Schema has {len(schema.get('node_types', {}))} node types " 
                 f"and {len(schema.get('relationship_types', {}))} relationship types")
     
+    # Initialize the Graph RAG agent with that schema so no question reloads it
+    agent = GraphRAGAgent(preload_schema=False, schema=schema)
+    
     results = []
     
-    # Process each question
-    for idx, question in enumerate(questions, 1):
-        logger.info(f"\n[{idx}/{len(questions)}] Testing question: {question}")
-        
-        # Process the question through the full RAG workflow
-        start_time = time.time()
-        result = agent.process_question(question)
-        end_time = time.time()
-        processing_time = end_time - start_time
-        
-        logger.info(f"Processing time: {processing_time:.2f} seconds")
+    # Process the questions through the full RAG workflow concurrently
+    start_time = time.time()
+    timed_results = asyncio.run(_gather_bounded(agent, questions, concurrency))
+    logger.info(f"Processed {len(questions)} questions in {time.time() - start_time:.2f} seconds "
+                f"(concurrency {concurrency})")
+    
+    # Cypher text and sample rows are only formatted when debug logging is enabled
+    verbose = logger.isEnabledFor(logging.DEBUG)
+    
+    for idx, (question, (result, processing_time)) in enumerate(zip(questions, timed_results), 1):
+        # Collect the report for this question and log it in a single call
+        lines = [f"\n[{idx}/{len(questions)}] Testing question: {question}",
+                 f"Processing time: {processing_time:.2f} seconds"]
         
         # Record workflow data for analysis
         workflow_data = {
@@ -89,7 +123,7 @@ def test_graph_rag_with_questions(questions: List[str], output_file: str = "test
         results.append(workflow_data)
         
         # Display the query plan
-        logger.info("=== QUERY PLAN ===")
+        lines.append("=== QUERY PLAN ===")
         query_plan = []
         
         # Extract query plan from LLM decomposition if available
@@ -99,28 +133,30 @@ def test_graph_rag_with_questions(questions: List[str], output_file: str = "test
             query_plan = result.get('query_plan', [])
             
         for i, query in enumerate(query_plan, 1):
-            logger.info(f"Query {i}: {query.get('purpose')}")
-            logger.info(f"Cypher: {query.get('cypher')}")
+            lines.append(f"Query {i}: {query.get('purpose')}")
+            if verbose:
+                lines.append(f"Cypher: {query.get('cypher')}")
         
         # Display the retrieved context
-        logger.info("\n=== RETRIEVED CONTEXT ===")
+        lines.append("\n=== RETRIEVED CONTEXT ===")
         retrieved_context = result.get('retrieved_context', [])
         for i, context in enumerate(retrieved_context, 1):
-            logger.info(f"Context {i}: {context.get('purpose')}")
-            logger.info(f"Result count: {context.get('result_count', 0)}")
-            if context.get('result') and len(context.get('result', [])) > 0:
-                sample = context.get('result')[0]
-                logger.info(f"Sample result: {sample}")
+            lines.append(f"Context {i}: {context.get('purpose')}")
+            lines.append(f"Result count: {context.get('result_count', 0)}")
+            if verbose:
+                for sample in _preview(context.get('result')):
+                    lines.append(f"Sample result: {sample}")
         
         # Display the answer
-        logger.info("\n=== ANSWER ===")
-        logger.info(f"Answer: {result.get('answer', '')}")
-        logger.info(f"Confidence: {result.get('confidence', 0.0)}")
-        logger.info("-" * 80)
+        lines.append("\n=== ANSWER ===")
+        lines.append(f"Answer: {result.get('answer', '')}")
+        lines.append(f"Confidence: {result.get('confidence', 0.0)}")
+        lines.append("-" * 80)
+        
+        logger.info("\n".join(lines))
     
     # Save all test results
-    with open(output_file, "w") as f:
-        json.dump(results, f, indent=2)
+    dump_results(output_file, results)
     
     logger.info(f"All test results saved to {output_file}")
     return results
@@ -11,18 +11,19 @@ This helps identify if the issue is in the retrieval phase or elsewhere in the R
 """
 
 import os
-import json
 import logging
 import sys
 import time
 
 # Fix import paths when running from any location
-import sys
-import os
 # Add the project root to the path
 sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../../../')))
+# The shared result helpers are imported from this project's tests package
+ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+if ROOT not in sys.path:
+    sys.path.insert(0, ROOT)
 
-from agentic_workflow.graph_rag.agents.graph_retriever import GraphRetrieverAgent
+from tests.result_utils import dump_results, _preview
 
 # Configure logging
 logging.basicConfig(
@@ -45,12 +46,19 @@ def test_graph_retrieval(test_queries, output_file="graph_retrieval_results.json
         os.environ["NEO4J_USER"] = "neo4j"
         os.environ["NEO4J_PASSWORD"] = "Rathum12!"
     
+    # Imported here so that collecting this module does not load the agents,
+    # the database driver and the LLM client
+    from agentic_workflow.graph_rag.agents.graph_retriever import GraphRetrieverAgent
+    
     # Initialize the graph retriever agent
     logger.info("Initializing GraphRetrieverAgent...")
     agent = GraphRetrieverAgent()
     
     results = []
     
+    # Cypher text and sample rows are only formatted when debug logging is enabled
+    verbose = logger.isEnabledFor(logging.DEBUG)
+    
     # Process each query
     for idx, query_item in enumerate(test_queries, 1):
         question = query_item.get('question', f'Test query {idx}')
@@ -87,8 +95,8 @@ def test_graph_retrieval(test_queries, output_file="graph_retrieval_results.json
         
         results.append(retrieval_data)
         
-        # Display the retrieved context
-        logger.info("=== RETRIEVAL RESULTS ===")
+        # Collect the retrieved context and log it in a single call
+        lines = ["=== RETRIEVAL RESULTS ==="]
         retrieved_context = result.get('retrieved_context', [])
             
         for i, context_item in enumerate(retrieved_context, 1):
@@ -97,23 +105,23 @@ def test_graph_retrieval(test_queries, output_file="graph_retrieval_results.json
             result_count = context_item.get('result_count', 0)
             error = context_item.get('error', None)
             
-            logger.info(f"Result {i}: {purpose}")
-            logger.info(f"Cypher: {cypher}")
-            logger.info(f"Result count: {result_count}")
+            lines.append(f"Result {i}: {purpose}")
+            if verbose:
+                lines.append(f"Cypher: {cypher}")
+            lines.append(f"Result count: {result_count}")
             
             if error:
+                # Errors keep their own log record so they are reported at error level
                 logger.error(f"Error: {error}")
-            else:
-                if result_count > 0:
-                    context_result = context_item.get('result', [])
-                    sample = context_result[0] if context_result else 'No results'
-                    logger.info(f"Sample result: {sample}")
+            elif verbose and result_count > 0:
+                for sample in _preview(context_item.get('result')):
+                    lines.append(f"Sample result: {sample}")
         
-        logger.info("-" * 80)
+        lines.append("-" * 80)
+        logger.info("\n".join(lines))
     
     # Save all results
-    with open(output_file, "w") as f:
-        json.dump(results, f, indent=2)
+    dump_results(output_file, results)
     
     logger.info(f"Test results saved to {output_file}")
     return results
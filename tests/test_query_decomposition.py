@@ -11,19 +11,20 @@ This helps identify if the issue is in the decomposition phase or elsewhere in t
 """
 
 import os
-import json
+import asyncio
 import logging
 import sys
 import time
 
 # Fix import paths when running from any location
-import sys
-import os
 # Add the project root to the path
 sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../../../')))
+# The shared result helpers are imported from this project's tests package
+ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+if ROOT not in sys.path:
+    sys.path.insert(0, ROOT)
 
-from agentic_workflow.graph_rag.agents.query_decomposition import QueryDecompositionAgent
-from agentic_workflow.graph_rag.schema.schema_manager import schema_manager
+from tests.result_utils import dump_results
 
 # Configure logging
 logging.basicConfig(
@@ -32,13 +33,39 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
-def test_query_decomposition(questions, output_file="query_decomposition_results.json"):
+async def _gather_bounded(agent, questions, concurrency):
+    """Decompose the questions concurrently, at most `concurrency` at a time, returning (result, seconds) pairs in order."""
+    semaphore = asyncio.Semaphore(max(1, concurrency))
+    
+    async def run_one(question):
+        async with semaphore:
+            start_time = time.time()
+            # The agent is synchronous, run it in a worker thread
+            result = await asyncio.to_thread(agent.process, {"question": question})
+            return result, time.time() - start_time
+    
+    # Repeated questions are processed once and their result is shared
+    unique = list(dict.fromkeys(question.strip() for question in questions))
+    if not unique:
+        return []
+    if len(unique) < len(questions):
+        logger.info(f"Processing {len(unique)} unique questions out of {len(questions)}")
+    
+    # Run the first question on its own so the shared prompt prefix (system prompt,
+    # schema and examples) is cached by the LLM provider before the fan-out
+    first = await run_one(unique[0])
+    rest = await asyncio.gather(*[run_one(question) for question in unique[1:]])
+    by_question = dict(zip(unique, [first] + list(rest)))
+    return [by_question[question.strip()] for question in questions]
+
+def test_query_decomposition(questions, output_file="query_decomposition_results.json", concurrency=4):
     """
     Test the query decomposition agent with various questions.
     
     Args:
         questions: List of questions to test
         output_file: File to save the results
+        concurrency: Maximum number of questions processed at once
     """
     # Set environment variables if needed
     if not os.getenv("NEO4J_URI"):
@@ -46,6 +73,11 @@ def test_query_decomposition(questions, output_file="query_decomposition_results
         os.environ["NEO4J_USER"] = "neo4j"
         os.environ["NEO4J_PASSWORD"] = "Rathum12!"
     
+    # Imported here so that collecting this module does not load the agents,
+    # the database driver and the LLM client
+    from agentic_workflow.graph_rag.agents.query_decomposition import QueryDecompositionAgent
+    from agentic_workflow.graph_rag.schema.schema_manager import schema_manager
+    
     # First verify that we can get the schema
     logger.info("Retrieving schema from database...")
     schema = schema_manager.get_schema()
@@ -66,19 +98,14 @@ def test_query_decomposition(questions, output_file="query_decomposition_results
     
     results = []
     
-    # Process each question
-    for idx, question in enumerate(questions, 1):
+    # Process the questions concurrently
+    start_time = time.time()
+    timed_results = asyncio.run(_gather_bounded(agent, questions, concurrency))
+    logger.info(f"Decomposed {len(questions)} questions in {time.time() - start_time:.2f} seconds "
+                f"(concurrency {concurrency})")
+    
+    for idx, (question, (result, processing_time)) in enumerate(zip(questions, timed_results), 1):
         logger.info(f"\n[{idx}/{len(questions)}] Testing question decomposition: {question}")
-        
-        # Create input data for the agent
-        input_data = {"question": question}
-        
-        # Process the question
-        start_time = time.time()
-        result = agent.process(input_data)
-        end_time = time.time()
-        processing_time = end_time - start_time
-        
         logger.info(f"Query decomposition completed in {processing_time:.2f} seconds")
         
         # Record result
@@ -104,8 +131,7 @@ def test_query_decomposition(questions, output_file="query_decomposition_results
         logger.info("-" * 80)
     
     # Save all results
-    with open(output_file, "w") as f:
-        json.dump(results, f, indent=2)
+    dump_results(output_file, results)
     
     logger.info(f"Test results saved to {output_file}")
     return results
@@ -21,9 +21,11 @@ logger = logging.getLogger(__name__)
 class TestQueryValidator(unittest.TestCase):
     """Test suite for the QueryValidator."""
     
-    def setUp(self):
+    @classmethod
+    def setUpClass(cls):
         """Set up the test environment."""
-        self.validator = QueryValidator()
+        # validate_and_fix does not mutate the validator, so all tests share one
+        cls.validator = QueryValidator()
     
     def test_multiple_where_clauses(self):
         """Test fixing multiple WHERE clauses."""
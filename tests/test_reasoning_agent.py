@@ -8,21 +8,27 @@ This script isolates and tests the ReasoningAgent to verify that it correctly:
 3. Accurately processes different types of context data
 
 This helps identify if the issue is in the reasoning phase or elsewhere in the RAG pipeline.
+By default the LLM is mocked with a canned response; set RUN_LIVE_LLM=1 to also run
+the contexts against the live model.
 """
 
 import os
 import json
 import logging
 import sys
+import tempfile
 import time
+import unittest
+from unittest.mock import MagicMock
 
-# Fix import paths when running from any location
-import sys
-import os
-# Add the project root to the path
-sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../../../')))
+# Add the project root to the path when run as a script, under pytest
+# conftest.py has already done this
+ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+if ROOT not in sys.path:
+    sys.path.insert(0, ROOT)
 
-from agentic_workflow.graph_rag.agents.reasoning import ReasoningAgent
+from tests.result_utils import dump_results
+from agents.reasoning import ReasoningAgent
 
 # Configure logging
 logging.basicConfig(
@@ -31,50 +37,59 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
-def test_reasoning_agent(test_contexts, output_file="reasoning_test_results.json"):
+def run_reasoning_agent(test_contexts, output_file="reasoning_test_results.json", agent=None):
     """
     Test the reasoning agent with various context scenarios.
     
     Args:
         test_contexts: List of test context dictionaries
         output_file: File to save the results
+        agent: Reasoning agent to test (defaults to a new ReasoningAgent)
     """
-    # Initialize the reasoning agent
-    logger.info("Initializing ReasoningAgent...")
-    agent = ReasoningAgent()
-    
     results = []
     
-    # Process each test context
+    # Create input data for each context that has something to reason over
+    inputs = []
     for idx, context_item in enumerate(test_contexts, 1):
         question = context_item.get('question', f'Test context {idx}')
         retrieved_context = context_item.get('retrieved_context', [])
         
-        logger.info(f"\n[{idx}/{len(test_contexts)}] Testing reasoning for: {question}")
-        
         if not retrieved_context:
-            logger.warning("No context provided, skipping")
+            logger.warning(f"No context provided for: {question}, skipping")
             continue
         
-        # Create input data for the agent
-        input_data = {
+        inputs.append({
             "original_question": question,
             "retrieved_context": retrieved_context,
             "thought_process": context_item.get('thought_process', '')
-        }
-        
-        # Process the context
-        start_time = time.time()
-        result = agent.process(input_data)
-        end_time = time.time()
-        processing_time = end_time - start_time
+        })
+    
+    if not inputs:
+        logger.warning("No test contexts with retrieved context to reason over")
+        return results
+    
+    # Initialize the reasoning agent only once there is something to test
+    if agent is None:
+        logger.info("Initializing ReasoningAgent...")
+        agent = ReasoningAgent()
+    
+    # Process all contexts in one batch, the LLM calls run concurrently
+    logger.info(f"Testing reasoning for {len(inputs)} contexts")
+    start_time = time.perf_counter()
+    batch_results = agent.process_batch(inputs)
+    batch_processing_time = time.perf_counter() - start_time
+    
+    logger.info(f"Reasoning completed in {batch_processing_time:.2f} seconds")
+    
+    for idx, (input_data, result) in enumerate(zip(inputs, batch_results), 1):
+        question = input_data['original_question']
+        retrieved_context = input_data['retrieved_context']
         
-        logger.info(f"Reasoning completed in {processing_time:.2f} seconds")
+        logger.info(f"\n[{idx}/{len(inputs)}] Reasoning for: {question}")
         
         # Record result
         reasoning_data = {
             'question': question,
-            'processing_time': processing_time,
             'retrieved_context': retrieved_context,
             'answer': result.get('answer', ''),
             'reasoning': result.get('reasoning', ''),
@@ -99,100 +114,176 @@ def test_reasoning_agent(test_contexts, output_file="reasoning_test_results.json
                 
         logger.info("-" * 80)
     
-    # Save all results
-    with open(output_file, "w") as f:
-        json.dump(results, f, indent=2)
+    # Identical prompts from earlier runs are answered from the on-disk LLM cache
+    cache = getattr(agent.llm_client, 'cache', None)
+    if cache is not None:
+        logger.info(f"LLM cache: {cache.stats['hits']} hits, {cache.stats['misses']} misses")
+    
+    # Save all results, the contexts are reasoned over concurrently so only the
+    # time of the whole batch is known
+    dump_results(output_file, {'batch_processing_time': batch_processing_time, 'results': results})
     
     logger.info(f"Test results saved to {output_file}")
     return results
 
-if __name__ == "__main__":
-    # Define test contexts with different scenarios
-    test_contexts = [
-        # Simple query with results
-        {
-            "question": "What compliance areas exist in the system?",
-            "retrieved_context": [
-                {
-                    "purpose": "Retrieve all compliance areas",
-                    "cypher": "MATCH (ca:ComplianceArea) RETURN ca.name AS name",
-                    "result": [
-                        {"name": "Safety"},
-                        {"name": "Environmental"},
-                        {"name": "Labeling"},
-                        {"name": "Children's Products"}
-                    ],
-                    "result_count": 4
-                }
-            ]
-        },
-        # Relationship query with results
-        {
-            "question": "What regulations apply to Apparel products?",
-            "retrieved_context": [
-                {
-                    "purpose": "Find regulations for Apparel products",
-                    "cypher": "MATCH (pc:ProductCategory {name: 'Apparel'})-[:HAS_COMPLIANCE_AREA]->(ca:ComplianceArea)-[:HAS_REGULATION]->(reg:Regulation) RETURN ca.name AS area, reg.name AS regulation, reg.citation AS citation",
-                    "result": [
-                        {"area": "Safety", "regulation": "Flammability Standard", "citation": "16 CFR 1610"},
-                        {"area": "Labeling", "regulation": "Textile Fiber Products Identification Act", "citation": "15 U.S.C. 70"}
-                    ],
-                    "result_count": 2
-                }
-            ]
-        },
-        # Query with no results
-        {
-            "question": "What restrictions apply to electronic toys?",
-            "retrieved_context": [
-                {
-                    "purpose": "Find restrictions for electronic toys",
-                    "cypher": "MATCH (pc:ProductCategory {name: 'Toys'})-[:HAS_SUBCATEGORY]->(sc:ProductSubcategory {name: 'Electronic Toys'})-[:HAS_RESTRICTION]->(r:Restriction) RETURN r.name AS restriction, r.description AS description",
-                    "result": [],
-                    "result_count": 0
-                }
-            ]
-        },
-        # Query with error
-        {
-            "question": "What hazardous materials are regulated in children's products?",
-            "retrieved_context": [
-                {
-                    "purpose": "Find hazardous materials regulations for children's products",
-                    "cypher": "MATCH (pc:ProductCategory)-[:HAS_COMPLIANCE_AREA]->(:ComplianceArea {name: 'Children\\'s Products'})-[:REGULATES]->(hm:HazardousMaterial) RETURN pc.name AS product, hm.name AS hazardous_material, hm.limit AS limit",
-                    "error": "Relationship type REGULATES does not exist in the database",
-                    "result": [],
-                    "result_count": 0
-                }
-            ]
-        },
-        # Multiple query results
-        {
-            "question": "Tell me about product categories and their compliance areas",
-            "retrieved_context": [
-                {
-                    "purpose": "List all product categories",
-                    "cypher": "MATCH (pc:ProductCategory) RETURN pc.name AS name",
-                    "result": [
-                        {"name": "Apparel"},
-                        {"name": "Toys"},
-                        {"name": "Furniture"},
-                        {"name": "Electronics"}
-                    ],
-                    "result_count": 4
-                },
-                {
-                    "purpose": "Get compliance areas for each product category",
-                    "cypher": "MATCH (pc:ProductCategory)-[:HAS_COMPLIANCE_AREA]->(ca:ComplianceArea) RETURN pc.name AS product, collect(ca.name) AS compliance_areas",
-                    "result": [
-                        {"product": "Apparel", "compliance_areas": ["Safety", "Labeling"]},
-                        {"product": "Toys", "compliance_areas": ["Safety", "Children's Products"]}
-                    ],
-                    "result_count": 2
-                }
-            ]
-        }
-    ]
+# Test contexts with different scenarios
+TEST_CONTEXTS = [
+    # Simple query with results
+    {
+        "question": "What compliance areas exist in the system?",
+        "retrieved_context": [
+            {
+                "purpose": "Retrieve all compliance areas",
+                "cypher": "MATCH (ca:ComplianceArea) RETURN ca.name AS name",
+                "result": [
+                    {"name": "Safety"},
+                    {"name": "Environmental"},
+                    {"name": "Labeling"},
+                    {"name": "Children's Products"}
+                ],
+                "result_count": 4
+            }
+        ]
+    },
+    # Relationship query with results
+    {
+        "question": "What regulations apply to Apparel products?",
+        "retrieved_context": [
+            {
+                "purpose": "Find regulations for Apparel products",
+                "cypher": "MATCH (pc:ProductCategory {name: 'Apparel'})-[:HAS_COMPLIANCE_AREA]->(ca:ComplianceArea)-[:HAS_REGULATION]->(reg:Regulation) RETURN ca.name AS area, reg.name AS regulation, reg.citation AS citation",
+                "result": [
+                    {"area": "Safety", "regulation": "Flammability Standard", "citation": "16 CFR 1610"},
+                    {"area": "Labeling", "regulation": "Textile Fiber Products Identification Act", "citation": "15 U.S.C. 70"}
+                ],
+                "result_count": 2
+            }
+        ]
+    },
+    # Query with no results
+    {
+        "question": "What restrictions apply to electronic toys?",
+        "retrieved_context": [
+            {
+                "purpose": "Find restrictions for electronic toys",
+                "cypher": "MATCH (pc:ProductCategory {name: 'Toys'})-[:HAS_SUBCATEGORY]->(sc:ProductSubcategory {name: 'Electronic Toys'})-[:HAS_RESTRICTION]->(r:Restriction) RETURN r.name AS restriction, r.description AS description",
+                "result": [],
+                "result_count": 0
+            }
+        ]
+    },
+    # Query with error
+    {
+        "question": "What hazardous materials are regulated in children's products?",
+        "retrieved_context": [
+            {
+                "purpose": "Find hazardous materials regulations for children's products",
+                "cypher": "MATCH (pc:ProductCategory)-[:HAS_COMPLIANCE_AREA]->(:ComplianceArea {name: 'Children\\'s Products'})-[:REGULATES]->(hm:HazardousMaterial) RETURN pc.name AS product, hm.name AS hazardous_material, hm.limit AS limit",
+                "error": "Relationship type REGULATES does not exist in the database",
+                "result": [],
+                "result_count": 0
+            }
+        ]
+    },
+    # Multiple query results
+    {
+        "question": "Tell me about product categories and their compliance areas",
+        "retrieved_context": [
+            {
+                "purpose": "List all product categories",
+                "cypher": "MATCH (pc:ProductCategory) RETURN pc.name AS name",
+                "result": [
+                    {"name": "Apparel"},
+                    {"name": "Toys"},
+                    {"name": "Furniture"},
+                    {"name": "Electronics"}
+                ],
+                "result_count": 4
+            },
+            {
+                "purpose": "Get compliance areas for each product category",
+                "cypher": "MATCH (pc:ProductCategory)-[:HAS_COMPLIANCE_AREA]->(ca:ComplianceArea) RETURN pc.name AS product, collect(ca.name) AS compliance_areas",
+                "result": [
+                    {"product": "Apparel", "compliance_areas": ["Safety", "Labeling"]},
+                    {"product": "Toys", "compliance_areas": ["Safety", "Children's Products"]}
+                ],
+                "result_count": 2
+            }
+        ]
+    }
+]
+
+# Canned reply of the mocked LLM
+MOCK_REASONING = {
+    "answer": "The system covers Safety, Environmental, Labeling and Children's Products compliance areas.",
+    "reasoning": "The retrieved compliance areas list these four names.",
+    "evidence": ["Retrieve all compliance areas returned 4 results"],
+    "confidence": 0.9
+}
+
+def _mock_llm_client(reply):
+    """Build a stand-in for the OpenAI client that always returns the given JSON reply."""
+    message = MagicMock()
+    message.content = json.dumps(reply)
+    client = MagicMock(spec=['chat'])
+    client.chat.completions.create.return_value.choices = [MagicMock(message=message)]
+    return client
+
+class TestReasoningAgent(unittest.TestCase):
+    """Test the reasoning agent against a mocked LLM."""
+    
+    def setUp(self):
+        """Set up an agent whose LLM client is mocked."""
+        self.agent = ReasoningAgent()
+        self.agent.llm_client = _mock_llm_client(MOCK_REASONING)
+    
+    def test_contexts(self):
+        """Test that every context with retrieved data is answered from the LLM reply."""
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            output_file = os.path.join(tmp_dir, "results.json")
+            results = run_reasoning_agent(TEST_CONTEXTS, output_file, agent=self.agent)
+            with open(output_file) as f:
+                saved = json.load(f)
+        
+        self.assertEqual(len(results), len(TEST_CONTEXTS))
+        self.assertEqual(saved['results'], results)
+        self.assertIn('batch_processing_time', saved)
+        for result in results:
+            self.assertEqual(result['answer'], MOCK_REASONING['answer'])
+            self.assertEqual(result['confidence'], MOCK_REASONING['confidence'])
+        self.assertEqual(self.agent.llm_client.chat.completions.create.call_count, len(TEST_CONTEXTS))
+    
+    def test_error_in_context_is_passed_to_llm(self):
+        """Test that query errors are included in the prompt."""
+        self.agent.process(TEST_CONTEXTS[3])
+        
+        prompt = self.agent.llm_client.chat.completions.create.call_args.kwargs['messages'][1]['content']
+        self.assertIn("Relationship type REGULATES does not exist", prompt)
     
-    # Run the test
-    test_reasoning_agent(test_contexts)
\ No newline at end of file
+    def test_prompts_share_prefix(self):
+        """Test that only the end of the prompt differs between questions, so it can be prefix-cached."""
+        self.agent.process_batch(TEST_CONTEXTS[:2])
+        
+        messages = [call.kwargs['messages'] for call in self.agent.llm_client.chat.completions.create.call_args_list]
+        self.assertEqual(messages[0][0], messages[1][0])
+        prefix = os.path.commonprefix([messages[0][1]['content'], messages[1][1]['content']])
+        self.assertIn("GRAPH CONTEXT:\n", prefix)
+    
+    def test_no_context(self):
+        """Test that the LLM is not called without retrieved context."""
+        result = self.agent.process({"original_question": "Anything?", "retrieved_context": []})
+        
+        self.assertEqual(result['confidence'], 0.0)
+        self.agent.llm_client.chat.completions.create.assert_not_called()
+
+@unittest.skipUnless(os.environ.get("RUN_LIVE_LLM") == "1", "set RUN_LIVE_LLM=1 to call the live model")
+class TestReasoningAgentLive(unittest.TestCase):
+    """Test the reasoning agent against the live LLM."""
+    
+    def test_contexts(self):
+        """Run all test contexts and save the results."""
+        results = run_reasoning_agent(TEST_CONTEXTS)
+        self.assertEqual(len(results), len(TEST_CONTEXTS))
+
+if __name__ == "__main__":
+    unittest.main()
@@ -21,6 +21,18 @@ from ..config import get_config
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+# Result returned by the mocked workflow
+CANNED_RESULT = {
+    "answer": "Test answer",
+    "reasoning": "Test reasoning",
+    "evidence": ["Evidence 1"],
+    "confidence": 0.9
+}
+
+def _make_pipeline_mock():
+    """Mock of a workflow run returning a fresh copy of CANNED_RESULT, which callers may modify."""
+    return MagicMock(side_effect=lambda *args, **kwargs: dict(CANNED_RESULT))
+
 class TestAgentImpl(Agent):
     """Implementation of Agent base class for testing."""
     
@@ -116,22 +128,34 @@ class TestGraphRAGAgent(unittest.TestCase):
         # Verify schema was preloaded
         mock_schema_manager.get_schema.assert_called_once()
     
-    @patch('agentic_workflow.graph_rag.agents.rag_orchestrator.schema_manager')
-    def test_execute(self, mock_schema_manager):
-        """Test that execute method works correctly."""
+    @classmethod
+    def setUpClass(cls):
+        """Create one agent shared by the tests that do not check construction."""
         # Mock schema_manager.get_schema to avoid actual DB calls
-        mock_schema_manager.get_schema.return_value = {"nodes": [], "relationships": []}
+        cls._schema_manager_patcher = patch('agentic_workflow.graph_rag.agents.rag_orchestrator.schema_manager')
+        cls.mock_schema_manager = cls._schema_manager_patcher.start()
+        cls.mock_schema_manager.get_schema.return_value = {"nodes": [], "relationships": []}
         
-        # Create agent with mocked sub-agents
-        agent = GraphRAGAgent(preload_schema=False)
+        # Cached answers would leak between tests
+        cls.agent = GraphRAGAgent(config_override={'semantic_cache_enabled': False}, preload_schema=False)
+        cls._run_pipeline = cls.agent.workflow.run_pipeline
+    
+    @classmethod
+    def tearDownClass(cls):
+        cls._schema_manager_patcher.stop()
+    
+    def setUp(self):
+        """Undo the mocks a previous test put on the shared agent."""
+        self.mock_schema_manager.reset_mock()
+        self.agent.__dict__.pop('run', None)
+        self.agent.workflow.run_pipeline = self._run_pipeline
+    
+    def test_execute(self):
+        """Test that execute method works correctly."""
+        agent = self.agent
         
         # Replace workflow's run_pipeline with a mock
-        agent.workflow.run_pipeline = MagicMock(return_value={
-            "answer": "Test answer",
-            "reasoning": "Test reasoning",
-            "evidence": ["Evidence 1"],
-            "confidence": 0.9
-        })
+        agent.workflow.run_pipeline = _make_pipeline_mock()
         
         # Call execute
         result = agent.execute({"question": "test question"}, {})
@@ -141,20 +165,11 @@ class TestGraphRAGAgent(unittest.TestCase):
         self.assertEqual(result["answer"], "Test answer")
         self.assertEqual(result["confidence"], 0.9)
     
-    @patch('agentic_workflow.graph_rag.agents.rag_orchestrator.schema_manager')
-    def test_process_question(self, mock_schema_manager):
+    def test_process_question(self):
         """Test that process_question method works correctly."""
-        # Mock schema_manager.get_schema to avoid actual DB calls
-        mock_schema_manager.get_schema.return_value = {"nodes": [], "relationships": []}
-        
-        # Create agent with mocked run method
-        agent = GraphRAGAgent(preload_schema=False)
-        agent.run = MagicMock(return_value={
-            "answer": "Test answer",
-            "reasoning": "Test reasoning",
-            "evidence": ["Evidence 1"],
-            "confidence": 0.9
-        })
+        # Mock the run method
+        agent = self.agent
+        agent.run = _make_pipeline_mock()
         
         # Call process_question
         result = agent.process_question("test question")
@@ -166,20 +181,13 @@ class TestGraphRAGAgent(unittest.TestCase):
         self.assertEqual(result["answer"], "Test answer")
         self.assertIn("processing_time", result)
     
-    @patch('agentic_workflow.graph_rag.agents.rag_orchestrator.schema_manager')
-    def test_refresh_schema(self, mock_schema_manager):
+    def test_refresh_schema(self):
         """Test that refresh_schema method works correctly."""
-        # Mock schema_manager.get_schema
-        mock_schema_manager.get_schema.return_value = {"nodes": [], "relationships": []}
-        
-        # Create agent
-        agent = GraphRAGAgent(preload_schema=False)
-        
         # Call refresh_schema
-        result = agent.refresh_schema()
+        result = self.agent.refresh_schema()
         
         # Verify schema_manager.get_schema was called with force_refresh=True
-        mock_schema_manager.get_schema.assert_called_with(force_refresh=True)
+        self.mock_schema_manager.get_schema.assert_called_with(force_refresh=True)
         self.assertTrue(result)
     
     def test_config(self):
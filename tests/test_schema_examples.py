@@ -10,8 +10,10 @@ This test script exercises the new modular components:
 
 import os
 import sys
+import copy
 import logging
 import unittest
+from types import SimpleNamespace
 from unittest.mock import MagicMock, patch
 import json
 
@@ -19,8 +21,11 @@ import json
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
-# Add the project root to the path so we can import the modules
-sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+# Add the project root to the path so we can import the modules however the
+# tests are run, under pytest conftest.py has usually done this already
+ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+if ROOT not in sys.path:
+    sys.path.insert(0, ROOT)
 
 # Now import the modules we need
 from schema.core.schema_loader import Neo4jSchemaLoader
@@ -30,14 +35,67 @@ from examples.generators.pattern_generator import PatternExampleGenerator
 from examples.storage.example_repository import MemoryExampleRepository
 from prompts.prompt_builder import PromptBuilder
 from agents.query_decomposition import QueryDecompositionAgent
+from graph_db.graph_interface import GraphDatabaseInterface
+
+# Mock examples that might be generated
+MOCK_EXAMPLES = [
+    {
+        'question': 'What products are in the Electronics category?',
+        'query_plan': [
+            {
+                'purpose': 'Find products in the Electronics category',
+                'cypher': 'MATCH (p:Product)-[:BELONGS_TO]->(c:Category {name: "Electronics"}) RETURN p.name, p.price'
+            }
+        ],
+        'thought_process': 'This query finds all Product nodes that have a BELONGS_TO relationship to a Category node with name "Electronics"'
+    },
+    {
+        'question': 'Which regulations apply to Laptop products?',
+        'query_plan': [
+            {
+                'purpose': 'Find regulations for Laptop products',
+                'cypher': 'MATCH (p:Product {name: "Laptop"})-[r:REGULATED_BY]->(reg:Regulation) RETURN reg.name, reg.description, r.confidence'
+            }
+        ],
+        'thought_process': 'This query finds all Regulation nodes that have a REGULATED_BY relationship from a Product node with name "Laptop"'
+    }
+]
+
+# LLM replies, serialized once
+MOCK_QUERY_PLAN_JSON = json.dumps({
+    "query_plan": [
+        {
+            "purpose": "Find products regulated by Safety Standard 1",
+            "cypher": "MATCH (p:Product)-[r:REGULATED_BY]->(reg:Regulation {name: 'Safety Standard 1'}) RETURN p.name, p.category, r.confidence"
+        }
+    ],
+    "thought_process": "This query finds all Product nodes that have a REGULATED_BY relationship to a Regulation node with name 'Safety Standard 1'"
+})
+
+MOCK_SCHEMA_EXAMPLES_JSON = json.dumps({"examples": MOCK_EXAMPLES})
+
+def _llm_response(content):
+    """Build a chat completion carrying the given message content."""
+    return SimpleNamespace(choices=[SimpleNamespace(message=SimpleNamespace(content=content))])
+
+# Results of the schema loader's queries, in the order it runs them
+SCHEMA_LOADER_RESULTS = (
+    ({'label': 'Product', 'properties': ['id', 'name', 'category', 'price']},),
+    ({'type': 'BELONGS_TO', 'properties': ['since']},),
+    ({'source_label': 'Product', 'relationship': 'BELONGS_TO', 'target_label': 'Category'},),
+    ({'relationship_type': 'BELONGS_TO'},),
+    (),  # For the relationship connections query
+    ({'count': 100},)  # For the node count query
+)
 
 class TestSchemaExamples(unittest.TestCase):
     """Tests for the schema-aware example generation functionality."""
     
-    def setUp(self):
-        """Set up test fixtures."""
+    @classmethod
+    def setUpClass(cls):
+        """Set up test fixtures shared by all tests, which must not modify them."""
         # Create a mock schema
-        self.mock_schema = {
+        cls.mock_schema = {
             'node_types': {
                 'Product': ['id', 'name', 'category', 'price'],
                 'Category': ['id', 'name', 'description'],
@@ -65,7 +123,7 @@ class TestSchemaExamples(unittest.TestCase):
         }
         
         # Create a mock rich context
-        self.mock_rich_context = {
+        cls.mock_rich_context = {
             'node_examples': {
                 'Product': [
                     {'id': 'P001', 'name': 'Laptop', 'category': 'Electronics', 'price': 999.99},
@@ -103,46 +161,21 @@ class TestSchemaExamples(unittest.TestCase):
         }
         
         # Mock examples that might be generated
-        self.mock_examples = [
-            {
-                'question': 'What products are in the Electronics category?',
-                'query_plan': [
-                    {
-                        'purpose': 'Find products in the Electronics category',
-                        'cypher': 'MATCH (p:Product)-[:BELONGS_TO]->(c:Category {name: "Electronics"}) RETURN p.name, p.price'
-                    }
-                ],
-                'thought_process': 'This query finds all Product nodes that have a BELONGS_TO relationship to a Category node with name "Electronics"'
-            },
-            {
-                'question': 'Which regulations apply to Laptop products?',
-                'query_plan': [
-                    {
-                        'purpose': 'Find regulations for Laptop products',
-                        'cypher': 'MATCH (p:Product {name: "Laptop"})-[r:REGULATED_BY]->(reg:Regulation) RETURN reg.name, reg.description, r.confidence'
-                    }
-                ],
-                'thought_process': 'This query finds all Regulation nodes that have a REGULATED_BY relationship from a Product node with name "Laptop"'
-            }
-        ]
+        cls.mock_examples = MOCK_EXAMPLES
+        
+        # Prompt builder shared by the tests, it only caches the templates it loads
+        cls.prompt_builder = PromptBuilder()
     
     @patch('scripts.client.get_llm_client')
     def test_schema_loader(self, mock_get_llm_client):
         """Test the schema loader functionality."""
         # Create a mock DB factory
         mock_db_factory = MagicMock()
-        mock_db = MagicMock()
+        mock_db = MagicMock(spec=GraphDatabaseInterface)
         mock_db_factory.create_graph_database_strategy.return_value = mock_db
         
         # Set up mock query results
-        mock_db.execute_query.side_effect = [
-            [{'label': 'Product', 'properties': ['id', 'name', 'category', 'price']}],
-            [{'type': 'BELONGS_TO', 'properties': ['since']}],
-            [{'source_label': 'Product', 'relationship': 'BELONGS_TO', 'target_label': 'Category'}],
-            [{'relationship_type': 'BELONGS_TO'}],
-            [],  # For the relationship connections query
-            [{'count': 100}]  # For the node count query
-        ]
+        mock_db.execute_query.side_effect = SCHEMA_LOADER_RESULTS
         
         # Create schema loader
         schema_loader = Neo4jSchemaLoader(mock_db_factory)
@@ -159,6 +192,24 @@ class TestSchemaExamples(unittest.TestCase):
         mock_db.execute_query.assert_called()
         mock_db.close.assert_called()
     
+    def test_rich_context_node_examples(self):
+        """Test sampling node examples for node types in the format Neo4j reports them."""
+        mock_db_factory = MagicMock()
+        mock_db = MagicMock(spec=GraphDatabaseInterface)
+        mock_db.connect.return_value = True
+        mock_db.execute_queries.return_value = [[{'id': 'p1', 'name': 'Laptop'}]]
+        mock_db_factory.create_graph_database_strategy.return_value = mock_db
+        
+        schema = {'node_types': {':`Product`': ['id', 'name', 'embedding']}}
+        rich_context = Neo4jSchemaLoader(mock_db_factory).load_rich_context(schema, examples_per_type=3)
+        
+        (query, params), = mock_db.execute_queries.call_args[0][0]
+        self.assertIn('MATCH (n:`Product`)', query)
+        self.assertNotIn('embedding', query)
+        self.assertIn('LIMIT $limit', query)
+        self.assertEqual(params, {'limit': 3})
+        self.assertEqual(rich_context['node_examples'], {':`Product`': [{'id': 'p1', 'name': 'Laptop'}]})
+    
     def test_schema_cache(self):
         """Test the schema cache functionality."""
         # Create a memory cache
@@ -180,7 +231,7 @@ class TestSchemaExamples(unittest.TestCase):
         invalid_after_invalidate = cache.get('test_key')
         self.assertIsNone(invalid_after_invalidate)
     
-    @patch('examples.generators.pattern_generator.PatternExampleGenerator._generate_examples_for_pattern')
+    @patch('examples.generators.pattern_generator.PatternExampleGenerator._generate_examples_batch')
     def test_example_generator(self, mock_generate):
         """Test the example generator functionality."""
         # Set up the mock
@@ -200,11 +251,35 @@ class TestSchemaExamples(unittest.TestCase):
         self.assertEqual(len(examples), 2)
         self.assertEqual(examples[0]['question'], 'What products are in the Electronics category?')
         self.assertEqual(examples[1]['question'], 'Which regulations apply to Laptop products?')
+        
+        # Both patterns go to the LLM in a single batch
+        mock_generate.assert_called_once()
+        self.assertEqual(len(mock_generate.call_args[0][0]), 2)
+    
+    def test_example_generator_batch_response(self):
+        """Test parsing a batched LLM reply into examples grouped by pattern."""
+        reply = json.dumps({"examples": [
+            {"pattern": 2, "question": "Q2", "cypher": "MATCH (p:Product)-[:REGULATED_BY]->(r) RETURN r"},
+            {"pattern": 1, "question": "Q1", "cypher": "MATCH (p:Product)-[:BELONGS_TO]->(c) RETURN c"},
+            {"pattern": 7, "question": "Q7", "cypher": "MATCH (n) RETURN n"}
+        ]})
+        llm_client = MagicMock()
+        llm_client.chat.completions.create.return_value = _llm_response(reply)
+        generator = PatternExampleGenerator(llm_client=llm_client)
+        
+        examples = generator.generate_examples(
+            schema=self.mock_schema,
+            rich_context=self.mock_rich_context,
+            count=2
+        )
+        
+        llm_client.chat.completions.create.assert_called_once()
+        self.assertEqual([e['question'] for e in examples], ['Q1', 'Q2'])
     
     def test_prompt_builder(self):
         """Test the prompt builder functionality."""
-        # Create a prompt builder
-        builder = PromptBuilder()
+        # Use the shared prompt builder
+        builder = self.prompt_builder
         
         # Build a prompt
         prompt = builder.build_query_decomposition_prompt(
@@ -251,18 +326,7 @@ class TestSchemaExamples(unittest.TestCase):
         mock_get_llm_client.return_value = mock_llm
         
         # Set up the LLM response
-        mock_response = MagicMock()
-        mock_response.choices = [MagicMock()]
-        mock_response.choices[0].message.content = json.dumps({
-            "query_plan": [
-                {
-                    "purpose": "Find products regulated by Safety Standard 1",
-                    "cypher": "MATCH (p:Product)-[r:REGULATED_BY]->(reg:Regulation {name: 'Safety Standard 1'}) RETURN p.name, p.category, r.confidence"
-                }
-            ],
-            "thought_process": "This query finds all Product nodes that have a REGULATED_BY relationship to a Regulation node with name 'Safety Standard 1'"
-        })
-        mock_llm.chat.completions.create.return_value = mock_response
+        mock_llm.chat.completions.create.return_value = _llm_response(MOCK_QUERY_PLAN_JSON)
         
         # Create a schema manager with mocks
         schema_manager = SchemaManager(
@@ -299,24 +363,10 @@ class TestSchemaExamples(unittest.TestCase):
         mock_get_llm_client.return_value = mock_llm
         
         # Set up the LLM response for schema generation
-        mock_schema_response = MagicMock()
-        mock_schema_response.choices = [MagicMock()]
-        mock_schema_response.choices[0].message.content = json.dumps({
-            "examples": self.mock_examples
-        })
+        mock_schema_response = _llm_response(MOCK_SCHEMA_EXAMPLES_JSON)
         
         # Set up the LLM response for query decomposition
-        mock_query_response = MagicMock()
-        mock_query_response.choices = [MagicMock()]
-        mock_query_response.choices[0].message.content = json.dumps({
-            "query_plan": [
-                {
-                    "purpose": "Find products regulated by Safety Standard 1",
-                    "cypher": "MATCH (p:Product)-[r:REGULATED_BY]->(reg:Regulation {name: 'Safety Standard 1'}) RETURN p.name, p.category, r.confidence"
-                }
-            ],
-            "thought_process": "This query finds all Product nodes that have a REGULATED_BY relationship to a Regulation node with name 'Safety Standard 1'"
-        })
+        mock_query_response = _llm_response(MOCK_QUERY_PLAN_JSON)
         
         # Configure the mock to return different responses based on the prompt
         def mock_llm_side_effect(**kwargs):
@@ -329,13 +379,14 @@ class TestSchemaExamples(unittest.TestCase):
         mock_llm.chat.completions.create.side_effect = mock_llm_side_effect
         
         # Create schema cache
+        # The cache and repository hand out the stored objects, so they get copies of the fixtures
         schema_cache = MemorySchemaCache()
-        schema_cache.set('schema', self.mock_schema)
-        schema_cache.set('rich_context', self.mock_rich_context)
+        schema_cache.set('schema', copy.deepcopy(self.mock_schema))
+        schema_cache.set('rich_context', copy.deepcopy(self.mock_rich_context))
         
         # Create example repository
         example_repo = MemoryExampleRepository()
-        example_repo.store_examples(self.mock_examples)
+        example_repo.store_examples(copy.deepcopy(self.mock_examples))
         
         # Create schema loader (with pre-filled mock data)
         schema_loader = MagicMock()
@@ -350,8 +401,8 @@ class TestSchemaExamples(unittest.TestCase):
             llm_client=mock_llm
         )
         
-        # Create prompt builder
-        prompt_builder = PromptBuilder()
+        # Use the shared prompt builder
+        prompt_builder = self.prompt_builder
         
         # Create query decomposition agent
         agent = QueryDecompositionAgent(schema_manager=schema_manager)
@@ -7,23 +7,44 @@ embedding providers, entity retrieval, and tier classification.
 
 import os
 import sys
+import atexit
+import asyncio
 import unittest
 import logging
+from concurrent.futures import ThreadPoolExecutor
 from typing import Dict, List, Any
 
 # Configure logging
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(name)s - %(levelname)s - %(message)s')
 logger = logging.getLogger(__name__)
 
-# Add parent directory to path for imports
-parent_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
-sys.path.append(parent_dir)
+# Add parent directory to path for imports however the tests are run, under
+# pytest conftest.py has usually done this already
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if ROOT not in sys.path:
+    sys.path.insert(0, ROOT)
 
 from semantic.embedding_provider import DummyEmbeddingProvider
-from semantic.entity_retriever import SemanticEntityRetriever
-from semantic.tier_classification import TierClassifier
+from semantic.entity_retriever import (
+    SemanticEntityRetriever, FULLTEXT_INDEX_EXISTS_QUERY, TEXT_SEARCH_QUERY, TEXT_SEARCH_FALLBACK_QUERY,
+    VECTOR_INDEXES_QUERY, MULTI_INDEX_VECTOR_SEARCH_QUERY, HYBRID_SEARCH_QUERY
+)
+from semantic.tier_classification import TierClassifier, LABELS_QUERY, META_STATS_QUERY
 from graph_db.graph_strategy_factory import GraphDatabaseFactory
 
+# Database connection shared by every test class in the process, created on first use
+_shared_graph_db = None
+
+def get_shared_graph_db():
+    """Return the shared graph database connection, connecting on first use."""
+    global _shared_graph_db
+    if _shared_graph_db is None:
+        _shared_graph_db = GraphDatabaseFactory.create_graph_database_strategy()
+        if not _shared_graph_db.connect():
+            logger.warning("Could not connect to Neo4j, some tests will be skipped")
+        atexit.register(_shared_graph_db.close)
+    return _shared_graph_db
+
 class TestEmbeddingProvider(unittest.TestCase):
     """Tests for the embedding provider implementation."""
     
@@ -47,26 +68,181 @@ class TestEmbeddingProvider(unittest.TestCase):
         )
         self.assertTrue(0 <= similarity <= 1)
 
+class RecordingGraphDB:
+    """Graph database stand-in that records queries and returns canned results."""
+    
+    def __init__(self, results=None, failing=()):
+        # Maps a query string to the records it returns, other queries return nothing
+        self.results = results or {}
+        # Queries that raise an error, as when a referenced index is missing
+        self.failing = set(failing)
+        self.queries = []
+    
+    def execute_query(self, query, params=None):
+        self.queries.append(query)
+        if query in self.failing:
+            raise RuntimeError("query failed")
+        return list(self.results.get(query, []))
+    
+    def stream_query(self, query, params=None):
+        yield from self.execute_query(query, params)
+
+class TestSemanticEntityRetrieverQueries(unittest.TestCase):
+    """Tests for the queries the semantic entity retriever sends, without a database."""
+    
+    def test_text_search_uses_fulltext_index(self):
+        """Test that text search queries the fulltext index when it exists."""
+        graph_db = RecordingGraphDB({FULLTEXT_INDEX_EXISTS_QUERY: [{"count": 1}]})
+        retriever = SemanticEntityRetriever(graph_db, DummyEmbeddingProvider(seed=0))
+        
+        retriever._execute_text_search("work orders", None, 5)
+        
+        self.assertIn(TEXT_SEARCH_QUERY, graph_db.queries)
+        self.assertNotIn(TEXT_SEARCH_FALLBACK_QUERY, graph_db.queries)
+    
+    def test_text_search_falls_back_without_fulltext_index(self):
+        """Test that text search uses a substring match when the fulltext index is missing."""
+        graph_db = RecordingGraphDB({
+            FULLTEXT_INDEX_EXISTS_QUERY: [{"count": 0}],
+            TEXT_SEARCH_FALLBACK_QUERY: [{"id": 1, "labels": ["Table"], "properties": {"name": "Work Orders"}, "score": 1.0}]
+        })
+        retriever = SemanticEntityRetriever(graph_db, DummyEmbeddingProvider(seed=0))
+        
+        results = retriever._execute_text_search("work orders", None, 5)
+        retriever._execute_text_search("work orders", None, 5)
+        
+        self.assertEqual([r["properties"]["name"] for r in results], ["Work Orders"])
+        self.assertNotIn(TEXT_SEARCH_QUERY, graph_db.queries)
+        # The index check is cached between searches
+        self.assertEqual(graph_db.queries.count(FULLTEXT_INDEX_EXISTS_QUERY), 1)
+
+    def test_search_without_fulltext_index_keeps_vector_hits(self):
+        """Test that search returns vector hits, then substring hits, when the fulltext index is missing."""
+        graph_db = RecordingGraphDB({
+            FULLTEXT_INDEX_EXISTS_QUERY: [{"count": 0}],
+            VECTOR_INDEXES_QUERY: [{"name": "table_embeddings", "labels": ["Table"]}],
+            MULTI_INDEX_VECTOR_SEARCH_QUERY: [{"id": 1, "labels": ["Table"], "properties": {"name": "Assets"}, "score": 0.9}],
+            TEXT_SEARCH_FALLBACK_QUERY: [
+                {"id": 1, "labels": ["Table"], "properties": {"name": "Assets"}, "score": 1.0},
+                {"id": 2, "labels": ["Table"], "properties": {"name": "Work Orders"}, "score": 1.0}
+            ]
+        })
+        retriever = SemanticEntityRetriever(graph_db, DummyEmbeddingProvider(seed=0))
+        
+        results = retriever.search("work orders", limit=5)
+        
+        self.assertEqual([r["id"] for r in results], ["1", "2"])
+        self.assertEqual(results[0]["score"], 0.9)
+        self.assertNotIn(HYBRID_SEARCH_QUERY, graph_db.queries)
+
+    def test_failed_hybrid_search_keeps_vector_hits(self):
+        """Test that a failing hybrid query falls back to separate vector and text searches."""
+        graph_db = RecordingGraphDB({
+            FULLTEXT_INDEX_EXISTS_QUERY: [{"count": 1}],
+            VECTOR_INDEXES_QUERY: [{"name": "table_embeddings", "labels": ["Table"]}],
+            MULTI_INDEX_VECTOR_SEARCH_QUERY: [{"id": 1, "labels": ["Table"], "properties": {"name": "Assets"}, "score": 0.9}]
+        }, failing=[HYBRID_SEARCH_QUERY])
+        retriever = SemanticEntityRetriever(graph_db, DummyEmbeddingProvider(seed=0))
+        
+        results = retriever.search("assets", limit=5)
+        
+        self.assertEqual([r["id"] for r in results], ["1"])
+        self.assertIn(HYBRID_SEARCH_QUERY, graph_db.queries)
+    
+    def test_query_embedding_cache_is_thread_safe(self):
+        """Test that concurrent searches share the query embedding cache without errors."""
+        retriever = SemanticEntityRetriever(RecordingGraphDB(), DummyEmbeddingProvider(dimension=8),
+                                            embedding_cache_size=4)
+        queries = [f"query {i % 8}" for i in range(2000)]
+        
+        # A small cache with repeated queries evicts entries while others hit them
+        with ThreadPoolExecutor(max_workers=8) as executor:
+            embeddings = list(executor.map(retriever._encode_query, queries))
+        
+        self.assertEqual(len(embeddings), len(queries))
+        self.assertLessEqual(len(retriever._emb_cache), 4)
+        self.assertEqual(retriever.stats["cache_hits"] + retriever.stats["cache_misses"], len(queries))
+    
+    def test_hybrid_query_orders_after_return(self):
+        """Test that the hybrid query orders and limits the returned rows."""
+        tail = HYBRID_SEARCH_QUERY.strip().splitlines()[-3:]
+        self.assertTrue(tail[0].startswith("RETURN "))
+        self.assertEqual(tail[1:], ["ORDER BY source DESC, score DESC", "LIMIT $limit"])
+
+class TestTierClassifier(unittest.TestCase):
+    """Tests for the tier classifier, which needs no database to classify labels."""
+    
+    def test_tier_classifier(self):
+        """Test tier classification."""
+        classifier = TierClassifier(RecordingGraphDB())
+        
+        # Test default tier mappings
+        tier = classifier.get_tier_for_label("Table")
+        self.assertEqual(tier, 1)
+        
+        # Labels containing a key term take that term's tier
+        tier = classifier.get_tier_for_label("SomeRandomEntity")
+        self.assertEqual(tier, 1)
+        
+        tier = classifier.get_tier_for_label("Widget")
+        self.assertEqual(tier, 3)
+        
+        # Test custom tier mappings
+        custom_mappings = {
+            1: ["CustomEntity", "PrimaryType"],
+            2: ["SecondaryType"],
+            3: ["TertiaryType"]
+        }
+        classifier.set_custom_tier_mapping(custom_mappings)
+        
+        tier = classifier.get_tier_for_label("CustomEntity")
+        self.assertEqual(tier, 1)
+        
+        tier = classifier.get_tier_for_label("TertiaryType")
+        self.assertEqual(tier, 3)
+    
+    def test_analyze_schema_without_counts(self):
+        """Test that labels are still classified by key terms when the counts query returns nothing."""
+        labels = [{"label": "Entity"}, {"label": "Table"}, {"label": "Widget"}]
+        graph_db = RecordingGraphDB({LABELS_QUERY: labels})
+        classifier = TierClassifier(graph_db)
+        
+        tier_mappings = classifier.analyze_schema()
+        self.assertEqual(tier_mappings[1], {"Entity", "Table"})
+        self.assertEqual(tier_mappings[3], {"Widget"})
+        
+        # The incomplete result is not cached, the next call analyzes again
+        classifier.analyze_schema()
+        self.assertEqual(graph_db.queries.count(LABELS_QUERY), 2)
+    
+    def test_analyze_schema_with_counts(self):
+        """Test that labels missing from the counts are classified by key terms and the result is cached."""
+        labels = [{"label": "Category"}, {"label": "Order"}, {"label": "Widget"}]
+        stats = [{"labels": {"Order": 600, "Widget": 10}, "relTypes": {}}]
+        graph_db = RecordingGraphDB({LABELS_QUERY: labels, META_STATS_QUERY: stats})
+        classifier = TierClassifier(graph_db)
+        
+        tier_mappings = classifier.analyze_schema()
+        self.assertEqual(tier_mappings[1], {"Category"})
+        self.assertEqual(tier_mappings[2], {"Order"})
+        self.assertEqual(tier_mappings[3], {"Widget"})
+        
+        classifier.analyze_schema()
+        self.assertEqual(graph_db.queries.count(LABELS_QUERY), 1)
+
+@unittest.skipUnless(os.environ.get("RUN_NEO4J_TESTS"), "requires live Neo4j")
 class TestSemanticEntityRetriever(unittest.TestCase):
     """Tests for the semantic entity retriever."""
     
     @classmethod
     def setUpClass(cls):
         """Set up test dependencies."""
-        cls.graph_db = GraphDatabaseFactory.create_graph_database_strategy()
-        connected = cls.graph_db.connect()
-        if not connected:
-            logger.warning("Could not connect to Neo4j, some tests will be skipped")
+        # The connection is closed at exit, not per class
+        cls.graph_db = get_shared_graph_db()
         
         cls.embedding_provider = DummyEmbeddingProvider()
         cls.retriever = SemanticEntityRetriever(cls.graph_db, cls.embedding_provider)
     
-    @classmethod
-    def tearDownClass(cls):
-        """Clean up test dependencies."""
-        if cls.graph_db:
-            cls.graph_db.close()
-    
     def test_search_functionality(self):
         """Test basic search functionality."""
         # Skip if database connection failed
@@ -86,32 +262,11 @@ class TestSemanticEntityRetriever(unittest.TestCase):
             self.assertIn("labels", result)
             self.assertIn("properties", result)
             self.assertIn("score", result)
-    
-    def test_tier_classifier(self):
-        """Test tier classification."""
-        # Skip if database connection failed
-        if not self.graph_db.driver:
-            self.skipTest("No database connection")
-        
-        classifier = TierClassifier(self.graph_db)
-        
-        # Test default tier mappings
-        tier = classifier.get_tier_for_label("Table")
-        self.assertEqual(tier, 1)
-        
-        tier = classifier.get_tier_for_label("SomeRandomEntity")
-        self.assertEqual(tier, 3)
         
-        # Test custom tier mappings
-        custom_mappings = {
-            1: ["CustomEntity", "PrimaryType"],
-            2: ["SecondaryType"],
-            3: ["TertiaryType"]
-        }
-        classifier.set_custom_tier_mapping(custom_mappings)
-        
-        tier = classifier.get_tier_for_label("CustomEntity")
-        self.assertEqual(tier, 1)
+        # The asynchronous variant returns the same kind of results
+        if hasattr(self.retriever, "search_async"):
+            async_results = asyncio.run(self.retriever.search_async("test query", limit=5))
+            self.assertIsInstance(async_results, list)
 
 def run_tests():
     """Run all tests."""